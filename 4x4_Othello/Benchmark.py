@@ -0,0 +1,308 @@
+"""Benchmark suite for the Othello engine
+
+Measures, from the starting position and from fixed midgame positions on every board size:
+    perft: leaf counts of the game tree to each depth (see Perft.py) and the time they take
+    micro: calls per second of the board and player primitives (is_legal_move, flip_pieces, get_successors,
+        play_move/undo_move and eval_board for each eval_type)
+    search: nodes and time of a fixed-depth AlphaBetaPlayer search at each depth, for each eval_type, with and
+        without pruning
+    nps: nodes per second of the search for each eval_type, over all search results
+    memory: bytes per node of the boards of a cloned game tree, for OthelloBoard and for the slotted 
+        CompactOthelloBoard
+
+Results are written as JSON: a list of flat records, each with a 'benchmark' name, the parameters that identify it
+and its measurements. Comparing against the results of an earlier version flags every count that changed (perft
+counts must never change; search node counts change only when the search does), every time that got slower by
+more than the tolerance and every memory per node that grew by more than MEMORY_TOLERANCE.
+
+Usage: python Benchmark.py [results.json [baseline.json]]
+"""
+
+import json
+import platform
+import sys
+import time
+import tracemalloc
+
+from OthelloBoard import OthelloBoard, CompactOthelloBoard
+from Players import AlphaBetaPlayer
+import Perft
+
+# Fixed positions as (board size, moves from the starting position); player 1 moves first and a player without
+# legal moves passes
+POSITIONS = {
+    'start-4x4': (4, []),
+    'mid-4x4': (4, [(3, 1), (3, 2), (0, 3), (2, 0)]),
+    'start-6x6': (6, []),
+    'mid-6x6': (6, [(3, 1), (2, 1), (1, 0), (4, 1), (5, 1), (3, 4), (1, 4), (4, 0), (4, 5), (1, 1)]),
+    'start-8x8': (8, []),
+    'mid-8x8': (8, [(5, 3), (5, 4), (6, 5), (3, 2), (2, 4), (7, 6), (5, 2), (5, 5), (3, 1), (6, 2), (7, 2), (1, 4),
+                    (3, 5), (2, 2), (6, 4), (5, 1), (1, 2), (4, 6), (3, 6), (7, 5)]),
+}
+
+# Perft goes to Perft.PERFT_DEPTHS of the board size from the starting positions, and this many plies less from the
+# midgame positions, whose trees branch more
+MIDGAME_PERFT_PLIES = 2
+
+# Search depths for each position searched
+SEARCH_DEPTHS = {'start-4x4': [2, 4, 6, 8], 'mid-6x6': [1, 2, 3, 4], 'mid-8x8': [1, 2, 3, 4]}
+
+# Measurements that vary between runs; every other field of a record identifies it or is an exact count
+TIMED_FIELDS = ('time', 'nodes_per_second', 'calls_per_second')
+MEMORY_FIELDS = ('bytes_per_node',)
+COUNT_FIELDS = ('nodes', 'calls')
+
+# Depth of the game trees whose boards are kept alive to measure memory per node
+MEMORY_DEPTHS = {'mid-4x4': 6, 'mid-6x6': 4, 'mid-8x8': 3}
+
+# Repetitions of each timed measurement; the fastest one is kept
+REPEAT = 3
+
+# Memory per node depends on the Python build and allocator state, so only growth beyond this fraction is flagged
+MEMORY_TOLERANCE = 0.1
+
+# Times shorter than this (in seconds) are too noisy to flag as regressions
+MIN_COMPARED_TIME = 0.01
+
+
+def load_position(name: str) -> tuple:
+    # Returns the board of a named position and the symbol to move
+    size, moves = POSITIONS[name]
+    board = Perft.start_board(size)
+    symbol, other = 'X', 'O'
+    for col, row in moves:
+        if not board.has_legal_moves_remaining(symbol):
+            symbol, other = other, symbol
+        board.play_move(col, row, symbol)
+        symbol, other = other, symbol
+    if not board.has_legal_moves_remaining(symbol):
+        symbol, other = other, symbol
+    return board, symbol
+
+
+def best_time(fn, repeat: int = REPEAT) -> tuple:
+    # Runs fn repeat times and returns its result and the fastest time in seconds
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return result, best
+
+
+def bench_perft() -> list:
+    results = []
+    for name, (size, moves) in POSITIONS.items():
+        max_depth = Perft.PERFT_DEPTHS[size] - (MIDGAME_PERFT_PLIES if moves else 0)
+        board, symbol = load_position(name)
+        for depth in range(1, max_depth + 1):
+            # Deep counts take long enough to time once
+            nodes, elapsed = best_time(lambda: Perft.perft(board, symbol, depth), REPEAT if depth < max_depth else 1)
+            results.append({'benchmark': 'perft', 'position': name, 'depth': depth, 'nodes': nodes, 'time': elapsed,
+                            'nodes_per_second': nodes / elapsed})
+    return results
+
+
+def bench_micro(loops: int = 200) -> list:
+    # Every position is used for every primitive, for the side to move and its opponent
+    positions = []
+    for name in POSITIONS:
+        board, symbol = load_position(name)
+        other = board.p2_symbol if symbol == board.p1_symbol else board.p1_symbol
+        positions.append((board, symbol, AlphaBetaPlayer(symbol, 0, 0, 1)))
+        positions.append((board, other, AlphaBetaPlayer(other, 0, 0, 1)))
+
+    def is_legal_move():
+        calls = 0
+        for board, symbol, _ in positions:
+            for col in range(board.cols):
+                for row in range(board.rows):
+                    board.is_legal_move(col, row, symbol)
+                    calls += 1
+        return calls
+
+    def flip_pieces():
+        calls = 0
+        for board, symbol, _ in positions:
+            for col, row in board.legal_moves(symbol):
+                own, opp = board.get_bits(symbol)
+                zobrist = board.zobrist
+                board.flip_pieces(col, row, symbol)
+                board.set_bits(symbol, own, opp)
+                board.zobrist = zobrist
+                calls += 1
+        return calls
+
+    def play_undo_move():
+        calls = 0
+        for board, symbol, _ in positions:
+            for col, row in board.legal_moves(symbol):
+                board.undo_move(board.play_move(col, row, symbol))
+                calls += 1
+        return calls
+
+    def get_successors():
+        for board, symbol, player in positions:
+            player.get_successors(board, symbol)
+        return len(positions)
+
+    def eval_board(eval_type):
+        def run():
+            for _, _, player in positions:
+                player.eval_type = eval_type
+            for board, _, player in positions:
+                # Clear the cached move masks so that every call generates the moves it evaluates
+                board.p1_moves = board.p2_moves = None
+                player.eval_board(board)
+            return len(positions)
+        return run
+
+    functions = {'is_legal_move': is_legal_move, 'flip_pieces': flip_pieces, 'play_move+undo_move': play_undo_move,
+                 'get_successors': get_successors}
+    for eval_type in ('0', '1', '2'):
+        functions[f'eval_board[{eval_type}]'] = eval_board(eval_type)
+
+    results = []
+    for name, fn in functions.items():
+        calls, elapsed = best_time(lambda: sum(fn() for _ in range(loops)))
+        results.append({'benchmark': 'micro', 'function': name, 'calls': calls, 'time': elapsed,
+                        'calls_per_second': calls / elapsed})
+    return results
+
+
+def bench_search() -> list:
+    results = []
+    for name, depths in SEARCH_DEPTHS.items():
+        board, symbol = load_position(name)
+        for eval_type in ('0', '1', '2'):
+            for prune in ('0', '1'):
+                for depth in depths:
+                    def search():
+                        player = AlphaBetaPlayer(symbol, eval_type, prune, depth)
+                        player.get_move(board)
+                        return player.total_nodes_seen
+                    nodes, elapsed = best_time(search)
+                    results.append({'benchmark': 'search', 'position': name, 'eval_type': eval_type, 'prune': prune,
+                                    'depth': depth, 'nodes': nodes, 'time': elapsed,
+                                    'nodes_per_second': nodes / elapsed})
+    return results
+
+
+def nodes_per_second(search_results: list) -> list:
+    # Search speed of each heuristic over every search result
+    results = []
+    for eval_type in ('0', '1', '2'):
+        rows = [r for r in search_results if r['eval_type'] == eval_type]
+        nodes = sum(r['nodes'] for r in rows)
+        elapsed = sum(r['time'] for r in rows)
+        results.append({'benchmark': 'nps', 'eval_type': eval_type, 'nodes': nodes, 'time': elapsed,
+                        'nodes_per_second': nodes / elapsed})
+    return results
+
+
+def tree_boards(board, symbol: str, depth: int) -> list:
+    # Every board of the game tree depth moves below board, each one a clone of its parent as in the search
+    boards = []
+    frontier = [(board, symbol)]
+    for _ in range(depth):
+        children = []
+        for parent, s in frontier:
+            other = parent.p2_symbol if s == parent.p1_symbol else parent.p1_symbol
+            for col, row in parent.legal_moves(s):
+                child = parent.cloneOBoard()
+                child.play_move(col, row, s)
+                child.last_move = (col, row)
+                children.append((child, other))
+        boards.extend(child for child, _ in children)
+        frontier = children
+    return boards
+
+
+def bench_memory() -> list:
+    results = []
+    for name, depth in MEMORY_DEPTHS.items():
+        position, symbol = load_position(name)
+        for cls in (OthelloBoard, CompactOthelloBoard):
+            root = position.cloneOBoard(cls)
+            
+            # Memory still allocated once the tree is built, divided among its boards
+            tracemalloc.start()
+            before = tracemalloc.get_traced_memory()[0]
+            boards = tree_boards(root, symbol, depth)
+            allocated = tracemalloc.get_traced_memory()[0] - before
+            tracemalloc.stop()
+            results.append({'benchmark': 'memory', 'position': name, 'board': cls.__name__, 'depth': depth,
+                            'nodes': len(boards), 'bytes_per_node': round(allocated / len(boards), 1)})
+    return results
+
+
+def run_benchmarks() -> dict:
+    search = bench_search()
+    return {'python': platform.python_version(), 'machine': platform.machine(),
+            'results': bench_perft() + bench_micro() + search + nodes_per_second(search) + bench_memory()}
+
+
+def record_key(record: dict) -> tuple:
+    # Identifying fields of a record: everything except the measurements
+    measured = TIMED_FIELDS + MEMORY_FIELDS + COUNT_FIELDS
+    return tuple(sorted((k, v) for k, v in record.items() if k not in measured))
+
+
+def compare(results: dict, baseline: dict, tolerance: float = 0.25) -> list:
+    # Returns a message for every count that changed, every time more than tolerance slower than the baseline and 
+    # every memory measurement more than MEMORY_TOLERANCE larger
+    old = {record_key(r): r for r in baseline['results']}
+    problems = []
+    for record in results['results']:
+        before = old.get(record_key(record))
+        if before is None:
+            continue
+        label = ' '.join(f'{k}={v}' for k, v in record_key(record))
+        for field in COUNT_FIELDS:
+            if field in record and record[field] != before.get(field):
+                problems.append(f'{label}: {field} changed from {before.get(field)} to {record[field]}')
+        for field in MEMORY_FIELDS:
+            if field in record and before.get(field) and record[field] > before[field] * (1 + MEMORY_TOLERANCE):
+                problems.append(f'{label}: {field} grew from {before[field]} to {record[field]}')
+        if 'time' not in record or 'time' not in before:
+            continue
+        if before['time'] >= MIN_COMPARED_TIME and record['time'] > before['time'] * (1 + tolerance):
+            problems.append(f"{label}: {record['time'] / before['time']:.2f}x slower "
+                            f"({before['time']:.4f} s -> {record['time']:.4f} s)")
+    return problems
+
+
+def print_summary(results: dict):
+    for r in results['results']:
+        if r['benchmark'] == 'micro':
+            print(f"{r['function']:>22}: {r['calls_per_second']:>12.0f} calls/s")
+    for r in results['results']:
+        if r['benchmark'] == 'nps':
+            print(f"search eval_type {r['eval_type']}: {r['nodes_per_second']:>12.0f} nodes/s")
+    for r in results['results']:
+        if r['benchmark'] == 'memory':
+            print(f"{r['board']:>19} {r['position']}: {r['bytes_per_node']:>8.1f} bytes/node")
+
+
+def main():
+    path = sys.argv[1] if len(sys.argv) > 1 else 'benchmark_results.json'
+    results = run_benchmarks()
+    with open(path, 'w') as f:
+        json.dump(results, f, indent=1)
+    print_summary(results)
+    print(f'Wrote {path}')
+
+    # Compare against an earlier run and fail if anything regressed
+    if len(sys.argv) > 2:
+        with open(sys.argv[2]) as f:
+            baseline = json.load(f)
+        problems = compare(results, baseline)
+        for p in problems:
+            print(p)
+        print(f'{len(problems)} regressions against {sys.argv[2]}')
+        if problems:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
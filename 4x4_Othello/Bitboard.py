@@ -0,0 +1,219 @@
+"""Bitboard helpers for OthelloBoard
+
+A position is stored as one integer mask per player. Bit (row * cols + col) is set when the player
+owns cell (col, row), so iterating over set bits from the lowest one visits cells in the same row/column
+scan order that get_successors has always used.
+"""
+
+from functools import lru_cache
+import random
+
+# (col, row) step for each of the eight directions, in the same order as the Direction enum in Board.py
+DIRECTION_STEPS = ((0, 1), (1, 1), (1, 0), (1, -1), (0, -1), (-1, -1), (-1, 0), (-1, 1))
+
+
+def _popcount_fallback(bits: int) -> int:
+    return bin(bits).count('1')
+
+
+# int.bit_count is only available from Python 3.10 onwards
+popcount = getattr(int, 'bit_count', _popcount_fallback)
+
+# Fixed seed so that every process (and every run) uses the same Zobrist keys
+ZOBRIST_SEED = 331
+
+
+# The dihedral symmetries of a board as (col, row, cols, rows) -> (col, row) maps. Rotations by 90 degrees and the
+# diagonal reflections only map a square board onto itself.
+SYMMETRIES = (
+    lambda c, r, cols, rows: (c, r),
+    lambda c, r, cols, rows: (cols - 1 - c, rows - 1 - r),
+    lambda c, r, cols, rows: (cols - 1 - c, r),
+    lambda c, r, cols, rows: (c, rows - 1 - r),
+    lambda c, r, cols, rows: (rows - 1 - r, c),
+    lambda c, r, cols, rows: (r, cols - 1 - c),
+    lambda c, r, cols, rows: (r, c),
+    lambda c, r, cols, rows: (rows - 1 - r, cols - 1 - c),
+)
+
+
+class Geometry:
+    """Precomputed masks for a cols x rows board
+    full: mask with every cell of the board set
+    shifts: (amount, mask) pair for each direction, where a positive amount is a left shift and mask
+        removes the bits that wrapped around a row edge (or fell off the board) after shifting
+    rays: for each square, the cells running outwards in each direction (only rays long enough to flip)
+    max_run: the longest line of opponent pieces that a single move can flip
+    p1_keys, p2_keys, flip_keys, p2_to_move_key: Zobrist hashing keys
+    sym_squares, sym_inverse, sym_tables: board symmetries (see transform and canonical)
+    """
+    def __init__(self, cols: int, rows: int):
+        self.cols = cols
+        self.rows = rows
+        self.size = cols * rows
+        self.full = (1 << self.size) - 1
+
+        # Masks of the board without its first or last column
+        first_col = 0
+        last_col = 0
+        for r in range(rows):
+            first_col |= 1 << (r * cols)
+            last_col |= 1 << (r * cols + cols - 1)
+        not_first_col = self.full & ~first_col
+        not_last_col = self.full & ~last_col
+
+        # Shift amount and wrap mask for each direction
+        self.shifts = []
+        for dc, dr in DIRECTION_STEPS:
+            mask = self.full
+            if dc == 1:
+                mask &= not_first_col
+            elif dc == -1:
+                mask &= not_last_col
+            self.shifts.append((dr * cols + dc, mask))
+
+        # Flip rays for each square, used to find the pieces a single move flips
+        self.rays = []
+        for sq in range(self.size):
+            col, row = sq % cols, sq // cols
+            square_rays = []
+            for dc, dr in DIRECTION_STEPS:
+                ray = []
+                c, r = col + dc, row + dr
+                while 0 <= c < cols and 0 <= r < rows:
+                    ray.append(1 << (r * cols + c))
+                    c, r = c + dc, r + dr
+                # A move needs at least one opponent piece followed by one of its own pieces to flip
+                if len(ray) >= 2:
+                    square_rays.append(tuple(ray))
+            self.rays.append(tuple(square_rays))
+
+        self.max_run = max(cols, rows) - 2
+
+        # Zobrist keys: one random 64-bit key per square for each player, plus a key for player 2 to move.
+        # flip_keys[sq] toggles a square between the two players in a single XOR.
+        rng = random.Random(ZOBRIST_SEED)
+        self.p1_keys = tuple(rng.getrandbits(64) for _ in range(self.size))
+        self.p2_keys = tuple(rng.getrandbits(64) for _ in range(self.size))
+        self.flip_keys = tuple(k1 ^ k2 for k1, k2 in zip(self.p1_keys, self.p2_keys))
+        self.p2_to_move_key = rng.getrandbits(64)
+
+        # Symmetries of the board (all 8 for a square board, 4 otherwise) as square permutations, the index of
+        # each symmetry's inverse, and lookup tables that transform a bitboard 8 bits at a time
+        self.sym_squares = []
+        for transform in SYMMETRIES:
+            image = [transform(sq % cols, sq // cols, cols, rows) for sq in range(self.size)]
+            if all(0 <= c < cols and 0 <= r < rows for c, r in image):
+                self.sym_squares.append(tuple(r * cols + c for c, r in image))
+        self.sym_inverse = []
+        for perm in self.sym_squares:
+            inverse = tuple(sorted(range(self.size), key=lambda sq: perm[sq]))
+            self.sym_inverse.append(self.sym_squares.index(inverse))
+        self.sym_tables = []
+        for perm in self.sym_squares:
+            chunks = []
+            for base in range(0, self.size, 8):
+                table = [0] * 256
+                for value in range(256):
+                    for i in range(8):
+                        if value >> i & 1 and base + i < self.size:
+                            table[value] |= 1 << perm[base + i]
+                chunks.append(tuple(table))
+            self.sym_tables.append(tuple(chunks))
+
+    def square(self, col: int, row: int) -> int:
+        return row * self.cols + col
+
+    def coords(self, sq: int) -> tuple:
+        return (sq % self.cols, sq // self.cols)
+
+
+@lru_cache(maxsize=None)
+def geometry(cols: int, rows: int) -> Geometry:
+    # Geometries are immutable, so every board of the same size shares one instance
+    return Geometry(cols, rows)
+
+
+def squares(bits: int):
+    # Yield the index of every set bit, lowest first
+    while bits:
+        low = bits & -bits
+        yield low.bit_length() - 1
+        bits ^= low
+
+
+def legal_moves(own: int, opp: int, geom: Geometry) -> int:
+    # Shift-based move generation: walk every direction at once from all of our pieces across runs of
+    # opponent pieces, and keep the empty cells found just past the end of each run
+    empty = geom.full & ~(own | opp)
+    extra_steps = geom.max_run - 1
+    moves = 0
+    for amount, mask in geom.shifts:
+        opp_masked = opp & mask
+        if amount > 0:
+            x = (own << amount) & opp_masked
+            for _ in range(extra_steps):
+                x |= (x << amount) & opp_masked
+            moves |= (x << amount) & mask & empty
+        else:
+            amount = -amount
+            x = (own >> amount) & opp_masked
+            for _ in range(extra_steps):
+                x |= (x >> amount) & opp_masked
+            moves |= (x >> amount) & mask & empty
+    return moves
+
+
+def flips(sq: int, own: int, opp: int, geom: Geometry) -> int:
+    # Mask of the opponent pieces flipped by playing at sq, found by walking the precomputed rays
+    flipped = 0
+    for ray in geom.rays[sq]:
+        run = 0
+        for bit in ray:
+            if opp & bit:
+                run |= bit
+            else:
+                if own & bit:
+                    flipped |= run
+                break
+    return flipped
+
+
+def zobrist_flips(flipped: int, geom: Geometry) -> int:
+    # XOR of the keys that change when the pieces in flipped change owner
+    key = 0
+    for sq in squares(flipped):
+        key ^= geom.flip_keys[sq]
+    return key
+
+
+def zobrist(p1: int, p2: int, geom: Geometry) -> int:
+    # Zobrist hash of a position from scratch (boards keep theirs updated incrementally)
+    key = 0
+    for sq in squares(p1):
+        key ^= geom.p1_keys[sq]
+    for sq in squares(p2):
+        key ^= geom.p2_keys[sq]
+    return key
+
+
+def transform(bits: int, sym: int, geom: Geometry) -> int:
+    # Apply symmetry sym to a bitboard, one 8-bit chunk lookup at a time
+    result = 0
+    for table in geom.sym_tables[sym]:
+        result |= table[bits & 0xFF]
+        bits >>= 8
+    return result
+
+
+def canonical(own: int, opp: int, geom: Geometry) -> tuple:
+    # Canonical form of a position: the smallest (own, opp) over all symmetries, and the symmetry that produces it
+    best_own, best_opp, best_sym = own, opp, 0
+    for sym in range(1, len(geom.sym_tables)):
+        t_own = transform(own, sym, geom)
+        if t_own > best_own:
+            continue
+        t_opp = transform(opp, sym, geom)
+        if t_own < best_own or t_opp < best_opp:
+            best_own, best_opp, best_sym = t_own, t_opp, sym
+    return best_own, best_opp, best_sym
@@ -0,0 +1,84 @@
+"""Parallel, resumable experiment runner used by Report.py
+
+Every configuration is sent to a worker process. Its result rows are appended to a partial CSV file
+(<csv_path>.partial) as soon as it finishes. If a run is interrupted, the next run reads the partial file and skips
+the configurations already recorded. Once every configuration is done, the final CSV is written in configuration
+order with only the result columns, and the partial file is removed.
+"""
+
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import csv
+import io
+import os
+
+
+def config_key(config: dict, key_columns: list) -> tuple:
+    # Configurations are identified by their key column values as strings, which is how they read back from csv
+    return tuple(str(config[c]) for c in key_columns)
+
+
+def load_partial(partial_path: str, key_columns: list) -> dict:
+    # Returns {config key: [result rows]} for the configurations recorded in a partial file. The rows of a 
+    # configuration are written at once, so a run killed during a write can only leave the last row cut short (the 
+    # file does not end with a newline). That row is dropped with the rows of its configuration, and the partial
+    # file is rewritten without them so that the configuration runs again.
+    done = {}
+    if not os.path.exists(partial_path):
+        return done
+    with open(partial_path, newline='') as f:
+        text = f.read()
+    reader = csv.DictReader(io.StringIO(text))
+    rows = list(reader)
+    if rows and not text.endswith('\n'):
+        cut = rows.pop()
+        # Its key columns may be cut too: drop the rows before it whose key it could be the start of
+        while rows and all(cut[c] is None or rows[-1][c].startswith(cut[c]) for c in key_columns):
+            rows.pop()
+        with open(partial_path, 'w', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=reader.fieldnames)
+            writer.writeheader()
+            writer.writerows(rows)
+    for row in rows:
+        done.setdefault(config_key(row, key_columns), []).append(row)
+    return done
+
+
+def run_configurations(configs: list, run_fn, csv_path: str, columns: list, workers: int = None):
+    """
+    configs: list of dicts, one per configuration; their keys are the key columns of the partial file
+    run_fn: module-level function (it is pickled to the workers) taking a configuration dict and returning a list
+        of result rows (dicts with the keys in columns)
+    csv_path: final results file
+    columns: result columns written to the final file
+    workers: number of worker processes, defaults to the number of CPUs
+    """
+    key_columns = list(configs[0].keys()) if configs else []
+    partial_path = csv_path + '.partial'
+    done = load_partial(partial_path, key_columns)
+    todo = [c for c in configs if config_key(c, key_columns) not in done]
+    if done:
+        print(f'Resuming {csv_path}: {len(configs) - len(todo)} of {len(configs)} configurations already recorded')
+
+    # Stream the rows of every finished configuration into the partial file
+    new_file = not os.path.exists(partial_path)
+    with open(partial_path, 'a', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=key_columns + [c for c in columns if c not in key_columns])
+        if new_file:
+            writer.writeheader()
+        if todo:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                futures = {pool.submit(run_fn, c): c for c in todo}
+                for future in as_completed(futures):
+                    config = futures[future]
+                    rows = [{**config, **row} for row in future.result()]
+                    writer.writerows(rows)
+                    f.flush()
+                    done[config_key(config, key_columns)] = rows
+
+    # Every configuration is recorded: write the final file in configuration order
+    with open(csv_path, 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=columns, extrasaction='ignore')
+        writer.writeheader()
+        for config in configs:
+            writer.writerows(done[config_key(config, key_columns)])
+    os.remove(partial_path)
@@ -1,15 +1,24 @@
 from Players import *
 import sys
+import time
 import OthelloBoard
 
 
 class GameDriver:
-    def __init__(self, p1type="human", p2type="alphabeta", num_rows=4, num_cols=4, p1_eval_type=0, p1_prune=False, p2_eval_type=0, p2_prune=False, p1_depth=8, p2_depth=8):
+    def __init__(self, p1type="human", p2type="alphabeta", num_rows=4, num_cols=4, p1_eval_type=0, p1_prune=False, p2_eval_type=0, p2_prune=False, p1_depth=8, p2_depth=8, p1_options=None, p2_options=None, headless=False):
+        # p1_options/p2_options: dicts of extra AlphaBetaPlayer keyword arguments (e.g. {'tt_size': 65536}), or 
+        # of MCTSPlayer keyword arguments for an "mcts" player
+        # For an "mcts" player the depth is its number of playouts per move, and the eval type and pruning are unused
+        # headless: print nothing; the game is only returned as the record from run()
+        self.headless = headless
         if p1type.lower() in "human":
             self.p1 = HumanPlayer('X')
 
         elif p1type.lower() in "alphabeta":
-            self.p1 = AlphaBetaPlayer('X', p1_eval_type, p1_prune, p1_depth)
+            self.p1 = AlphaBetaPlayer('X', p1_eval_type, p1_prune, p1_depth, **(p1_options or {}))
+
+        elif p1type.lower() in "mcts":
+            self.p1 = MCTSPlayer('X', p1_depth, **(p1_options or {}))
 
         else:
             print("Invalid player 1 type!")
@@ -19,52 +28,82 @@ class GameDriver:
             self.p2 = HumanPlayer('O')
 
         elif p2type.lower() in "alphabeta":
-            self.p2 = AlphaBetaPlayer('O', p2_eval_type, p2_prune, p2_depth)
+            self.p2 = AlphaBetaPlayer('O', p2_eval_type, p2_prune, p2_depth, **(p2_options or {}))
+
+        elif p2type.lower() in "mcts":
+            self.p2 = MCTSPlayer('O', p2_depth, **(p2_options or {}))
 
         else:
             print("Invalid player 2 type!")
             exit(-1)
 
-        self.board = OthelloBoard.OthelloBoard(num_rows, num_cols, self.p1.symbol, self.p2.symbol)
+        self.board = OthelloBoard.OthelloBoard(num_cols, num_rows, self.p1.symbol, self.p2.symbol)
         self.board.initialize()
         self.state = None
+        self.record = None
 
     def display(self):
         print("Player 1 (", self.p1.symbol, ") score: ", \
                 self.board.count_score(self.p1.symbol))
 
+    def log(self, *args):
+        # Print unless running headless
+        if not self.headless:
+            print(*args)
+
+    def show_board(self):
+        if not self.headless:
+            self.board.display()
+
     def process_move(self, curr_player, opponent):
+        # Plays one move and returns its telemetry: the move, nodes searched, depth reached, root evaluation and 
+        # search time in nanoseconds (depth and eval are None for players that do not search)
         while(True):
+            nodes_before = curr_player.total_nodes_seen
+            start = time.perf_counter_ns()
             (col, row) = curr_player.get_move(self.board)
-            print("Move [r,c]:", [row,col], "\n")
+            search_time = time.perf_counter_ns() - start
+            self.log("Move [r,c]:", [row,col], "\n")
             if(not self.board.is_legal_move(col, row, curr_player.symbol)):
                 print("Invalid move")
                 exit()
             else:
-                print("Move [r,c]:", [row,col], "\n")
+                self.log("Move [r,c]:", [row,col], "\n")
                 self.board.play_move(col,row,curr_player.symbol)
-                return
+                return {'player': curr_player.symbol, 'move': (col, row), 
+                        'nodes': curr_player.total_nodes_seen - nodes_before, 
+                        'depth': getattr(curr_player, 'depth_reached', None), 
+                        'eval': getattr(curr_player, 'last_value', None), 
+                        'time_ns': search_time}
 
 
     def run(self):
+        # Plays the game and returns the game record: 
+        #   'moves': per-move telemetry from process_move (with the turn number added)
+        #   'turns', 'state' (p1 score - p2 score), 'p1_score', 'p2_score', 'p1_nodes', 'p2_nodes'
+        #   'p1_positions', 'p1_canonical_positions', 'p2_positions', 'p2_canonical_positions': unique positions 
+        #   searched by each player, raw and up to symmetry (None unless the player has track_positions set)
         current = self.p1
         opponent = self.p2
-        self.board.display()
+        self.show_board()
+        moves = []
 
         cant_move_counter, toggle = 0, 0
 
         #main execution of game
-        print("Player 1(", self.p1.symbol, ") move:")
+        self.log("Player 1(", self.p1.symbol, ") move:")
         # Get a move, then display it in a while loop
         turn_count = 0
         while True:
             if self.board.has_legal_moves_remaining(current.symbol):
                 turn_count += 1
                 cant_move_counter = 0
-                self.process_move(current, opponent)
-                self.board.display()
+                telemetry = self.process_move(current, opponent)
+                telemetry['turn'] = turn_count
+                moves.append(telemetry)
+                self.show_board()
             else:
-                print("Can't move")
+                self.log("Can't move")
                 if(cant_move_counter == 1):
                     break
                 else:
@@ -72,26 +111,41 @@ class GameDriver:
             toggle = (toggle + 1) % 2
             if toggle == 0:
                 current, opponent = self.p1, self.p2
-                print("Player 1(", self.p1.symbol, ") move:")
+                self.log("Player 1(", self.p1.symbol, ") move:")
             else:
                 current, opponent = self.p2, self.p1
-                print("Player 2(", self.p2.symbol, ") move:")
+                self.log("Player 2(", self.p2.symbol, ") move:")
 
         #decide win/lose/tie state
         self.state = self.board.count_score(self.p1.symbol) - self.board.count_score(self.p2.symbol)
         if( self.state == 0):
-            print("Tie game!!")
+            self.log("Tie game!!")
         elif self.state >0:
-            print("Player 1 Wins!")
+            self.log("Player 1 Wins!")
         else:
-            print("Player 2 Wins!")
-        print("turn count:", turn_count)
-        print("total nodes seen by p1", self.p1.total_nodes_seen)
-        print("total nodes seen by p2", self.p2.total_nodes_seen)
+            self.log("Player 2 Wins!")
+        self.log("turn count:", turn_count)
+        self.log("total nodes seen by p1", self.p1.total_nodes_seen)
+        self.log("total nodes seen by p2", self.p2.total_nodes_seen)
+
+        # Release player resources such as parallel search workers
+        self.p1.close()
+        self.p2.close()
+
+        self.record = {'moves': moves, 'turns': turn_count, 'state': self.state, 
+                       'p1_score': self.board.count_score(self.p1.symbol), 
+                       'p2_score': self.board.count_score(self.p2.symbol), 
+                       'p1_nodes': self.p1.total_nodes_seen, 'p2_nodes': self.p2.total_nodes_seen}
+        for name, player in (('p1', self.p1), ('p2', self.p2)):
+            for attr in ('positions', 'canonical_positions'):
+                positions = getattr(player, attr, None)
+                self.record[f'{name}_{attr}'] = None if positions is None else len(positions)
+        return self.record
 
 
 def main():
-    board_size = 4
+    # Optional 9th argument: board size (4, 6, 8, ...), 4 by default
+    board_size = int(sys.argv[9]) if len(sys.argv) > 9 else 4
     game = GameDriver(p1type=sys.argv[1], p2type=sys.argv[2], num_rows=board_size, num_cols=board_size, 
                       p1_eval_type=sys.argv[3], p1_prune=sys.argv[4], 
                       p2_eval_type=sys.argv[5], p2_prune=sys.argv[6], 
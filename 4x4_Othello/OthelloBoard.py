@@ -1,132 +1,255 @@
-from Board import * 
+from Board import *
+import Bitboard
 
-class OthelloBoard(Board):
-    """Class for Othello board
-    children: successor positions for the current position
-    move: the previous move taken to get to the current position
-    value: the evaluation of the current position"""
-    def __init__(self, rows, cols, p1, p2):
-        Board.__init__(self, rows, cols)
+class CompactOthelloBoard:
+    """Othello position without the search tree fields of OthelloBoard, stored in __slots__ (no per-instance 
+    __dict__) so that the many boards alive during a cloning search take as little memory as possible. It has the 
+    same methods as OthelloBoard and can be used wherever one is (see the compact_boards option of AlphaBetaPlayer).
+    p1_bits, p2_bits: bitboards of the cells owned by each player (see Bitboard.py). The grid is only a
+        view built from these masks.
+    zobrist: Zobrist hash of the position, updated incrementally as cells change
+    p1_count, p2_count: number of pieces of each player, updated incrementally as cells change
+    p1_moves, p2_moves: cached legal move bitboards of each player, None until legal_moves_mask computes them.
+        Every change to the position clears them, so the bitboards must only be changed through set_cell, set_bits,
+        play_move, flip_pieces and undo_move.
+    last_move: the move that led to this position (set by the players)"""
+    __slots__ = ('cols', 'rows', 'geometry', 'p1_symbol', 'p2_symbol', 'p1_bits', 'p2_bits', 'zobrist', 'p1_count', 
+                 'p2_count', 'p1_moves', 'p2_moves', 'last_move')
+
+    def __init__(self, cols, rows, p1, p2):
+        self.cols = cols
+        self.rows = rows
+        self.geometry = Bitboard.geometry(cols, rows)
         self.p1_symbol = p1
         self.p2_symbol = p2
-        self.children = []
-        self.move = None
-        self.value = None 
+        self.p1_bits = 0
+        self.p2_bits = 0
+        self.zobrist = 0
+        self.p1_count = 0
+        self.p2_count = 0
+        self.p1_moves = None
+        self.p2_moves = None
         self.last_move = None
 
 #PYTHON: this function is substitute for clone. call as New = Old.cloneOBoard()
-    def cloneOBoard(self):
-        # When making a new board with clone, call initialize afterwards
-        tmp = OthelloBoard(self.cols, self.rows, self.p1_symbol, self.p2_symbol)
-        tmp.grid = copy.deepcopy(self.grid)
+    def cloneOBoard(self, cls=None):
+        # When making a new board with clone, call initialize afterwards. cls is the class of the copy (the class of
+        # this board by default), e.g. CompactOthelloBoard to copy an OthelloBoard without its search tree fields.
+        tmp = (cls or type(self))(self.cols, self.rows, self.p1_symbol, self.p2_symbol)
+        tmp.p1_bits = self.p1_bits
+        tmp.p2_bits = self.p2_bits
+        tmp.zobrist = self.zobrist
+        tmp.p1_count = self.p1_count
+        tmp.p2_count = self.p2_count
+        tmp.p1_moves = self.p1_moves
+        tmp.p2_moves = self.p2_moves
         tmp.last_move = self.last_move
         return tmp
 
+    @property
+    def grid(self):
+        # Grid view indexed as grid[col][row]; editing the returned lists does not change the board
+        return [[self.get_cell(c, r) for r in range(self.rows)] for c in range(self.cols)]
+
+    @grid.setter
+    def grid(self, grid):
+        # Load the bitboards from a grid indexed as grid[col][row]
+        self.set_bits(self.p1_symbol, 0, 0)
+        self.zobrist = 0
+        for c in range(self.cols):
+            for r in range(self.rows):
+                self.set_cell(c, r, grid[c][r])
+
+    # Board methods, as CompactOthelloBoard does not inherit from Board
+    get_num_cols = Board.get_num_cols
+    get_num_rows = Board.get_num_rows
+    is_in_bounds = Board.is_in_bounds
+    display = Board.display
+
+    def get_cell(self, col, row):
+        if not self.is_in_bounds(col, row):
+            return None
+        bit = 1 << (row * self.cols + col)
+        if self.p1_bits & bit:
+            return self.p1_symbol
+        if self.p2_bits & bit:
+            return self.p2_symbol
+        return EMPTY
+
+    def set_cell(self, col, row, val):
+        if not self.is_in_bounds(col, row):
+            return None
+        sq = row * self.cols + col
+        bit = 1 << sq
+        # Remove the key of the piece being replaced (if any) and add the key of the new piece
+        if self.p1_bits & bit:
+            self.zobrist ^= self.geometry.p1_keys[sq]
+            self.p1_count -= 1
+        elif self.p2_bits & bit:
+            self.zobrist ^= self.geometry.p2_keys[sq]
+            self.p2_count -= 1
+        self.p1_bits &= ~bit
+        self.p2_bits &= ~bit
+        if val == self.p1_symbol:
+            self.p1_bits |= bit
+            self.zobrist ^= self.geometry.p1_keys[sq]
+            self.p1_count += 1
+        elif val == self.p2_symbol:
+            self.p2_bits |= bit
+            self.zobrist ^= self.geometry.p2_keys[sq]
+            self.p2_count += 1
+        self.p1_moves = self.p2_moves = None
+
+    def is_cell_empty(self, col, row):
+        return not (self.p1_bits | self.p2_bits) & (1 << (row * self.cols + col))
+
+    def get_bits(self, symbol):
+        # Returns the (own, opponent) bitboards from the point of view of symbol
+        if symbol == self.p1_symbol:
+            return self.p1_bits, self.p2_bits
+        return self.p2_bits, self.p1_bits
+
+    def set_bits(self, symbol, own, opp):
+        # Inverse of get_bits. The zobrist hash is left to the caller.
+        if symbol == self.p1_symbol:
+            self.p1_bits, self.p2_bits = own, opp
+        else:
+            self.p2_bits, self.p1_bits = own, opp
+        self.p1_count = Bitboard.popcount(self.p1_bits)
+        self.p2_count = Bitboard.popcount(self.p2_bits)
+        self.p1_moves = self.p2_moves = None
+
+    def legal_moves_mask(self, symbol):
+        # Bitboard of every legal move for symbol, computed once per position
+        if symbol == self.p1_symbol:
+            if self.p1_moves is None:
+                self.p1_moves = Bitboard.legal_moves(self.p1_bits, self.p2_bits, self.geometry)
+            return self.p1_moves
+        if self.p2_moves is None:
+            self.p2_moves = Bitboard.legal_moves(self.p2_bits, self.p1_bits, self.geometry)
+        return self.p2_moves
+
+    def legal_moves(self, symbol, mask=None):
+        # List of legal (col, row) moves for symbol in row/column scan order. mask can pass in a
+        # legal_moves_mask result that was already computed.
+        if mask is None:
+            mask = self.legal_moves_mask(symbol)
+        coords = self.geometry.coords
+        return [coords(sq) for sq in Bitboard.squares(mask)]
+
+    def count_flips(self, col, row, symbol):
+        # Number of pieces symbol would flip by playing at (col, row), without changing the board
+        own, opp = self.get_bits(symbol)
+        return Bitboard.popcount(Bitboard.flips(row * self.cols + col, own, opp, self.geometry))
+
     def initialize(self):
         self.set_cell(self.cols //2 -1, self.rows //2 -1,   self.p1_symbol)
         self.set_cell(self.cols //2,    self.rows //2,      self.p1_symbol)
         self.set_cell(self.cols //2 -1, self.rows //2,      self.p2_symbol)
         self.set_cell(self.cols //2,    self.rows //2 -1,   self.p2_symbol)
 
-    def set_coords_in_direction(self, col, row, D):#D=direction
-        if(D.name == 'N'):
-            row += 1
-        elif(D.name == 'NE'):
-            col+=1
-            row+=1
-        elif(D.name == 'E'):
-            col+=1
-        elif(D.name == 'SE'):
-            col+=1
-            row-=1
-        elif(D.name == 'S'):
-            row-=1
-        elif(D.name == 'SW'):
-            col-=1
-            row-=1
-        elif(D.name == 'W'):
-            col-=1
-        elif(D.name == 'NW'):
-            col-=1
-            row+=1
-        else:
-            print("Invalid Direction.")
-        return (col, row)
-
-    #Recursively travel in a direction
-    def check_endpoint(self, col, row, symbol, d, match_symbol):#match is bool type
-        if not self.is_in_bounds(col, row) or self.is_cell_empty(col,row):
-            return False
-        else:
-            if(match_symbol):
-                if(self.get_cell(col, row) == symbol):
-                    return True
-                else:
-                    (next_col, next_row) = self.set_coords_in_direction(col, row, d)
-                    return self.check_endpoint(next_col, next_row, symbol, d, match_symbol)
-            else:
-                if(self.get_cell(col, row) == symbol):
-                    return False
-                else:
-                    (next_col, next_row) = self.set_coords_in_direction(col, row, d)
-                    return self.check_endpoint(next_col, next_row, symbol, d, not match_symbol)
-
     def is_legal_move(self, col, row, symbol):
         if(not self.is_in_bounds(col, row) or not self.is_cell_empty(col, row)):
             return False
-        for d in Direction: #enum from board.py
-            (next_col, next_row) = self.set_coords_in_direction(col, row, d)
-            if(self.check_endpoint(next_col, next_row, symbol, d, False)):
-                return True
-            
-        return False
+        own, opp = self.get_bits(symbol)
+        return Bitboard.flips(row * self.cols + col, own, opp, self.geometry) != 0
         
-    def flip_pieces_helper(self, col, row, symbol, d):
-        if(self.get_cell(col, row) == symbol):
-            return 0;
-        else:
-            self.set_cell(col,row, symbol)
-            (next_col, next_row) = self.set_coords_in_direction(col, row, d)
-            return 1+ self.flip_pieces_helper(next_col, next_row, symbol, d)
-
     def flip_pieces(self, col, row, symbol):
-        pieces_flipped = 0
         if(not self.is_in_bounds(col, row)):
             print("Flip Pieces bad params.")
             exit();
-        for d in Direction:
-            (next_col, next_row) = self.set_coords_in_direction(col,row,d)
-            if(self.check_endpoint(next_col, next_row, symbol, d, False)):
-                pieces_flipped += self.flip_pieces_helper(next_col, next_row, symbol, d);
-
-        return pieces_flipped
+        own, opp = self.get_bits(symbol)
+        flipped = Bitboard.flips(row * self.cols + col, own, opp, self.geometry)
+        count = Bitboard.popcount(flipped)
+        self.update(symbol, own | flipped, opp & ~flipped, count, -count)
+        self.zobrist ^= Bitboard.zobrist_flips(flipped, self.geometry)
+        return count
     
     def has_legal_moves_remaining(self, symbol):
         # Checks if a player with symbol can make any moves
-        for c in range (0, self.cols):
-            for r in range (0, self.rows):
-                if self.is_cell_empty(c, r) and self.is_legal_move(c, r, symbol):
-                    return True
-        return False
+        return self.legal_moves_mask(symbol) != 0
 
     def count_score(self, symbol):
-        # Counts the number of pieces with symbol
-        score = 0
-        for c in range (0, self.cols):
-            for r in range (0, self.rows):
-                if self.grid[c][r] == symbol:
-                    score+=1
-        return score
+        # Number of pieces with symbol, kept up to date as the board changes
+        if symbol == self.p1_symbol:
+            return self.p1_count
+        return self.p2_count
+
+    def update(self, symbol, own, opp, own_change, opp_change):
+        # Like set_bits when the change in piece counts is known, so the counts are updated without recounting
+        if symbol == self.p1_symbol:
+            self.p1_bits, self.p2_bits = own, opp
+            self.p1_count += own_change
+            self.p2_count += opp_change
+        else:
+            self.p2_bits, self.p1_bits = own, opp
+            self.p2_count += own_change
+            self.p1_count += opp_change
+        self.p1_moves = self.p2_moves = None
 
     def play_move(self, col, row, symbol):
-        # Changes the board state with a move
-        self.set_cell(col, row, symbol)
-        self.flip_pieces(col, row, symbol)
+        # Changes the board state with a move (on an empty cell) and returns an undo record for undo_move
+        sq = row * self.cols + col
+        own, opp = self.get_bits(symbol)
+        flipped = Bitboard.flips(sq, own, opp, self.geometry)
+        count = Bitboard.popcount(flipped)
+        undo = (symbol, sq, flipped, count, self.zobrist, self.last_move, self.p1_moves, self.p2_moves)
+        
+        # Place the piece and flip the captured ones, updating the hash with the same keys
+        self.update(symbol, own | (1 << sq) | flipped, opp & ~flipped, count + 1, -count)
+        keys = self.geometry.p1_keys if symbol == self.p1_symbol else self.geometry.p2_keys
+        self.zobrist ^= keys[sq] ^ Bitboard.zobrist_flips(flipped, self.geometry)
+        return undo
+
+    def undo_move(self, undo):
+        # Restores the position (and last_move) from before the play_move call that returned undo, including the 
+        # legal move bitboards cached for it
+        symbol, sq, flipped, count, zobrist, last_move, p1_moves, p2_moves = undo
+        own, opp = self.get_bits(symbol)
+        self.update(symbol, own & ~((1 << sq) | flipped), opp | flipped, -count - 1, count)
+        self.zobrist = zobrist
+        self.last_move = last_move
+        self.p1_moves = p1_moves
+        self.p2_moves = p2_moves
+
+    def hash_key(self, symbol):
+        # Zobrist key of the position with symbol to move, used to index transposition tables
+        if symbol == self.p2_symbol:
+            return self.zobrist ^ self.geometry.p2_to_move_key
+        return self.zobrist
+
+    def canonical(self, symbol):
+        # Canonical form (own, opp, sym) of the position with symbol to move: the bitboards of the smallest 
+        # symmetric copy and the symmetry that maps this board onto it (see Bitboard.canonical)
+        own, opp = self.get_bits(symbol)
+        return Bitboard.canonical(own, opp, self.geometry)
+
+    def canonical_key(self, symbol):
+        # Like hash_key, but computed on the canonical form so that all symmetric copies of a position share a key.
+        # Returns (key, sym), where sym maps moves on this board onto moves of the canonical form.
+        own, opp, sym = self.canonical(symbol)
+        if symbol == self.p2_symbol:
+            return Bitboard.zobrist(opp, own, self.geometry) ^ self.geometry.p2_to_move_key, sym
+        return Bitboard.zobrist(own, opp, self.geometry), sym
+
+    def transform_move(self, move, sym):
+        # Image of a (col, row) move under symmetry sym
+        col, row = move
+        return self.geometry.coords(self.geometry.sym_squares[sym][row * self.cols + col])
+
+    def __getstate__(self):
+        # The geometry is shared and cached per board size, so it is rebuilt instead of pickled
+        state = {name: getattr(self, name) for name in CompactOthelloBoard.__slots__ if name != 'geometry'}
+        state.update(getattr(self, '__dict__', {}))
+        return state
+
+    def __setstate__(self, state):
+        for name, value in state.items():
+            setattr(self, name, value)
+        self.geometry = Bitboard.geometry(self.cols, self.rows)
 
     def __hash__(self):
-        grid_hash = hash(tuple([tuple(row) for row in self.grid]))
-        last_move_hash = hash(self.last_move)
-        return grid_hash
+        return self.zobrist
     
     def __str__(self):
         string = ''
@@ -135,4 +258,18 @@ class OthelloBoard(Board):
                 string += col + ' '
             string += '| '
                 
-        return string
\ No newline at end of file
+        return string
+
+
+class OthelloBoard(CompactOthelloBoard, Board):
+    """Class for Othello board
+    children: successor positions for the current position
+    move: the previous move taken to get to the current position
+    value: the evaluation of the current position
+    The position itself is stored and played by CompactOthelloBoard."""
+    def __init__(self, cols, rows, p1, p2):
+        # Board.__init__ is not called because the list-of-lists grid is not stored
+        CompactOthelloBoard.__init__(self, cols, rows, p1, p2)
+        self.children = []
+        self.move = None
+        self.value = None 
@@ -0,0 +1,124 @@
+"""Parallel root-split search for AlphaBetaPlayer (Young Brothers Wait at the root)
+
+The first root move (the eldest brother) is searched in the main process to get an alpha bound. The remaining
+root moves are then searched by a process pool. Every worker reads the best root value found so far from a shared
+multiprocessing.Value when it starts a task and publishes its own result when it finishes. Moves searched later
+therefore still prune against the best alpha available.
+
+A worker that starts with alpha already raised by another move only learns a bound for a move that fails low (its
+fail-soft value is at most that alpha), so results are only taken as values when they beat the alpha their task
+started with. The best value is then always an exact one. A move that failed low with a bound equal to the best value
+may tie it, so those that come before the chosen move in the search order are searched again with a full window,
+which picks the same move as the serial search.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+import multiprocessing
+
+# Per-worker state, set by init_worker
+_shared_alpha = None
+_players = {}
+
+
+def init_worker(shared_alpha):
+    # Runs once in every worker process
+    global _shared_alpha
+    _shared_alpha = shared_alpha
+
+
+def search_root_move(options: dict, board, move: tuple) -> tuple:
+    # Search the position after a root move in a worker process
+    # Returns (value, alpha the search started with, nodes seen, max depth seen, tt hits, tt misses). The value is 
+    # exact if it is greater than alpha, and an upper bound otherwise.
+    from Players import AlphaBetaPlayer
+
+    # Keep one player per configuration in each worker so its transposition table and ordering tables persist
+    key = tuple(sorted(options.items()))
+    player = _players.get(key)
+    if player is None:
+        player = _players[key] = AlphaBetaPlayer(**options)
+    player.total_nodes_seen = 0
+    player.max_depth_seen = 0
+    player.tt_hits = 0
+    player.tt_misses = 0
+    if player.tt is not None:
+        player.tt.new_search()
+    player.active_orderings = [o for o in player.orderings if o.enabled()]
+    for o in player.active_orderings:
+        o.new_search(board)
+
+    # Search the root move's successor with the best alpha published so far
+    child, _ = player.make_move(board, move, player.symbol)
+    alpha = _shared_alpha.value
+    v = player.search_child(child, alpha, float('inf'))
+
+    # Publish the result so that other workers can prune against it
+    with _shared_alpha.get_lock():
+        if v > _shared_alpha.value:
+            _shared_alpha.value = v
+    return v, alpha, player.total_nodes_seen + 1, player.max_depth_seen, player.tt_hits, player.tt_misses
+
+
+class ParallelRootSearch:
+    """Process pool that searches the root moves of an AlphaBetaPlayer in parallel
+    workers: number of worker processes
+    """
+    def __init__(self, workers: int):
+        self.workers = workers
+        self.shared_alpha = multiprocessing.Value('d', -float('inf'))
+        self.pool = ProcessPoolExecutor(max_workers=workers, initializer=init_worker, initargs=(self.shared_alpha,))
+
+    def search(self, player, board, moves: list) -> tuple:
+        # Returns the best (value, move) at the root over moves, updating the player's counters
+        # type:(AlphaBetaPlayer, OthelloBoard, list) -> (float, (int, int))
+
+        # Search the eldest brother serially to get an alpha bound
+        s, undo = player.make_move(board, moves[0], player.symbol)
+        player.total_nodes_seen += 1
+        try:
+            v = player.search_child(s, -float('inf'), float('inf'))
+        finally:
+            if undo is not None:
+                board.undo_move(undo)
+        move = moves[0]
+        with self.shared_alpha.get_lock():
+            self.shared_alpha.value = v
+
+        # Search the younger brothers in the pool
+        futures = [self.pool.submit(search_root_move, player.options, board, m) for m in moves[1:]]
+
+        # Collect the results in move order so ties resolve like the serial search. With pruning, moves that failed 
+        # low only have an upper bound, which never beats an exact value; without it every value is exact.
+        failed_low = []
+        for m, future in zip(moves[1:], futures):
+            v2, alpha_used, nodes, depth_seen, tt_hits, tt_misses = future.result()
+            player.total_nodes_seen += nodes
+            player.max_depth_seen = max(player.max_depth_seen, depth_seen)
+            player.tt_hits += tt_hits
+            player.tt_misses += tt_misses
+            if player.prune == '1' and v2 <= alpha_used:
+                failed_low.append((m, v2))
+            elif v2 > v:
+                v, move = v2, m
+        
+        # A move before the chosen one whose bound equals the best value may tie it, and the serial search would have
+        # picked it: find its exact value
+        chosen = moves.index(move)
+        for m, bound in failed_low:
+            if moves.index(m) > chosen:
+                break
+            if bound == v:
+                s, undo = player.make_move(board, m, player.symbol)
+                player.total_nodes_seen += 1
+                try:
+                    exact = player.search_child(s, -float('inf'), float('inf'))
+                finally:
+                    if undo is not None:
+                        board.undo_move(undo)
+                if exact == v:
+                    move = m
+                    break
+        return v, move
+
+    def close(self):
+        self.pool.shutdown()
@@ -0,0 +1,74 @@
+"""Perft node-count benchmark for the Othello move generator
+
+perft(board, symbol, depth) counts the leaf positions of the full game tree to a fixed depth, playing and undoing
+moves on one board with OthelloBoard.play_move/undo_move. A pass counts as a move, and a finished game counts as a
+leaf wherever it ends. The counts only depend on the rules, so they check move generation on every board size
+(8x8 from the start: 4, 12, 56, 244, 1396, 8200, 55092, 390216, ...), and the time per node measures its speed.
+
+Usage: python Perft.py [board size ...]
+"""
+
+import sys
+import time
+
+from OthelloBoard import OthelloBoard
+import Bitboard
+
+# Deepest perft depth benchmarked for each board size
+PERFT_DEPTHS = {4: 12, 6: 8, 8: 8}
+
+
+def perft(board: OthelloBoard, symbol: str, depth: int) -> int:
+    # Number of leaf positions depth moves below board with symbol to move
+    other = board.p2_symbol if symbol == board.p1_symbol else board.p1_symbol
+    mask = board.legal_moves_mask(symbol)
+    if not mask:
+        # Game over, or a pass
+        if depth == 1 or not board.legal_moves_mask(other):
+            return 1
+        return perft(board, other, depth - 1)
+
+    # Bulk count: every legal move at the last ply is one leaf
+    if depth == 1:
+        return Bitboard.popcount(mask)
+
+    nodes = 0
+    for col, row in board.legal_moves(symbol, mask):
+        undo = board.play_move(col, row, symbol)
+        nodes += perft(board, other, depth - 1)
+        board.undo_move(undo)
+    return nodes
+
+
+def start_board(size: int) -> OthelloBoard:
+    # Starting position of a size x size game
+    board = OthelloBoard(size, size, 'X', 'O')
+    board.initialize()
+    return board
+
+
+def benchmark(size: int, max_depth: int = None) -> list:
+    # Perft from the starting position at every depth up to max_depth; returns one result dict per depth
+    if max_depth is None:
+        max_depth = PERFT_DEPTHS.get(size, 6)
+    board = start_board(size)
+    results = []
+    for depth in range(1, max_depth + 1):
+        start = time.perf_counter()
+        nodes = perft(board, 'X', depth)
+        elapsed = time.perf_counter() - start
+        results.append({'size': size, 'depth': depth, 'nodes': nodes, 'time': elapsed,
+                        'nodes_per_second': nodes / elapsed if elapsed > 0 else float('inf')})
+    return results
+
+
+def main():
+    sizes = [int(s) for s in sys.argv[1:]] or sorted(PERFT_DEPTHS)
+    print(f"{'size':>5} {'depth':>5} {'nodes':>12} {'time (s)':>10} {'nodes/s':>12}")
+    for size in sizes:
+        for r in benchmark(size):
+            print(f"{r['size']:>5} {r['depth']:>5} {r['nodes']:>12} {r['time']:>10.3f} {r['nodes_per_second']:>12.0f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,4 +1,16 @@
-from OthelloBoard import OthelloBoard
+from OthelloBoard import OthelloBoard, CompactOthelloBoard
+import Bitboard
+import time
+from TranspositionTable import TranspositionTable, EXACT, LOWER, UPPER
+from MoveOrdering import make_orderings
+from ParallelSearch import ParallelRootSearch
+from Solver import OpeningBook
+from SearchStats import SearchStats
+import BatchEval
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+import math
+import random
 
 
 class Player:
@@ -12,6 +24,10 @@ class Player:
     def get_move(self, board):
         raise NotImplementedError()
 
+    def close(self):
+        # Release any resources (e.g. worker processes) held by the player
+        pass
+
 
 
 class HumanPlayer(Player):
@@ -30,6 +46,11 @@ class HumanPlayer(Player):
         return  (col, row)
 
 
+class SearchTimeout(Exception):
+    """Raised inside the search when an iterative-deepening time budget runs out"""
+    pass
+
+
 class AlphaBetaPlayer(Player):
     """Class for Alphabeta AI: implement functions minimax, eval_board, get_successors, get_move
     eval_type: int
@@ -39,32 +60,138 @@ class AlphaBetaPlayer(Player):
     max_depth: one move makes the depth of a position to 1, search should not exceed depth
     total_nodes_seen: used to keep track of the number of nodes the algorithm has seearched through
     symbol: X for player 1 and O for player 2
+    tt_size: number of transposition table slots, 0 disables the table
+    tt_hits, tt_misses: number of transposition table probes that found / did not find the position
+    time_limit: per-move wall-clock budget in seconds. If set, get_move uses iterative deepening up to max_depth 
+        and returns the move of the deepest iteration that finished in time
+    depth_reached: search depth of the move last returned by get_move
+    last_value: root evaluation of the move last returned by get_move
+    ordering: move ordering strategies (see MoveOrdering.py) as a comma-separated string or list of names from 
+        "pv", "killer", "history" and "static", applied after the transposition table move
+    make_unmake: if True, the search plays and undoes moves on a single copy of the root board instead of 
+        cloning a board for every child
+    workers: number of processes for a parallel root-split search (see ParallelSearch.py); 0 or 1 searches 
+        serially. Only used for fixed-depth searches (no time_limit).
+    book: path of a perfect-play book written by Solver.py. Positions found in the book are played without 
+        searching (last_value is then the exact final disc difference), other positions fall back to search
+    book_hits, book_misses: number of moves found / not found in the book
+    symmetry: if True, root moves that lead to symmetric positions are searched once, and the transposition table 
+        is keyed by the canonical form of each position (OthelloBoard.canonical_key) so that the symmetric copies 
+        of a position share one entry
+    track_positions: if True, positions and canonical_positions collect the hash keys and canonical keys of every 
+        position the player searches (over all its moves), to measure how many positions symmetry makes redundant
+    batch_eval: if set to n > 0, nodes one ply above max_depth with at least n moves score all their leaf children 
+        in one NumPy batch (see BatchEval.py) instead of building and evaluating each child. Values, node counts 
+        and cutoffs are the same as without batching; 0 disables it. None (the default) uses 
+        BatchEval.AUTO_MIN_MOVES without pruning and disables it with pruning, where batching was measured slower.
+    search: "alphabeta" for the max_value/min_value search, or "pvs" for a negamax principal variation search
+        (see pvs) that searches every move after the first with a null window. Without pruning both are minimax.
+    aspiration: with search="pvs" and a time_limit, half-width of the window around the previous iteration's 
+        value that each iterative deepening iteration starts with; 0 searches every iteration with a full window
+    aspiration_researches: number of iterations that fell outside their aspiration window and were searched again
+    stats: if True, start with search statistics enabled (see enable_stats and SearchStats.py)
+    compact_boards: if True, get_move searches a CompactOthelloBoard copy of the board, so that every board the 
+        search clones is a slotted CompactOthelloBoard instead of an OthelloBoard
     """
-    def __init__(self, symbol, eval_type, prune, max_depth):
+    def __init__(self, symbol, eval_type, prune, max_depth, tt_size=0, time_limit=None, ordering='pv', 
+                 make_unmake=False, workers=0, book=None, symmetry=False, track_positions=False, 
+                 batch_eval=None, search='alphabeta', aspiration=0, stats=False, 
+                 compact_boards=False):
         Player.__init__(self, symbol)
         
+        # Keep the constructor arguments so that parallel search workers can build the same player
+        self.options = {'symbol': symbol, 'eval_type': eval_type, 'prune': prune, 'max_depth': max_depth, 
+                        'tt_size': tt_size, 'time_limit': time_limit, 'ordering': ordering, 
+                        'make_unmake': make_unmake, 'symmetry': symmetry, 'batch_eval': batch_eval, 
+                        'search': search, 'aspiration': aspiration, 'compact_boards': compact_boards}
+        
         # Load in the parameters
         self.eval_type = str(eval_type)
         self.prune = str(prune)
         self.max_depth = int(max_depth)
+        self.time_limit = None if time_limit is None else float(time_limit)
+        self.make_unmake = bool(make_unmake)
+        self.workers = int(workers)
+        self.symmetry = bool(symmetry)
+        if batch_eval is None:
+            batch_eval = BatchEval.AUTO_MIN_MOVES if self.prune != '1' else 0
+        self.batch_eval = int(batch_eval)
+        if search not in ('alphabeta', 'pvs'):
+            raise ValueError(f'Unknown search {search!r}, expected "alphabeta" or "pvs"')
+        self.search = search
+        self.aspiration = float(aspiration)
+        self.compact_boards = bool(compact_boards)
+        
+        # Value of the previous iterative deepening iteration, the center of the next aspiration window
+        self.aspiration_center = None
+        
+        # Process pool for parallel root-split search, started on the first parallel search
+        self.parallel = None
+        
+        # Memory-mapped perfect-play book
+        self.book = OpeningBook(book) if book else None
+        self.book_hits = 0
+        self.book_misses = 0
+        
+        # Depth limit of the current search; below max_depth during iterative deepening
+        self.search_depth = self.max_depth
+        
+        # Principal variation of the last search as a list of moves, and the previous iteration's PV as a
+        # {position hash_key: move} map used to search PV moves first
+        self.pv_table = {}
+        self.pv_moves = {}
+        
+        # Move ordering strategies, and the ones enabled for the current search
+        self.orderings = make_orderings(ordering, self)
+        self.active_orderings = []
+        
+        # Iterative deepening deadline (time.perf_counter() value), None when there is no time limit
+        self.deadline = None
         
         # Tracker variables
         self.max_depth_seen = 0
         self.total_nodes_seen = 0
+        self.tt_hits = 0
+        self.tt_misses = 0
+        self.depth_reached = 0
+        self.last_value = None
+        self.aspiration_researches = 0
+        
+        # Unique positions searched, by hash key and by canonical key (None unless track_positions is set)
+        self.positions = set() if track_positions else None
+        self.canonical_positions = set() if track_positions else None
+
+        # Transposition table shared by every search this player runs
+        self.tt = TranspositionTable(int(tt_size)) if int(tt_size) > 0 else None
 
         # Set the opponent's symbol
         if symbol == 'X':
             self.oppSym = 'O'
         else:
             self.oppSym = 'X'
+        
+        # Per-move search statistics, None while disabled
+        self.stats = None
+        if stats:
+            self.enable_stats()
+
+    def enable_stats(self) -> SearchStats:
+        # Record search statistics for every following move; returns the recorder (kept if already enabled)
+        if self.stats is None:
+            self.stats = SearchStats(self)
+            self.stats.attach()
+        return self.stats
+
+    def disable_stats(self) -> SearchStats:
+        # Stop recording and restore the uninstrumented search; returns the recorder with the moves recorded so far
+        stats, self.stats = self.stats, None
+        if stats is not None:
+            stats.detach()
+        return stats
 
     def terminal_state(self, board: OthelloBoard) -> bool:
         # If either player can make a move, it's not a terminal state
-        for c in range(board.cols):
-            for r in range(board.rows):
-                if board.is_legal_move(c, r, "X") or board.is_legal_move(c, r, "O"):
-                    return False 
-        return True 
+        return not (board.has_legal_moves_remaining(self.symbol) or board.has_legal_moves_remaining(self.oppSym))
 
 
     def terminal_value(self, board: OthelloBoard) -> int:
@@ -86,6 +213,19 @@ class AlphaBetaPlayer(Player):
             return "X"
 
 
+    def legal_moves_mask(self, board: OthelloBoard, symbol: str) -> int:
+        # Legal move bitboard of symbol, from the board's cache. The search generates moves through this method and 
+        # legal_moves so that SearchStats can time them on this player only.
+        return board.legal_moves_mask(symbol)
+
+
+    def legal_moves(self, board: OthelloBoard, symbol: str, mask: int = None) -> list:
+        # Legal (col, row) moves of symbol in row/column scan order (see legal_moves_mask)
+        if mask is None:
+            mask = self.legal_moves_mask(board, symbol)
+        return board.legal_moves(symbol, mask)
+
+
     def get_successors(self, board: OthelloBoard, player_symbol: str) -> list:
         # Write function that takes the current state and generates all successors obtained by legal moves
         # type:(board, player_symbol) -> (list)
@@ -93,15 +233,13 @@ class AlphaBetaPlayer(Player):
         # Initialize the list of successors
         successors = []
         
-        # Iterate over every position, the row and column
-        for r in range(board.get_num_rows()):
-            for c in range(board.get_num_cols()):
-                # If the move is legal, clone the board and play the move, save as successor
-                if board.is_legal_move(c, r, player_symbol):
-                    new_board = board.cloneOBoard()
-                    new_board.play_move(c, r, player_symbol)
-                    new_board.last_move = (c, r)
-                    successors.append(new_board)
+        # Iterate over every legal move (in row/column scan order) from the bitboard move generator
+        for c, r in self.legal_moves(board, player_symbol):
+            # Clone the board and play the move, save as successor
+            new_board = board.cloneOBoard()
+            new_board.play_move(c, r, player_symbol)
+            new_board.last_move = (c, r)
+            successors.append(new_board)
 
         # If there are no successors, return the board as a "Pass" action
         if len(successors) == 0:
@@ -111,40 +249,75 @@ class AlphaBetaPlayer(Player):
         return successors
 
 
-    def eval_board(self, board: OthelloBoard) -> float:
+    def make_move(self, board: OthelloBoard, move: tuple, player_symbol: str) -> tuple:
+        # Returns the successor reached by move (None for a "Pass") and the undo record that restores board, which 
+        # is None unless the move was played in place (make_unmake mode)
+        if move is None:
+            return board, None
+        col, row = move
+        if self.make_unmake:
+            undo = board.play_move(col, row, player_symbol)
+            board.last_move = move
+            return board, undo
+        new_board = board.cloneOBoard()
+        new_board.play_move(col, row, player_symbol)
+        new_board.last_move = move
+        return new_board, None
+
+
+    def eval_board(self, board: OthelloBoard, moves_mask: int = None, opp_moves_mask: int = None) -> float:
         # Write eval function here
         # type:(board) -> (float)
+        # moves_mask, opp_moves_mask: legal move bitboards of this player and the opponent, if the search 
+        # already generated them. Missing ones are only generated when the evaluation needs them.
 
-        # Check if terminal state
-        if self.terminal_state(board):
-            return self.terminal_value(board)
+        # Check if terminal state; if either player is known to have a move, the game is not over
+        if not moves_mask and not opp_moves_mask:
+            if moves_mask is None:
+                moves_mask = self.legal_moves_mask(board, self.symbol)
+            if opp_moves_mask is None:
+                opp_moves_mask = self.legal_moves_mask(board, self.oppSym)
+            if not moves_mask and not opp_moves_mask:
+                return self.terminal_value(board)
 
-        # H0: Piece Difference - difference in number of pieces
+        # H0: Piece Difference - difference in number of pieces, kept up to date by the board
         if self.eval_type == "0":
             return board.count_score(self.symbol) - board.count_score(self.oppSym)
         
+        # H1 and H2 need the moves of both players
+        if moves_mask is None:
+            moves_mask = self.legal_moves_mask(board, self.symbol)
+        if opp_moves_mask is None:
+            opp_moves_mask = self.legal_moves_mask(board, self.oppSym)
         
-        # H1: Mobility - difference in number of legal moves
-        elif self.eval_type == "1":
-            return len(self.get_successors(board, self.symbol)) - len(self.get_successors(board, self.oppSym))        
+        # H1: Mobility - difference in number of legal moves. A player without moves still has the "Pass" 
+        # successor, so it counts as one move.
+        if self.eval_type == "1":
+            return max(Bitboard.popcount(moves_mask), 1) - max(Bitboard.popcount(opp_moves_mask), 1)
         
         
         # H2: Custom Heuristic - Of all successor states for each player, the difference in the sum of the number of 
-        # symbols that would be flipped
+        # symbols that would be flipped. Computed from the flip counts of each move instead of building the successors.
         elif self.eval_type == "2":
-            # Get the successors for each player
-            successors = self.get_successors(board, self.symbol)
-            opp_successors = self.get_successors(board, self.oppSym)
+            score = board.count_score(self.symbol)
+            opp_score = board.count_score(self.oppSym)
             
             # Initialize the total number of flipped pieces
             total = 0
             opp_total = 0
             
-            # Calculate the total number of flipped pieces for each player of each action
-            for s in successors:
-                total += abs(board.count_score(self.symbol) - s.count_score(self.oppSym))
-            for s in opp_successors:
-                opp_total += abs(board.count_score(self.symbol) - s.count_score(self.oppSym))
+            # Our move flipping f pieces leaves the opponent with opp_score - f pieces; without a move the "Pass" 
+            # successor is the board itself
+            for c, r in self.legal_moves(board, self.symbol, moves_mask):
+                total += abs(score - (opp_score - board.count_flips(c, r, self.symbol)))
+            if not moves_mask:
+                total += abs(score - opp_score)
+            
+            # An opponent move flipping f pieces leaves them with opp_score + 1 + f pieces
+            for c, r in self.legal_moves(board, self.oppSym, opp_moves_mask):
+                opp_total += abs(score - (opp_score + 1 + board.count_flips(c, r, self.oppSym)))
+            if not opp_moves_mask:
+                opp_total += abs(score - opp_score)
                 
             # Return the difference in the total number of flipped pieces each player can make
             return total - opp_total
@@ -152,82 +325,468 @@ class AlphaBetaPlayer(Player):
         return 0.0
         
 
+    def tt_key(self, board: OthelloBoard, symbol: str, key: int) -> tuple:
+        # Transposition table key of a position with symbol to move, and the symmetry its moves are stored under
+        if self.symmetry:
+            return board.canonical_key(symbol)
+        return key, 0
+
+
+    def probe_tt(self, key: int, alpha: float, beta: float, depth: int, board: OthelloBoard = None, 
+                 sym: int = 0) -> tuple:
+        # Look up a position in the transposition table
+        # type:(int, float, float, int) -> (tuple, tuple)
+        # Returns the (value, move) result if the stored entry settles the node (otherwise None), and the stored
+        # best move so it can be searched first
+        entry = self.tt.probe(key)
+        if entry is None:
+            self.tt_misses += 1
+            return None, None
+        self.tt_hits += 1
+        _, tt_depth, value, bound, move, _ = entry
+        
+        # Under a canonical key the move is stored on the canonical form; map it back onto this board
+        if sym and move is not None:
+            move = board.transform_move(move, board.geometry.sym_inverse[sym])
+        
+        # The value can only be used if it was searched at least as deep, and never at the root where a move is needed
+        if depth > 1 and tt_depth >= self.search_depth - depth:
+            if bound == EXACT:
+                return (value, move), move
+            # Bounds only decide the node if it would have been pruned anyway
+            if self.prune == '1' and ((bound == LOWER and value >= beta) or (bound == UPPER and value <= alpha)):
+                return (value, move), move
+        return None, move
+
+
+    def store_tt(self, key: int, v: float, move: tuple, alpha: float, beta: float, depth: int, 
+                 board: OthelloBoard = None, sym: int = 0):
+        # Save the result of a node searched with the window (alpha, beta) it was entered with
+        if sym and move is not None:
+            move = board.transform_move(move, sym)
+        if self.prune == '1' and v <= alpha:
+            bound = UPPER
+        elif self.prune == '1' and v >= beta:
+            bound = LOWER
+        else:
+            bound = EXACT
+        self.tt.store(key, self.search_depth - depth, v, bound, move)
+
+
+    def order_key(self, move: tuple, tt_move: tuple, key: int, depth: int) -> list:
+        # Sort key of a move: the transposition table move first, then the ranks of each ordering strategy
+        return [move != tt_move] + [o.rank(move, key, depth) for o in self.active_orderings]
+
+
+    def unique_moves(self, board: OthelloBoard, symbol: str, moves: list) -> list:
+        # Drop the moves that lead to a position symmetric to that of an earlier move (in scan order)
+        seen = set()
+        unique = []
+        for col, row in moves:
+            undo = board.play_move(col, row, symbol)
+            key, _ = board.canonical_key(self.flip_symbol(symbol))
+            board.undo_move(undo)
+            if key not in seen:
+                seen.add(key)
+                unique.append((col, row))
+        return unique
+
+
+    def leaf_values(self, board: OthelloBoard, moves: list, symbol: str) -> list:
+        # Values of the leaf positions reached by playing each move for symbol, scored in one batch
+        own, opp = board.get_bits(symbol)
+        geom = board.geometry
+        child_own = []
+        child_opp = []
+        for col, row in moves:
+            sq = geom.square(col, row)
+            flipped = Bitboard.flips(sq, own, opp, geom)
+            child_own.append(own | (1 << sq) | flipped)
+            child_opp.append(opp & ~flipped)
+        
+        # The evaluation is from the point of view of this player
+        if symbol != self.symbol:
+            child_own, child_opp = child_opp, child_own
+        return BatchEval.evaluate(np.array(child_own, dtype=np.uint64), np.array(child_opp, dtype=np.uint64), 
+                                  self.eval_type, BatchEval.batch_geometry(board.cols, board.rows)).tolist()
+
+
+    def batch_leaves(self, moves: list, depth: int) -> bool:
+        # Whether the children of a node at ply depth are scored with leaf_values
+        return (self.batch_eval > 0 and depth + 1 == self.search_depth and len(moves) >= self.batch_eval 
+                and self.positions is None)
+
+
+    def track_position(self, board: OthelloBoard, symbol: str):
+        # Record a searched position (with symbol to move) for the unique position counts
+        self.positions.add(board.hash_key(symbol))
+        self.canonical_positions.add(board.canonical_key(symbol)[0])
+
+
+    def record_cutoff(self, move: tuple, depth: int):
+        # Let the ordering strategies learn from a move that caused a cutoff
+        for o in self.active_orderings:
+            o.cutoff(move, depth)
+
+
     def max_value(self, board: OthelloBoard, alpha: float, beta: float, depth: int):
         # Write max_value function here
         # type:(board, float, float, int) -> (float)
         
         self.max_depth_seen = max(self.max_depth_seen, depth)
+        self.pv_table[depth] = []
+        if self.positions is not None:
+            self.track_position(board, self.symbol)
+        
+        # Stop the search if the iterative deepening budget has run out
+        if self.deadline is not None and time.perf_counter() > self.deadline:
+            raise SearchTimeout()
+        
+        # Generate the legal moves once; they serve the terminal test, the evaluation and the expansion
+        moves_mask = self.legal_moves_mask(board, self.symbol)
+        
+        # Check if terminal state or max depth; if so, return the evaluation of the board. The other player's 
+        # moves are only needed here to tell a pass from the end of the game.
+        if not moves_mask or depth == self.search_depth:
+            opp_moves_mask = None if moves_mask else self.legal_moves_mask(board, self.oppSym)
+            if not moves_mask and not opp_moves_mask:
+                return self.terminal_value(board), (None, None)
+            if depth == self.search_depth:
+                return self.eval_board(board, moves_mask, opp_moves_mask), (None, None)
+        
+        # Check the transposition table; the stored best move is searched first
+        key = board.hash_key(self.symbol)
+        tt_move = None
+        if self.tt is not None:
+            tt_key, sym = self.tt_key(board, self.symbol, key)
+            result, tt_move = self.probe_tt(tt_key, alpha, beta, depth, board, sym)
+            if result is not None:
+                return result
+            alpha_orig, beta_orig = alpha, beta
         
-        # Check if terminal state or max depth; if so, return the evaluation of the board
-        if self.terminal_state(board) or depth == self.max_depth:
-            return self.eval_board(board), (None, None)
+        # Search the table's best move first, then order the rest with the move ordering strategies
+        moves = self.legal_moves(board, self.symbol, moves_mask)
+        if depth == 1 and self.symmetry:
+            moves = self.unique_moves(board, self.symbol, moves)
+        if len(moves) > 1 and (tt_move is not None or self.active_orderings):
+            moves.sort(key=lambda m: self.order_key(m, tt_move, key, depth))
         
-        # Initialize the value and move for comparison
+        # Initialize the value and move for comparison (a "Pass" keeps the board's last move)
         v = float('-inf')
-        move = self.get_successors(board, self.symbol)[0].last_move
+        move = moves[0] if moves else board.last_move
         
-        # Iterate over all successors
-        for s in self.get_successors(board, self.symbol):
+        # Score all the children at once if they are leaves; they are still visited one by one below
+        values = None
+        if self.batch_leaves(moves, depth):
+            values = self.leaf_values(board, moves, self.symbol)
+            self.max_depth_seen = max(self.max_depth_seen, depth + 1)
+            self.pv_table[depth + 1] = []
+        
+        # Iterate over all successors (None is the "Pass" successor)
+        for i, m in enumerate(moves or [None]):
             # Increment the total number of nodes seen
             self.total_nodes_seen += 1
-            
-            # Get the min value of the successor (the move they would play if playing optimally)
-            v2, _ = self.min_value(s, alpha, beta, depth + 1)
+            if values is not None:
+                v2 = values[i]
+            else:
+                # Clone the board for the move, or play it in place in make/unmake mode
+                s, undo = self.make_move(board, m, self.symbol)
+                
+                # Get the min value of the successor (the move they would play if playing optimally)
+                try:
+                    v2, _ = self.min_value(s, alpha, beta, depth + 1)
+                finally:
+                    # Restore the board even if the search timed out
+                    if undo is not None:
+                        board.undo_move(undo)
             
             # If the result of the action P2 takes is better than current best case scenario, update the value and move
             if v2 > v:
-                v, move = v2, s.last_move
+                v, move = v2, (m if m is not None else board.last_move)
+                self.pv_table[depth] = [move] + self.pv_table[depth + 1]
         
                 # Alpha-beta pruning if enabled
                 alpha = max(alpha, v)
                 if self.prune == '1' and v >= beta:
-                    return v, move
+                    self.record_cutoff(move, depth)
+                    break
+            
+            # At the root, ties go to the move that comes first in scan order, so that move ordering only changes the
+            # number of nodes searched. With pruning, a move searched after the best one and equal to it has only 
+            # failed low, so it is searched again with an open window to tell a tie from a worse move.
+            elif depth == 1 and v2 == v and m is not None and (m[1], m[0]) < (move[1], move[0]):
+                if self.prune == '1' and values is None:
+                    v2 = self.root_tie_value(board, m, beta)
+                if v2 == v:
+                    move = m
+                    self.pv_table[depth] = [move] + self.pv_table[depth + 1]
+        
+        # Save the result in the transposition table
+        if self.tt is not None:
+            self.store_tt(tt_key, v, move, alpha_orig, beta_orig, depth, board, sym)
         
         # Return the optimal value and move
         return v, move
     
     
+    def root_tie_value(self, board: OthelloBoard, move: tuple, beta: float) -> float:
+        # Exact value (below beta) of a root move whose search failed low against an equal best value
+        self.total_nodes_seen += 1
+        s, undo = self.make_move(board, move, self.symbol)
+        try:
+            return self.search_child(s, -float('inf'), beta)
+        finally:
+            if undo is not None:
+                board.undo_move(undo)
+    
+    
     def min_value(self, board: OthelloBoard, alpha: float, beta: float, depth: int):
         # Write min_value function here
         # type:(board, float, float, int) -> (float)
         
         self.max_depth_seen = max(self.max_depth_seen, depth)
+        self.pv_table[depth] = []
+        if self.positions is not None:
+            self.track_position(board, self.oppSym)
+        
+        # Stop the search if the iterative deepening budget has run out
+        if self.deadline is not None and time.perf_counter() > self.deadline:
+            raise SearchTimeout()
         
-        # Check if terminal state or max depth; if so, return the evaluation of the board
-        if self.terminal_state(board) or depth == self.max_depth:
-            return self.eval_board(board), (None, None)
+        # Generate the legal moves once; they serve the terminal test, the evaluation and the expansion
+        moves_mask = self.legal_moves_mask(board, self.oppSym)
         
-        # Initialize the value and move for comparison
+        # Check if terminal state or max depth; if so, return the evaluation of the board. The other player's 
+        # moves are only needed here to tell a pass from the end of the game.
+        if not moves_mask or depth == self.search_depth:
+            opp_moves_mask = None if moves_mask else self.legal_moves_mask(board, self.symbol)
+            if not moves_mask and not opp_moves_mask:
+                return self.terminal_value(board), (None, None)
+            if depth == self.search_depth:
+                return self.eval_board(board, opp_moves_mask, moves_mask), (None, None)
+        
+        # Check the transposition table; the stored best move is searched first
+        key = board.hash_key(self.oppSym)
+        tt_move = None
+        if self.tt is not None:
+            tt_key, sym = self.tt_key(board, self.oppSym, key)
+            result, tt_move = self.probe_tt(tt_key, alpha, beta, depth, board, sym)
+            if result is not None:
+                return result
+            alpha_orig, beta_orig = alpha, beta
+        
+        # Search the table's best move first, then order the rest with the move ordering strategies
+        moves = self.legal_moves(board, self.oppSym, moves_mask)
+        if len(moves) > 1 and (tt_move is not None or self.active_orderings):
+            moves.sort(key=lambda m: self.order_key(m, tt_move, key, depth))
+        
+        # Initialize the value and move for comparison (a "Pass" keeps the board's last move)
         v = float('inf')
-        move = self.get_successors(board, self.oppSym)[0].last_move
+        move = moves[0] if moves else board.last_move
+        
+        # Score all the children at once if they are leaves; they are still visited one by one below
+        values = None
+        if self.batch_leaves(moves, depth):
+            values = self.leaf_values(board, moves, self.oppSym)
+            self.max_depth_seen = max(self.max_depth_seen, depth + 1)
+            self.pv_table[depth + 1] = []
         
-        # Iterate over all successors
-        for s in self.get_successors(board, self.oppSym):
+        # Iterate over all successors (None is the "Pass" successor)
+        for i, m in enumerate(moves or [None]):
             # Increment the total number of nodes seen
             self.total_nodes_seen += 1
-            
-            # Get the max value of the successor (the move they would play if playing optimally)
-            v2, _ = self.max_value(s, alpha, beta, depth + 1)
+            if values is not None:
+                v2 = values[i]
+            else:
+                # Clone the board for the move, or play it in place in make/unmake mode
+                s, undo = self.make_move(board, m, self.oppSym)
+                
+                # Get the max value of the successor (the move they would play if playing optimally)
+                try:
+                    v2, _ = self.max_value(s, alpha, beta, depth + 1)
+                finally:
+                    # Restore the board even if the search timed out
+                    if undo is not None:
+                        board.undo_move(undo)
             
             # If the result of the action P2 takes is better than current best case scenario, update the value and move
             if v2 < v:
-                v, move = v2, s.last_move
+                v, move = v2, (m if m is not None else board.last_move)
+                self.pv_table[depth] = [move] + self.pv_table[depth + 1]
                 
                 # Alpha-beta pruning if enabled
                 beta = min(beta, v)
                 if self.prune == '1' and v <= alpha:
-                    return v, move
+                    self.record_cutoff(move, depth)
+                    break
+        
+        # Save the result in the transposition table
+        if self.tt is not None:
+            self.store_tt(tt_key, v, move, alpha_orig, beta_orig, depth, board, sym)
                 
         # Return the optimal value and move
         return v, move
 
+
+    def pvs(self, board: OthelloBoard, alpha: float, beta: float, depth: int, symbol: str):
+        # Negamax principal variation search: one function for both players, with values from the point of view of 
+        # symbol, the side to move. With pruning, the first move is searched with the full window and every later 
+        # move with the null window (alpha, alpha + 1), which only tells whether it beats alpha (the heuristics are 
+        # whole numbers, so no value lies in between). A move that does is searched again with the full window.
+        # type:(board, float, float, int, str) -> (float, (int, int))
+        other = self.flip_symbol(symbol)
+        
+        self.max_depth_seen = max(self.max_depth_seen, depth)
+        self.pv_table[depth] = []
+        if self.positions is not None:
+            self.track_position(board, symbol)
+        
+        # Stop the search if the iterative deepening budget has run out
+        if self.deadline is not None and time.perf_counter() > self.deadline:
+            raise SearchTimeout()
+        
+        # Terminal state or max depth. The evaluation is always from this player's point of view (H2 is not 
+        # symmetric between the players), so it is negated when the opponent is to move.
+        moves_mask = self.legal_moves_mask(board, symbol)
+        if not moves_mask or depth == self.search_depth:
+            opp_moves_mask = None if moves_mask else self.legal_moves_mask(board, other)
+            if not moves_mask and not opp_moves_mask:
+                value = self.terminal_value(board)
+            elif depth == self.search_depth:
+                if symbol == self.symbol:
+                    value = self.eval_board(board, moves_mask, opp_moves_mask)
+                else:
+                    value = self.eval_board(board, opp_moves_mask, moves_mask)
+            else:
+                value = None
+            if value is not None:
+                return (value if symbol == self.symbol else -value), (None, None)
+        
+        # Check the transposition table; the stored best move is searched first
+        key = board.hash_key(symbol)
+        tt_move = None
+        if self.tt is not None:
+            tt_key, sym = self.tt_key(board, symbol, key)
+            result, tt_move = self.probe_tt(tt_key, alpha, beta, depth, board, sym)
+            if result is not None:
+                return result
+            alpha_orig, beta_orig = alpha, beta
+        
+        # Search the table's best move first, then order the rest with the move ordering strategies
+        moves = self.legal_moves(board, symbol, moves_mask)
+        if depth == 1 and self.symmetry:
+            moves = self.unique_moves(board, symbol, moves)
+        if len(moves) > 1 and (tt_move is not None or self.active_orderings):
+            moves.sort(key=lambda m: self.order_key(m, tt_move, key, depth))
+        
+        # Initialize the value and move for comparison (a "Pass" keeps the board's last move)
+        v = float('-inf')
+        move = moves[0] if moves else board.last_move
+        
+        # Score all the children at once if they are leaves
+        values = None
+        if self.batch_leaves(moves, depth):
+            values = self.leaf_values(board, moves, symbol)
+            if symbol != self.symbol:
+                values = [-value for value in values]
+            self.max_depth_seen = max(self.max_depth_seen, depth + 1)
+            self.pv_table[depth + 1] = []
+        
+        # Iterate over all successors (None is the "Pass" successor)
+        for i, m in enumerate(moves or [None]):
+            self.total_nodes_seen += 1
+            if values is not None:
+                v2 = values[i]
+            else:
+                s, undo = self.make_move(board, m, symbol)
+                try:
+                    if i == 0 or self.prune != '1' or alpha == -float('inf'):
+                        v2 = -self.pvs(s, -beta, -alpha, depth + 1, other)[0]
+                    else:
+                        v2 = -self.pvs(s, -alpha - 1, -alpha, depth + 1, other)[0]
+                        
+                        # The move beats alpha: search it again for its exact value
+                        if alpha < v2 < beta:
+                            self.total_nodes_seen += 1
+                            v2 = -self.pvs(s, -beta, -alpha, depth + 1, other)[0]
+                finally:
+                    # Restore the board even if the search timed out
+                    if undo is not None:
+                        board.undo_move(undo)
+            
+            if v2 > v:
+                v, move = v2, (m if m is not None else board.last_move)
+                self.pv_table[depth] = [move] + self.pv_table[depth + 1]
+                
+                # Alpha-beta pruning if enabled
+                alpha = max(alpha, v)
+                if self.prune == '1' and v >= beta:
+                    self.record_cutoff(move, depth)
+                    break
+            
+            # Root ties go to the first move in scan order, as in max_value
+            elif depth == 1 and v2 == v and m is not None and (m[1], m[0]) < (move[1], move[0]):
+                if self.prune == '1' and values is None:
+                    v2 = self.root_tie_value(board, m, beta)
+                if v2 == v:
+                    move = m
+                    self.pv_table[depth] = [move] + self.pv_table[depth + 1]
+        
+        # Save the result in the transposition table
+        if self.tt is not None:
+            self.store_tt(tt_key, v, move, alpha_orig, beta_orig, depth, board, sym)
+        
+        return v, move
+
+
+    def search_root(self, board: OthelloBoard) -> tuple:
+        # Search the root with the engine selected by search; returns (value, move)
+        if self.search != 'pvs':
+            return self.max_value(board, alpha=-float('inf'), beta=float('inf'), depth=1)
+        
+        # Start from a window around the previous iteration's value. A value outside the window is only a bound, so 
+        # the root is searched again with the window opened on the side it fell out of.
+        center = self.aspiration_center
+        if self.aspiration > 0 and self.prune == '1' and center is not None and abs(center) != float('inf'):
+            alpha, beta = center - self.aspiration, center + self.aspiration
+            v, move = self.pvs(board, alpha, beta, 1, self.symbol)
+            if alpha < v < beta:
+                return v, move
+            self.aspiration_researches += 1
+            if v <= alpha:
+                return self.pvs(board, -float('inf'), alpha + 1, 1, self.symbol)
+            return self.pvs(board, beta - 1, float('inf'), 1, self.symbol)
+        return self.pvs(board, -float('inf'), float('inf'), 1, self.symbol)
+
+
+    def search_child(self, board: OthelloBoard, alpha: float, beta: float) -> float:
+        # Value, for this player, of the position after one of its root moves (used by the parallel root search)
+        if self.search == 'pvs':
+            return -self.pvs(board, -beta, -alpha, 2, self.oppSym)[0]
+        return self.min_value(board, alpha, beta, 2)[0]
+
     
     def alphabeta(self, board: OthelloBoard) -> tuple:
         # Write minimax function here using eval_board and get_successors
         # type:(board) -> (int, int)
         
-        # Use the max_value function to get the optimal move using minimax and alpha-beta pruning if enabled
-        _, move = self.max_value(board, alpha=-float('inf'), beta=float('inf'), depth=1)
+        # In make/unmake mode the whole search runs on one copy of the board
+        if self.make_unmake:
+            board = board.cloneOBoard()
+        
+        # Split the root moves across worker processes if enabled
+        moves = self.legal_moves(board, self.symbol)
+        if self.symmetry:
+            moves = self.unique_moves(board, self.symbol, moves)
+        if self.workers > 1 and self.time_limit is None and len(moves) > 1:
+            if self.parallel is None:
+                self.parallel = ParallelRootSearch(self.workers)
+            self.last_value, move = self.parallel.search(self, board, moves)
+            return move
+        
+        # Use the max_value function (or the PVS) to get the optimal move using minimax and alpha-beta pruning if 
+        # enabled
+        self.last_value, move = self.search_root(board)
         
         # Parse the move
         col, row = move
@@ -236,9 +795,258 @@ class AlphaBetaPlayer(Player):
         return (col, row)
         
 
+    def close(self):
+        # Shut down the parallel search workers and unmap the book
+        if self.parallel is not None:
+            self.parallel.close()
+            self.parallel = None
+        if self.book is not None:
+            self.book.close()
+            self.book = None
+
+
+    def book_move(self, board: OthelloBoard) -> tuple:
+        # Look the position up in the book; returns the book move, or None to fall back to search
+        if (board.cols, board.rows) != (self.book.cols, self.book.rows):
+            return None
+        own, opp = board.get_bits(self.symbol)
+        entry = self.book.lookup(own, opp)
+        if entry is None or entry[1] is None:
+            self.book_misses += 1
+            return None
+        self.book_hits += 1
+        self.last_value, move = entry
+        self.depth_reached = 0
+        return move
+
+
+    def principal_variation(self) -> list:
+        # Moves of the principal variation found by the last completed search, starting at the root
+        return self.pv_table.get(1, [])
+
+
+    def pv_map(self, board: OthelloBoard) -> dict:
+        # Replay the principal variation from the root and map each position's hash_key to its PV move
+        pv_moves = {}
+        board = board.cloneOBoard()
+        symbol = self.symbol
+        for col, row in self.principal_variation():
+            pv_moves[board.hash_key(symbol)] = (col, row)
+            # A move that is not legal is the "pass" successor, which leaves the board unchanged
+            if board.is_legal_move(col, row, symbol):
+                board.play_move(col, row, symbol)
+            symbol = self.flip_symbol(symbol)
+        return pv_moves
+
+
+    def iterative_deepening(self, board: OthelloBoard) -> tuple:
+        # Search to increasing depths until max_depth or the time limit, returning the move of the deepest
+        # completed iteration. Each iteration searches the previous iteration's principal variation first.
+        # type:(board) -> (int, int)
+        start = time.perf_counter()
+        self.pv_moves = {}
+        self.aspiration_center = None
+        move = None
+        try:
+            for search_depth in range(2, self.max_depth + 1):
+                self.search_depth = search_depth
+                move = self.alphabeta(board)
+                self.depth_reached = search_depth
+                self.pv_moves = self.pv_map(board)
+                self.aspiration_center = self.last_value
+                
+                # The first (one ply) iteration always finishes so that there is a move to return
+                self.deadline = start + self.time_limit
+        except SearchTimeout:
+            pass
+        finally:
+            self.deadline = None
+            self.search_depth = self.max_depth
+            self.pv_moves = {}
+            self.aspiration_center = None
+        return move
+
+
     def get_move(self, board: OthelloBoard) -> tuple:
         # Write function that returns a move (column, row) here using minimax
         # type:(board) -> (int, int)
         
+        # Play the perfect-play move if the position is in the book
+        if self.book is not None:
+            move = self.book_move(board)
+            if move is not None:
+                return move
+        
+        # Search a slotted copy of the board, whose clones are slotted too
+        if self.compact_boards and type(board) is not CompactOthelloBoard:
+            board = board.cloneOBoard(CompactOthelloBoard)
+        
+        # Entries from earlier searches stay valid but lose their replacement priority
+        if self.tt is not None:
+            self.tt.new_search()
+        
+        # Reset the move ordering strategies for this search
+        self.active_orderings = [o for o in self.orderings if o.enabled()]
+        for o in self.active_orderings:
+            o.new_search(board)
+        
+        # With a time budget, deepen iteratively until it runs out
+        if self.time_limit is not None:
+            return self.iterative_deepening(board)
+        
         # Use minimax with alpha-beta pruning (if enabled) to get the optimal move
+        self.depth_reached = self.max_depth
         return self.alphabeta(board)
+
+
+
+def random_playout(own: int, opp: int, geom: Bitboard.Geometry, rng: random.Random) -> int:
+    # Play uniformly random moves on the bitboards until the game ends; returns the final disc difference for the 
+    # side to move at the start (own)
+    sign = 1
+    passed = False
+    while True:
+        moves = Bitboard.legal_moves(own, opp, geom)
+        if moves:
+            sq = rng.choice(list(Bitboard.squares(moves)))
+            flipped = Bitboard.flips(sq, own, opp, geom)
+            own, opp = opp & ~flipped, own | flipped | (1 << sq)
+            passed = False
+        elif passed:
+            break
+        else:
+            own, opp = opp, own
+            passed = True
+        sign = -sign
+    return sign * (Bitboard.popcount(own) - Bitboard.popcount(opp))
+
+
+class MCTSNode:
+    """Node of an MCTS tree: the position with own (the side to move) and opp bitboards
+    move: square played to reach the node, None for a pass (and at the root)
+    untried: moves without a child yet ([None] if the side to move must pass, [] at the end of the game)
+    wins: total reward of the playouts through the node for the player who moved into it (1 win, 0.5 tie, 0 loss)
+    """
+    __slots__ = ('own', 'opp', 'move', 'parent', 'children', 'untried', 'visits', 'wins')
+
+    def __init__(self, own: int, opp: int, geom: Bitboard.Geometry, move: int = None, parent=None):
+        self.own = own
+        self.opp = opp
+        self.move = move
+        self.parent = parent
+        self.children = []
+        moves = Bitboard.legal_moves(own, opp, geom)
+        if moves:
+            self.untried = list(Bitboard.squares(moves))
+        elif Bitboard.legal_moves(opp, own, geom):
+            self.untried = [None]
+        else:
+            self.untried = []
+        self.visits = 0
+        self.wins = 0.0
+
+
+def mcts_search(own: int, opp: int, cols: int, rows: int, playouts: int, exploration: float, seed: int) -> tuple:
+    # Grow a UCT tree from the position with own to move for a number of playouts. Module level so that it can run 
+    # in worker processes. Returns ({root move square: (visits, wins)}, nodes created, deepest node)
+    geom = Bitboard.geometry(cols, rows)
+    rng = random.Random(seed)
+    root = MCTSNode(own, opp, geom)
+    nodes = 0
+    max_depth = 0
+    for _ in range(playouts):
+        # Selection: follow the child with the best upper confidence bound while the node is fully expanded
+        node = root
+        depth = 0
+        while not node.untried and node.children:
+            log_visits = math.log(node.visits)
+            node = max(node.children, 
+                       key=lambda c: c.wins / c.visits + exploration * math.sqrt(log_visits / c.visits))
+            depth += 1
+        
+        # Expansion: add one untried move
+        if node.untried:
+            sq = node.untried.pop(rng.randrange(len(node.untried)))
+            if sq is None:
+                child = MCTSNode(node.opp, node.own, geom, None, node)
+            else:
+                flipped = Bitboard.flips(sq, node.own, node.opp, geom)
+                child = MCTSNode(node.opp & ~flipped, node.own | flipped | (1 << sq), geom, sq, node)
+            node.children.append(child)
+            node = child
+            depth += 1
+            nodes += 1
+        max_depth = max(max_depth, depth)
+        
+        # Simulation, scored for the player who moved into the node (the opponent of its side to move)
+        diff = random_playout(node.own, node.opp, geom, rng)
+        reward = 1.0 if diff < 0 else (0.0 if diff > 0 else 0.5)
+        
+        # Backpropagation, switching sides at every ply
+        while node is not None:
+            node.visits += 1
+            node.wins += reward
+            reward = 1.0 - reward
+            node = node.parent
+    return {c.move: (c.visits, c.wins) for c in root.children}, nodes, max_depth
+
+
+class MCTSPlayer(Player):
+    """Monte Carlo tree search player: UCT with uniformly random playouts on bitboards, no heuristic
+    playouts: number of playouts per move
+    exploration: UCT exploration constant
+    workers: number of processes; each grows its own tree with an equal share of the playouts, and the root move 
+        statistics of the trees are added up (root parallelization). 0 or 1 searches serially.
+    seed: random seed; None plays differently every game
+    total_nodes_seen: number of tree nodes created (at most one per playout)
+    depth_reached: depth of the deepest tree node of the last search
+    last_value: win rate of the move last returned by get_move (ties count as half a win)
+    """
+    def __init__(self, symbol, playouts=1000, exploration=1.4, workers=0, seed=None):
+        Player.__init__(self, symbol)
+        self.playouts = int(playouts)
+        self.exploration = float(exploration)
+        self.workers = int(workers)
+        self.rng = random.Random(seed)
+        
+        # Process pool for the playouts, started on the first parallel search
+        self.pool = None
+        
+        # Tracker variables
+        self.total_nodes_seen = 0
+        self.depth_reached = 0
+        self.last_value = None
+
+    def get_move(self, board: OthelloBoard) -> tuple:
+        own, opp = board.get_bits(self.symbol)
+        if self.workers > 1:
+            if self.pool is None:
+                self.pool = ProcessPoolExecutor(max_workers=self.workers)
+            shares = [self.playouts // self.workers + (i < self.playouts % self.workers) for i in range(self.workers)]
+            futures = [self.pool.submit(mcts_search, own, opp, board.cols, board.rows, n, self.exploration, 
+                                        self.rng.getrandbits(64)) for n in shares]
+            results = [f.result() for f in futures]
+        else:
+            results = [mcts_search(own, opp, board.cols, board.rows, self.playouts, self.exploration, 
+                                   self.rng.getrandbits(64))]
+        
+        # Add up the root statistics of every tree
+        stats = {}
+        self.depth_reached = max(depth for _, _, depth in results)
+        for children, nodes, _ in results:
+            self.total_nodes_seen += nodes
+            for move, (visits, wins) in children.items():
+                total = stats.get(move, (0, 0.0))
+                stats[move] = (total[0] + visits, total[1] + wins)
+        
+        # Play the most visited move
+        sq = max(stats, key=lambda m: stats[m][0])
+        visits, wins = stats[sq]
+        self.last_value = wins / visits
+        return board.geometry.coords(sq)
+
+    def close(self):
+        # Shut down the playout workers
+        if self.pool is not None:
+            self.pool.shutdown()
+            self.pool = None
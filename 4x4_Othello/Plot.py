@@ -2,9 +2,9 @@ from matplotlib import pyplot as plt
 import numpy as np
 import pandas as pd
 
-def plot_svd(mode='line_err'):
+def plot_svd(mode='line_err', path='svd_results.csv'):
     # Load data
-    df = pd.read_csv('svd_results.csv')
+    df = pd.read_csv(path)
     
     # Split data into pruning on and off
     prune_off = df[df['prune'] == 0]
@@ -121,6 +121,71 @@ def plot_svd(mode='line_err'):
         plt.tight_layout()
         plt.show()
 
+
+
+def plot_ordering(path='svd_ordering_results.csv'):
+    # Load data
+    df = pd.read_csv(path)
+    
+    # Create figure and axes: fixed-depth orderings on the left, iterative deepening on the right
+    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(12, 6))
+    
+    # Plot the mean nodes expanded at each depth for every ordering configuration
+    for key, grp in df.groupby('ordering', sort=False):
+        ax = ax2 if key.startswith('id') else ax1
+        means = grp.groupby('depth')['nodes_expanded'].mean()
+        ax.plot(means.index, means, marker='o', label=key, linestyle='-')
+    
+    # Add legend, title, and axis labels
+    for ax, title in ((ax1, 'Fixed Depth'), (ax2, 'Iterative Deepening')):
+        ax.legend(loc='best', title='Move Ordering')
+        ax.set_title(f'Nodes Expanded vs. Depth with Pruning: {title}')
+        ax.set_xlabel('Depth')
+        ax.set_ylabel('Mean Nodes Expanded')
+        ax.set_yscale('log')
+    
+    # Adjust spacing between subplots and display the plot
+    plt.tight_layout()
+    plt.show()
+
+
+
+def plot_search_stats(path='search_stats.csv'):
+    # Load the per-move statistics written by SearchStats.to_csv
+    df = pd.read_csv(path)
+    
+    # Create figure and axes: nodes per ply, effective branching factor and time split of every move
+    fig, (ax1, ax2, ax3) = plt.subplots(1, 3, figsize=(18, 6))
+    
+    # Plot the nodes searched at each ply
+    for column in [c for c in df.columns if c.startswith('nodes_')]:
+        ax1.plot(df['move_number'], df[column], marker='o', label=column.split('_')[1], linestyle='-')
+    ax1.legend(loc='best', title='Ply')
+    ax1.set_title('Nodes per Ply')
+    ax1.set_xlabel('Move')
+    ax1.set_ylabel('Nodes')
+    ax1.set_yscale('log')
+    
+    # Plot the effective branching factor
+    ax2.plot(df['move_number'], df['ebf'], marker='o', linestyle='-')
+    ax2.set_title('Effective Branching Factor')
+    ax2.set_xlabel('Move')
+    ax2.set_ylabel('EBF')
+    
+    # Plot the search time of each move split by activity
+    bottom = np.zeros(len(df))
+    for category in ('movegen', 'eval', 'clone', 'other'):
+        ax3.bar(df['move_number'], df[f'time_{category}'], bottom=bottom, label=category)
+        bottom += df[f'time_{category}'].to_numpy()
+    ax3.legend(loc='best', title='Time in')
+    ax3.set_title('Search Time per Move')
+    ax3.set_xlabel('Move')
+    ax3.set_ylabel('Time (s)')
+    
+    # Adjust spacing between subplots and display the plot
+    plt.tight_layout()
+    plt.show()
+
     
 if __name__ == '__main__':
     # Plotting modes: 'scatter', 'line', 'line_err'
@@ -1,8 +1,12 @@
 import pandas as pd
 import os
+import sys
+import time
 
 from GameDriver import GameDriver
-from Plot import plot_svd
+from ExperimentRunner import run_configurations
+import Tournament
+from Plot import plot_svd, plot_ordering
 
 BOARD_SIZE = 4
 
@@ -10,26 +14,109 @@ heuristics = ["0", "1", "2"]
 pruning = ["0", "1"]
 svd_depths = ["2", "4", "6", "8", "10", "12"]
 hq_depths = ["2", "4", "6", "8"]
+parallel_depths = ["8", "10", "12"]
 
-def test_configuration(p1_heuristic, p1_prune, p1_depth, 
-                       p2_heuristic, p2_prune, p2_depth):
-    game = GameDriver(p1type="alphabeta", p2type="alphabeta", num_rows=BOARD_SIZE, num_cols=BOARD_SIZE, 
+# Heuristic quality tournament: an alpha-beta player with each heuristic and an MCTS player with a fixed number of 
+# playouts per move (the same at every depth) play hq_openings random openings of hq_opening_plies moves with both 
+# colors. The openings differ up to symmetry (4x4 has only 3 such openings of 2 moves, and 30 of 4 moves).
+mcts_playouts = 500
+hq_openings = 8
+hq_opening_plies = 4
+
+# Depths swept on each board size as (svd_depths, hq_depths, parallel_depths). Search trees grow much faster on 
+# larger boards, so they are swept to shallower depths.
+depths_by_size = {
+    4: (svd_depths, hq_depths, parallel_depths),
+    6: (["2", "3", "4", "5", "6"], ["2", "3", "4"], ["4", "5", "6"]),
+    8: (["2", "3", "4", "5"], ["2", "3"], ["4", "5"]),
+}
+
+# Batched leaf evaluation (batch_eval option): the minimum numbers of leaf moves batched that are timed, 0 being the
+# scalar evaluation, and the search depth of the timed games on each board size. The sizes are all timed at once, 
+# as the default threshold must suit every one of them.
+batch_thresholds = [0, 1, 4, 6, 8, 10, 12]
+batch_depths = {4: "8", 6: "4", 8: "3"}
+
+# Search configurations compared in symmetry_results.csv (AlphaBetaPlayer keyword arguments)
+symmetry_configs = {
+    "tt": {"tt_size": 65536, "track_positions": True},
+    "tt+symmetry": {"tt_size": 65536, "symmetry": True, "track_positions": True},
+}
+
+# Move ordering configurations compared in svd_ordering_results.csv (AlphaBetaPlayer keyword arguments). The "id"
+# configurations use iterative deepening with no time limit, so they are deterministic and include the nodes of
+# every iteration; "id" is their baseline.
+ordering_configs = {
+    "none": {"ordering": "none"},
+    "static": {"ordering": "static"},
+    "killer": {"ordering": "killer"},
+    "history": {"ordering": "history"},
+    "killer+history+static": {"ordering": "killer,history,static"},
+    "id": {"ordering": "none", "time_limit": float('inf')},
+    "id+pv": {"ordering": "pv", "time_limit": float('inf')},
+    "id+all": {"ordering": "pv,killer,history,static", "time_limit": float('inf')},
+}
+
+# Search engines compared in svd_pvs_results.csv with the alpha-beta search of svd_results.csv (AlphaBetaPlayer 
+# keyword arguments). As for the move orderings, "id" is the baseline of the iterative deepening configurations.
+search_configs = {
+    "pvs": {"search": "pvs"},
+    "id": {"time_limit": float('inf')},
+    "id+pvs": {"search": "pvs", "time_limit": float('inf')},
+    "id+pvs+aspiration": {"search": "pvs", "time_limit": float('inf'), "aspiration": 2},
+}
+
+def set_board_size(size: int):
+    """ Selects the board size of the following tests, and the depths swept on it """
+    global BOARD_SIZE, svd_depths, hq_depths, parallel_depths
+    if size not in depths_by_size:
+        raise ValueError(f'No depths configured for board size {size}, expected one of {list(depths_by_size)}')
+    BOARD_SIZE = size
+    svd_depths, hq_depths, parallel_depths = depths_by_size[size]
+
+def results_path(name: str) -> str:
+    """ Results file for the current board size: the plain name for 4x4, name_<n>x<n>.csv otherwise """
+    if BOARD_SIZE == 4:
+        return name
+    stem, ext = os.path.splitext(name)
+    return f'{stem}_{BOARD_SIZE}x{BOARD_SIZE}{ext}'
+
+def play_configuration(p1_heuristic, p1_prune, p1_depth, 
+                       p2_heuristic, p2_prune, p2_depth, options=None, board_size=None) -> dict:
+    # Plays one headless game and returns its record (see GameDriver.run)
+    # options: AlphaBetaPlayer keyword arguments used by both players
+    # board_size: defaults to BOARD_SIZE; sweeps pass it explicitly because they run in worker processes
+    if board_size is None:
+        board_size = BOARD_SIZE
+    game = GameDriver(p1type="alphabeta", p2type="alphabeta", num_rows=board_size, num_cols=board_size, 
                       p1_eval_type=p1_heuristic, p1_prune=p1_prune, 
                       p2_eval_type=p2_heuristic, p2_prune=p2_prune, 
-                      p1_depth=p1_depth, p2_depth=p2_depth)
-    game.run()
-    return game.p1.total_nodes_seen, game.p2.total_nodes_seen, game.state
-
-def test_depths(p1_heuristic, p1_prune, p2_heuristic, p2_prune, depths):
-    p1_nodes_seen = []
-    p2_nodes_seen = []
-    states = []
-    for depth in depths:
-        p1, p2, s = test_configuration(p1_heuristic, p1_prune, depth, p2_heuristic, p2_prune, depth)
-        p1_nodes_seen.append(p1)
-        p2_nodes_seen.append(p2)
-        states.append(s)
-    return p1_nodes_seen, p2_nodes_seen, states
+                      p1_depth=p1_depth, p2_depth=p2_depth, 
+                      p1_options=options, p2_options=options, headless=True)
+    return game.run()
+
+def test_configuration(p1_heuristic, p1_prune, p1_depth, 
+                       p2_heuristic, p2_prune, p2_depth, options=None, board_size=None):
+    record = play_configuration(p1_heuristic, p1_prune, p1_depth, p2_heuristic, p2_prune, p2_depth, options, 
+                                board_size)
+    return record['p1_nodes'], record['p2_nodes'], record['state']
+
+def run_game(config: dict) -> list:
+    """ Runs one sweep configuration in a worker process (see ExperimentRunner.py) and returns one result row per player """
+    options = None
+    if 'ordering' in config:
+        options = ordering_configs[config['ordering']]
+    elif 'search' in config:
+        options = search_configs[config['search']]
+    n1, n2, _ = test_configuration(config['h1'], config['p1'], config['depth'], 
+                                   config['h2'], config['p2'], config['depth'], options, config['size'])
+    rows = [{'heuristic': config['h1'], 'prune': config['p1'], 'depth': config['depth'], 'nodes_expanded': n1},
+            {'heuristic': config['h2'], 'prune': config['p2'], 'depth': config['depth'], 'nodes_expanded': n2}]
+    for column in ('ordering', 'search'):
+        if column in config:
+            for row in rows:
+                row[column] = config[column]
+    return rows
 
 def test_search_vs_depth():
     """
@@ -39,149 +126,327 @@ def test_search_vs_depth():
     'depth': int
     'nodes_expanded': int
     """
+    # Test every permutation of heursitics and pruning for each player at each depth
+    configs = [{'size': BOARD_SIZE, 'h1': h1, 'p1': p1, 'h2': h2, 'p2': p2, 'depth': d} 
+               for h1 in heuristics for h2 in heuristics for p1 in pruning for p2 in pruning for d in svd_depths]
+    
+    # Run the games in parallel, streaming rows to csv as they finish
+    run_configurations(configs, run_game, results_path('svd_results.csv'), 
+                       columns=['heuristic', 'prune', 'depth', 'nodes_expanded'])
+    
+
+def test_move_ordering():
+    """
+    Same sweep as test_search_vs_depth with pruning enabled for both players, repeated for every move ordering 
+    configuration (both players use the same one).
+    Results Format:
+    'ordering': str
+    'heuristic': int
+    'prune': int
+    'depth': int
+    'nodes_expanded': int
+    """
+    configs = [{'size': BOARD_SIZE, 'ordering': name, 'h1': h1, 'p1': "1", 'h2': h2, 'p2': "1", 'depth': d} 
+               for name in ordering_configs for h1 in heuristics for h2 in heuristics for d in svd_depths]
+    
+    # Run the games in parallel, streaming rows to csv as they finish
+    run_configurations(configs, run_game, results_path('svd_ordering_results.csv'), 
+                       columns=['ordering', 'heuristic', 'prune', 'depth', 'nodes_expanded'])
+
+
+def report_move_ordering():
+    # Mean nodes expanded per move ordering configuration at each depth, and the change against its baseline
+    df = pd.read_csv(results_path('svd_ordering_results.csv'))
+    means = df.pivot_table(index='depth', columns='ordering', values='nodes_expanded', aggfunc='mean')
+    means = means[[name for name in ordering_configs if name in means.columns]]
+    print("Mean nodes expanded by move ordering (pruning enabled)")
+    print(means.round(1).to_string())
+    print()
+    
+    # Fixed-depth configurations are compared to "none", iterative deepening ones to "id"
+    baselines = {name: ("id" if name.startswith("id") else "none") for name in means.columns}
+    reduction = pd.DataFrame({name: 100 * (1 - means[name] / means[base]) for name, base in baselines.items()})
+    print("Node reduction against baseline (%)")
+    print(reduction.round(1).to_string())
+    print()
+    
+
+
+def test_search_engines():
+    """
+    Same sweep as test_search_vs_depth with pruning enabled for both players, repeated for every search engine 
+    configuration (both players use the same one). Without pruning the PVS searches the same tree as alpha-beta.
+    Results Format:
+    'search': str
+    'heuristic': int
+    'prune': int
+    'depth': int
+    'nodes_expanded': int
+    """
+    configs = [{'size': BOARD_SIZE, 'search': name, 'h1': h1, 'p1': "1", 'h2': h2, 'p2': "1", 'depth': d} 
+               for name in search_configs for h1 in heuristics for h2 in heuristics for d in svd_depths]
+    
+    # Run the games in parallel, streaming rows to csv as they finish
+    run_configurations(configs, run_game, results_path('svd_pvs_results.csv'), 
+                       columns=['search', 'heuristic', 'prune', 'depth', 'nodes_expanded'])
+
+
+def report_search_engines():
+    # Mean nodes expanded per search engine at each depth, against the alpha-beta rows of svd_results.csv with 
+    # pruning enabled
+    svd = pd.read_csv(results_path('svd_results.csv'))
+    svd = svd[svd['prune'] == 1].assign(search="alphabeta")
+    df = pd.concat([svd, pd.read_csv(results_path('svd_pvs_results.csv'))])
+    means = df.pivot_table(index='depth', columns='search', values='nodes_expanded', aggfunc='mean')
+    means = means[[name for name in ["alphabeta"] + list(search_configs) if name in means.columns]]
+    print("Mean nodes expanded by search engine (pruning enabled)")
+    print(means.round(1).to_string())
+    print()
+    
+    # Fixed-depth configurations are compared to "alphabeta", iterative deepening ones to "id"
+    baselines = {name: ("id" if name.startswith("id") else "alphabeta") for name in means.columns}
+    reduction = pd.DataFrame({name: 100 * (1 - means[name] / means[base]) for name, base in baselines.items()})
+    print("Node reduction against baseline (%)")
+    print(reduction.round(1).to_string())
+    print()
+
+
+def run_symmetry_game(config: dict) -> list:
+    """ Runs one symmetry configuration in a worker process and returns one result row per player """
+    record = play_configuration(config['h1'], config['prune'], config['depth'], 
+                                config['h2'], config['prune'], config['depth'], symmetry_configs[config['mode']], 
+                                config['size'])
+    return [{'heuristic': config[h], 'nodes_expanded': record[f'{p}_nodes'], 'positions': record[f'{p}_positions'], 
+             'canonical_positions': record[f'{p}_canonical_positions']} for h, p in (('h1', 'p1'), ('h2', 'p2'))]
+
+def test_symmetry():
+    """
+    Plays the svd sweep (with both players using the same pruning) with a transposition table keyed by position, 
+    and with one keyed by canonical form plus symmetric root moves removed
+    Results Format:
+    'mode': str
+    'heuristic': int
+    'prune': int
+    'depth': int
+    'nodes_expanded': int
+    'positions': int (unique positions searched by the player over the game)
+    'canonical_positions': int (the same positions counted once per symmetry class)
+    """
+    configs = [{'size': BOARD_SIZE, 'mode': mode, 'h1': h1, 'h2': h2, 'prune': p, 'depth': d} 
+               for mode in symmetry_configs for h1 in heuristics for h2 in heuristics for p in pruning 
+               for d in svd_depths]
+    
+    # Run the games in parallel, streaming rows to csv as they finish
+    run_configurations(configs, run_symmetry_game, results_path('symmetry_results.csv'), 
+                       columns=['mode', 'heuristic', 'prune', 'depth', 'nodes_expanded', 'positions', 
+                                'canonical_positions'])
+
+
+def report_symmetry():
+    # Unique positions searched per game with and without symmetry, and how many of them were symmetric duplicates
+    df = pd.read_csv(results_path('symmetry_results.csv'))
+    means = df.groupby(['mode', 'prune', 'depth'])[['nodes_expanded', 'positions', 'canonical_positions']].mean()
+    means['duplicate_positions_%'] = 100 * (1 - means['canonical_positions'] / means['positions'])
+    print("Mean nodes expanded and unique positions searched per player and game")
+    print(means.round(1).to_string())
+    print()
+    
+    # Reduction from searching with canonical keys and deduplicated root moves
+    base = means.loc["tt"]
+    sym = means.loc["tt+symmetry"]
+    reduction = pd.DataFrame({'nodes_%': 100 * (1 - sym['nodes_expanded'] / base['nodes_expanded']), 
+                              'unique_positions_%': 100 * (1 - sym['positions'] / base['positions'])})
+    print("Reduction from symmetry (%)")
+    print(reduction.round(1).to_string())
+    print()
+
+    
+def test_parallel_speedup(workers=None):
+    """
+    Times the same game with the serial search and with the parallel root-split search (both players use the same
+    configuration, heuristic 0 vs. 1)
+    Results Format:
+    'prune': int
+    'depth': int
+    'workers': int
+    'cores': int (CPUs of the machine; the speedup is bounded by min(workers, cores))
+    'serial_time': float (seconds)
+    'parallel_time': float (seconds)
+    'speedup': float
+    'serial_nodes': int
+    'parallel_nodes': int
+    """
+    if workers is None:
+        workers = os.cpu_count()
+    
     results = []
+    for prune in pruning:
+        for depth in parallel_depths:
+            times = {}
+            nodes = {}
+            for mode, w in (("serial", 0), ("parallel", workers)):
+                start = time.perf_counter()
+                n1, n2, _ = test_configuration("0", prune, depth, "1", prune, depth, options={"workers": w})
+                times[mode] = time.perf_counter() - start
+                nodes[mode] = n1 + n2
+            results.append({'prune': prune, 'depth': depth, 'workers': workers, 'cores': os.cpu_count(), 
+                            'serial_time': times["serial"], 'parallel_time': times["parallel"], 
+                            'speedup': times["serial"] / times["parallel"], 
+                            'serial_nodes': nodes["serial"], 'parallel_nodes': nodes["parallel"]})
     
-    # Test every permutation of heursitics and pruning for each player at each depth
-    for h1 in heuristics:
-        for h2 in heuristics:
-            for p1 in pruning:
-                for p2 in pruning:
-                    n1, n2, _ = test_depths(h1, p1, h2, p2, depths=svd_depths)
-                    # Report P1 stats
-                    for n, d in zip(n1, svd_depths):
-                        results.append({'heuristic': h1, 'prune': p1, 'depth': d, 'nodes_expanded': n})
-                        
-                    # Report P2 stats
-                    for n, d in zip(n2, svd_depths):
-                        results.append({'heuristic': h2, 'prune': p2, 'depth': d, 'nodes_expanded': n})
-                   
     # Construct dataframe and save to csv
     df = pd.DataFrame(results)
-    df.to_csv('svd_results.csv', index=False)
-    
+    df.to_csv(results_path('parallel_results.csv'), index=False)
+
+
+def report_parallel_speedup():
+    # Print the parallel search speedup at each depth
+    df = pd.read_csv(results_path('parallel_results.csv'))
+    print("Parallel root-split search speedup against the serial search")
+    print(df.round(3).to_string(index=False))
+    print()
     
-def parse_state(s: int) -> int:
-    """ Parses the state result of a game and returns 1 if P1 wins, -1 if P2 wins, and 0 if tie """
-    if s > 0:
-        return 1
-    elif s < 0:
-        return -1
-    return 0    
 
-def test_heuristic_quality():
+def test_batch_eval():
     """
+    Times the same game with scalar leaf evaluation and with batched leaf evaluation from each threshold, on every
+    board size (both players use the same heuristic and pruning, and the best of 3 runs is kept)
     Results Format:
-    'h1': int
-    'h2': int
+    'size': int
+    'heuristic': int
+    'prune': int
     'depth': int
-    'state': int
+    'batch_eval': int (minimum number of leaf moves batched, 0 for scalar evaluation)
+    'time': float (seconds)
+    'speedup': float (against scalar evaluation)
+    'nodes': int
     """
-    
-    # Test every permutation of heuristics for each player at each depth
     results = []
-    for h1 in heuristics:
-        for h2 in heuristics:
-            _, _, states = test_depths(h1, "1", h2, "1", depths=hq_depths)
-            for s, d in zip(states, hq_depths):
-                results.append({'h1': h1, 'h2': h2, 'depth': d, 'state': parse_state(s)})
+    for size, depth in batch_depths.items():
+        for h in heuristics:
+            for prune in pruning:
+                scalar_time = None
+                for threshold in batch_thresholds:
+                    best = float('inf')
+                    for _ in range(3):
+                        start = time.perf_counter()
+                        n1, n2, _ = test_configuration(h, prune, depth, h, prune, depth, 
+                                                       options={"batch_eval": threshold}, board_size=size)
+                        best = min(best, time.perf_counter() - start)
+                    if scalar_time is None:
+                        scalar_time = best
+                    results.append({'size': size, 'heuristic': h, 'prune': prune, 'depth': depth, 
+                                    'batch_eval': threshold, 'time': best, 'speedup': scalar_time / best, 
+                                    'nodes': n1 + n2})
     
     # Construct dataframe and save to csv
     df = pd.DataFrame(results)
-    df.to_csv('hq_results.csv', index=False)
+    df.to_csv('batch_results.csv', index=False)
+
+
+def report_batch_eval():
+    # Print the speedup of batched leaf evaluation from each threshold, per board size and over all games
+    df = pd.read_csv('batch_results.csv')
+    print("Batched leaf evaluation speedup against scalar evaluation (rows: minimum leaf moves batched)")
+    speedup = df.pivot_table(index='batch_eval', columns=['size', 'prune'], values='speedup', aggfunc='mean')
+    print(speedup.round(3).to_string())
+    print()
+    
+
+def hq_players(depth) -> list:
+    """ Tournament player specs (see Tournament.py) of the heuristic quality games at a depth """
+    return [f"alphabeta:{h}:{depth}" for h in heuristics] + [f"mcts:{mcts_playouts}"]
+
+def test_heuristic_quality():
+    """
+    Round-robin tournament between the heuristics (and MCTS) at each depth, every pair playing every random opening 
+    with both colors
+    Results Format:
+    'depth': int
+    'p1': str (player spec)
+    'p2': str
+    'opening': int (seed of the random opening)
+    'state': int (p1 score - p2 score)
+    'p1_score': int
+    'p2_score': int
+    """
+    configs = [{'size': BOARD_SIZE, 'depth': d, **c} 
+               for d in hq_depths for c in Tournament.schedule(hq_players(d), hq_openings, hq_opening_plies, BOARD_SIZE)]
+    
+    # Run the games in parallel, streaming rows to csv as they finish
+    run_configurations(configs, Tournament.play_game, results_path('hq_results.csv'), 
+                       columns=['depth', 'p1', 'p2', 'opening', 'state', 'p1_score', 'p2_score'])
         
 
 def report_heuristic_quality():
-    # Load results
-    df = pd.read_csv('hq_results.csv')
-    
-    class WinLossResults:
-        """ Class to store win/loss/tie results for a heuristic """
-        def __init__(self):
-            # Initialize to 0
-            self.wins = 0
-            self.losses = 0
-            self.ties = 0
-            
-        def __str__(self):
-            # Return string representation
-            return f'Wins: {self.wins}, Losses: {self.losses}, Ties: {self.ties}'
-        
-        def update(self, state):
-            # Update results based on state
-            if state > 0:
-                self.wins += 1
-            elif state < 0:
-                self.losses += 1
-            else:
-                self.ties += 1
-    
-    # Create win/loss/tie results for each heuristic
-    win_loss_ratios = []
-    for h1 in heuristics:
-        # Initialize list for h1 against all P2 heuristics
-        win_loss_ratios.append([])
-        for h2 in heuristics:
-            # Load results into list
-            results = WinLossResults()
-            for _, row in df.iterrows():
-                if str(row['h1']) == h1 and str(row['h2']) == h2:
-                    results.update(row['state'])
-            win_loss_ratios[int(h1)].append(results)
-    
-    # Print results
-    for h1 in heuristics:
-        for h2 in heuristics:
-            if h1 == h2:
-                continue
-            print(f'Heuristic {h1} vs. Heuristic {h2}')
-            print(win_loss_ratios[int(h1)][int(h2)])
-            print()
-          
-    # Calculate total victories for each heuristic  
-    total_victories = [0] * 3
-    for h1 in heuristics:
-        for h2 in heuristics:
-            if h1 == h2:
-                continue
-            total_victories[int(h1)] += win_loss_ratios[int(h1)][int(h2)].wins
-            total_victories[int(h2)] += win_loss_ratios[int(h1)][int(h2)].losses
-    
-    # Print total victories
-    for h in heuristics:
-        print(f'Heuristic {h} total victories: {total_victories[int(h)]}')
-    print()
+    # Standings with Elo ratings and pairwise score rates of the tournament at each depth
+    df = pd.read_csv(results_path('hq_results.csv'))
+    for depth, games in df.groupby('depth'):
+        print(f"Depth: {depth}")
+        print(Tournament.summary(games).round(3).to_string())
+        print()
+        print(Tournament.pairwise(games).round(3).to_string())
+        print()
     
-    # Calculate total win rates for each heuristic
-    p1_p2_win_rates = {}
-    for d in hq_depths:
-        p1_p2_win_rates[d] = {'p1': 0, 'p2': 0}
-    for _, row in df.iterrows():
-        if row['h1'] == row['h2']:
-            continue
-        if row['state'] == 1:
-            p1_p2_win_rates[str(row['depth'])]['p1'] += 1
-        if row['state'] == -1:
-            p1_p2_win_rates[str(row['depth'])]['p2'] += 1
-            
-    # Print player win rates for each depth
-    for d in hq_depths:
-        print("Depth:", d)
-        print("\tP1 Wins:", p1_p2_win_rates[d]['p1'])
-        print("\tP1 Win Rate:", p1_p2_win_rates[d]['p1'] / (p1_p2_win_rates[d]['p1'] + p1_p2_win_rates[d]['p2']))
-        print("\tP2 Wins:", p1_p2_win_rates[d]['p2'])
-        print("\tP2 Win Rate:", p1_p2_win_rates[d]['p2'] / (p1_p2_win_rates[d]['p1'] + p1_p2_win_rates[d]['p2']))
+    # Score rate of the first player at each depth
+    scores = df.assign(score=(df['state'] > 0) + 0.5 * (df['state'] == 0))
+    first = scores.groupby('depth')['score'].agg(games='size', score='mean')
+    first['score_low'], first['score_high'] = Tournament.wilson_interval(first['score'], first['games'])
+    print("P1 score rate")
+    print(first.round(3).to_string())
+    print()
         
 if __name__ == '__main__':
+    # Optional argument: board size (4 by default)
+    if len(sys.argv) > 1:
+        set_board_size(int(sys.argv[1]))
+    
     # Run tests if results don't exist
-    if not os.path.exists('svd_results.csv'):
+    if not os.path.exists(results_path('svd_results.csv')):
         test_search_vs_depth()
         
     # Run tests if results don't exist
-    if not os.path.exists('hq_results.csv'):
+    if not os.path.exists(results_path('svd_ordering_results.csv')):
+        test_move_ordering()
+        
+    # Run tests if results don't exist
+    if not os.path.exists(results_path('svd_pvs_results.csv')):
+        test_search_engines()
+        
+    # Run tests if results don't exist
+    if not os.path.exists(results_path('hq_results.csv')):
         test_heuristic_quality()
         
+    # Run tests if results don't exist
+    if not os.path.exists(results_path('symmetry_results.csv')):
+        test_symmetry()
+        
+    # Run tests if results don't exist
+    if not os.path.exists(results_path('parallel_results.csv')):
+        test_parallel_speedup()
+        
+    # Run tests if results don't exist (every board size at once)
+    if not os.path.exists('batch_results.csv'):
+        test_batch_eval()
+        
     # Plot results
-    plot_svd()
+    plot_svd(path=results_path('svd_results.csv'))
+    plot_ordering(path=results_path('svd_ordering_results.csv'))
+    
+    # Report move ordering node counts
+    report_move_ordering()
+    
+    # Report PVS node counts against alpha-beta
+    report_search_engines()
+    
+    # Report unique positions searched with and without symmetry
+    report_symmetry()
+    
+    # Report parallel search speedup
+    report_parallel_speedup()
+    
+    # Report batched leaf evaluation speedup
+    report_batch_eval()
     
     # Report heuristic quality
     report_heuristic_quality()
\ No newline at end of file
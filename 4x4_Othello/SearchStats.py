@@ -0,0 +1,182 @@
+"""Search tree statistics and profiling for AlphaBetaPlayer
+
+SearchStats records, for every move an AlphaBetaPlayer plays while it is enabled:
+    nodes and cutoffs at each ply, over every iterative deepening iteration (ply 0 is the root; batched leaves 
+        count at the search depth)
+    effective branching factor: b such that b ** d equals the nodes below the root, d being the deepest ply
+    time spent in move generation (legal_moves_mask/legal_moves), evaluation (eval_board and batched
+        leaf_values), making moves (make_move: cloning the board, or playing in place) and the rest of the search.
+        Times are exclusive: move generation inside eval_board counts as move generation only.
+    hit rates of the transposition table and of the board's legal move cache
+
+It is switched on and off at runtime with AlphaBetaPlayer.enable_stats/disable_stats. Enabling it wraps the
+player's search and move generation methods (AlphaBetaPlayer.legal_moves_mask/legal_moves, through which its search
+generates moves) in instance attributes that shadow the class methods, so other players and the board classes are
+never changed. Disabling removes the wrappers, so a player without statistics runs exactly the uninstrumented code.
+Searches split across worker processes (workers > 1) only record the nodes of the main process.
+
+Records are exported with to_csv (one row per move, with nodes_<ply> and cutoffs_<ply> columns) or to_json (one
+object per move, with lists per ply), which Plot.plot_search_stats reads.
+"""
+
+import csv
+import functools
+import json
+import time
+
+# Time categories of a move
+CATEGORIES = ('movegen', 'eval', 'clone', 'other')
+
+
+class SearchStats:
+    """Per-move statistics of one AlphaBetaPlayer (see the module docstring)
+    records: one dict per recorded move
+    """
+    def __init__(self, player):
+        self.player = player
+        self.records = []
+        self.reset_move()
+
+    def reset_move(self):
+        self.nodes = {}
+        self.cutoffs = {}
+        self.times = dict.fromkeys(CATEGORIES, 0.0)
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+        # Exclusive timing: the category being timed and when it (or its last resumption) started
+        self.stack = ['other']
+        self.started = time.perf_counter()
+
+    def enter(self, category: str):
+        # Charge the time so far to the current category and start timing category
+        now = time.perf_counter()
+        self.times[self.stack[-1]] += now - self.started
+        self.stack.append(category)
+        self.started = now
+
+    def leave(self):
+        # Charge the time so far to the current category and resume its parent
+        now = time.perf_counter()
+        self.times[self.stack.pop()] += now - self.started
+        self.started = now
+
+    def timed(self, category: str, fn):
+        # fn, charging its time to category
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            self.enter(category)
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                self.leave()
+        return wrapper
+
+    def counted_node(self, fn):
+        # Search function fn(board, alpha, beta, depth, ...), counting a node at ply depth - 1 per call
+        @functools.wraps(fn)
+        def wrapper(board, alpha, beta, depth, *args):
+            self.nodes[depth - 1] = self.nodes.get(depth - 1, 0) + 1
+            return fn(board, alpha, beta, depth, *args)
+        return wrapper
+
+    def attach(self):
+        # Shadow the player's search methods with instrumented wrappers
+        p = self.player
+        for name in ('max_value', 'min_value', 'pvs'):
+            setattr(p, name, self.counted_node(getattr(type(p), name).__get__(p)))
+        p.eval_board = self.timed('eval', type(p).eval_board.__get__(p))
+        p.legal_moves = self.timed('movegen', type(p).legal_moves.__get__(p))
+        p.make_move = self.timed('clone', type(p).make_move.__get__(p))
+        record_cutoff = type(p).record_cutoff.__get__(p)
+        leaf_values = type(p).leaf_values.__get__(p)
+        legal_moves_mask = type(p).legal_moves_mask.__get__(p)
+
+        def cutoff(move, depth):
+            self.cutoffs[depth - 1] = self.cutoffs.get(depth - 1, 0) + 1
+            record_cutoff(move, depth)
+
+        def leaves(board, moves, symbol):
+            self.nodes[p.search_depth - 1] = self.nodes.get(p.search_depth - 1, 0) + len(moves)
+            self.enter('eval')
+            try:
+                return leaf_values(board, moves, symbol)
+            finally:
+                self.leave()
+
+        def mask(board, symbol):
+            # Count the hits of the board's legal move cache
+            if (board.p1_moves if symbol == board.p1_symbol else board.p2_moves) is None:
+                self.cache_misses += 1
+            else:
+                self.cache_hits += 1
+            self.enter('movegen')
+            try:
+                return legal_moves_mask(board, symbol)
+            finally:
+                self.leave()
+
+        p.record_cutoff = cutoff
+        p.leaf_values = leaves
+        p.legal_moves_mask = mask
+        p.get_move = self.record_move
+
+    def detach(self):
+        # Remove the wrappers so the class methods are used again
+        for name in ('max_value', 'min_value', 'pvs', 'eval_board', 'make_move', 'record_cutoff', 'leaf_values',
+                     'legal_moves_mask', 'legal_moves', 'get_move'):
+            self.player.__dict__.pop(name, None)
+
+    def record_move(self, board) -> tuple:
+        # get_move, recording the statistics of the move
+        p = self.player
+        self.reset_move()
+        nodes_before = p.total_nodes_seen
+        tt_before = (p.tt_hits, p.tt_misses)
+        start = self.started
+        try:
+            move = type(p).get_move(p, board)
+        finally:
+            self.leave()
+        self.add_record(move, p.total_nodes_seen - nodes_before, p.tt_hits - tt_before[0],
+                        p.tt_misses - tt_before[1], self.started - start)
+        return move
+
+    def add_record(self, move: tuple, nodes: int, tt_hits: int, tt_misses: int, elapsed: float):
+        deepest = max(self.nodes, default=0)
+        record = {'move_number': len(self.records) + 1, 'move': move, 'depth': self.player.depth_reached,
+                  'nodes': nodes, 'time': elapsed, 'ebf': nodes ** (1 / deepest) if deepest and nodes else 0.0,
+                  'nodes_by_ply': [self.nodes.get(ply, 0) for ply in range(deepest + 1)],
+                  'cutoffs_by_ply': [self.cutoffs.get(ply, 0) for ply in range(deepest + 1)],
+                  'tt_hits': tt_hits, 'tt_misses': tt_misses,
+                  'tt_hit_rate': tt_hits / (tt_hits + tt_misses) if tt_hits + tt_misses else None,
+                  'move_cache_hits': self.cache_hits, 'move_cache_misses': self.cache_misses,
+                  'move_cache_hit_rate': (self.cache_hits / (self.cache_hits + self.cache_misses)
+                                          if self.cache_hits + self.cache_misses else None)}
+        for category in CATEGORIES:
+            record[f'time_{category}'] = self.times[category]
+        self.records.append(record)
+
+    def rows(self) -> list:
+        # Records flattened for csv: the per-ply lists become nodes_<ply> and cutoffs_<ply> columns
+        plies = max((len(r['nodes_by_ply']) for r in self.records), default=0)
+        rows = []
+        for r in self.records:
+            row = {k: v for k, v in r.items() if k not in ('nodes_by_ply', 'cutoffs_by_ply')}
+            row['move'] = '' if r['move'] is None else f'{r["move"][0]} {r["move"][1]}'
+            for ply in range(plies):
+                row[f'nodes_{ply}'] = r['nodes_by_ply'][ply] if ply < len(r['nodes_by_ply']) else 0
+                row[f'cutoffs_{ply}'] = r['cutoffs_by_ply'][ply] if ply < len(r['cutoffs_by_ply']) else 0
+            rows.append(row)
+        return rows
+
+    def to_csv(self, path: str):
+        rows = self.rows()
+        with open(path, 'w', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=list(rows[0].keys()) if rows else ['move_number'])
+            writer.writeheader()
+            writer.writerows(rows)
+
+    def to_json(self, path: str):
+        with open(path, 'w') as f:
+            json.dump({'symbol': self.player.symbol, 'moves': self.records}, f, indent=1)
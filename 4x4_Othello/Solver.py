@@ -0,0 +1,151 @@
+"""Perfect-play solver and opening book for 4x4 Othello
+
+solve_all enumerates every position reachable from the starting position and solves it exactly with negamax.
+Positions are stored by canonical form, so the 8 symmetric copies of a position are solved and stored once. The
+value of a position is the final disc difference (side to move minus opponent) under perfect play by both sides.
+
+write_book saves the results as an open-addressing hash table that OpeningBook reads through mmap, so a lookup
+touches a couple of slots of the file instead of loading the whole table into memory.
+
+Book file format (little endian):
+    header: magic b'OTHB', version (uint16), cols (uint8), rows (uint8), capacity (uint32), count (uint32)
+    capacity slots of 8 bytes: key (uint32), value (int8), move (uint8), 2 padding bytes
+A key is (own << 16) | opp for the canonical form of the position with the side to move as "own" (0 marks an empty
+slot, which no position can have). The move is the best square in the canonical orientation, or NO_MOVE when the
+side to move has to pass or the game is over.
+
+Build the book with: python Solver.py [book path]
+"""
+
+import mmap
+import os
+import struct
+import sys
+import time
+
+import Bitboard
+
+MAGIC = b'OTHB'
+VERSION = 1
+HEADER = struct.Struct('<4sHBBII')
+SLOT = struct.Struct('<IbBxx')
+NO_MOVE = 255
+DEFAULT_BOOK = 'book_4x4.bin'
+
+
+def slot_index(key: int, capacity: int) -> int:
+    # Multiplicative hashing spreads the structured keys over the table
+    return ((key * 0x9E3779B1) & 0xFFFFFFFF) % capacity
+
+
+def solve_all(cols: int = 4, rows: int = 4) -> dict:
+    # Solve every reachable position; returns {canonical key: (value, best canonical square or NO_MOVE)}
+    geom = Bitboard.geometry(cols, rows)
+    if geom.size > 16:
+        raise ValueError("The solver and book format only support boards of up to 16 squares")
+    table = {}
+
+    def solve(own: int, opp: int) -> int:
+        own, opp, _ = Bitboard.canonical(own, opp, geom)
+        key = (own << 16) | opp
+        entry = table.get(key)
+        if entry is not None:
+            return entry[0]
+
+        moves = Bitboard.legal_moves(own, opp, geom)
+        if not moves:
+            if Bitboard.legal_moves(opp, own, geom):
+                # Pass: the opponent moves in the same position
+                value = -solve(opp, own)
+            else:
+                # Game over
+                value = Bitboard.popcount(own) - Bitboard.popcount(opp)
+            table[key] = (value, NO_MOVE)
+            return value
+
+        # Negamax over every move, without pruning so that every reachable position gets an exact value
+        value, best = None, NO_MOVE
+        for sq in Bitboard.squares(moves):
+            flipped = Bitboard.flips(sq, own, opp, geom)
+            v = -solve(opp & ~flipped, own | flipped | (1 << sq))
+            if value is None or v > value:
+                value, best = v, sq
+        table[key] = (value, best)
+        return value
+
+    # Starting position (player 1 to move), laid out as OthelloBoard.initialize does
+    p1 = (1 << geom.square(cols // 2 - 1, rows // 2 - 1)) | (1 << geom.square(cols // 2, rows // 2))
+    p2 = (1 << geom.square(cols // 2 - 1, rows // 2)) | (1 << geom.square(cols // 2, rows // 2 - 1))
+    solve(p1, p2)
+    return table
+
+
+def write_book(table: dict, path: str, cols: int = 4, rows: int = 4):
+    # Write the solved positions as an open-addressing hash table at a load factor of at most 1/2
+    capacity = 1
+    while capacity < 2 * len(table):
+        capacity *= 2
+    slots = bytearray(SLOT.size * capacity)
+    for key, (value, move) in table.items():
+        index = slot_index(key, capacity)
+        while SLOT.unpack_from(slots, index * SLOT.size)[0] != 0:
+            index = (index + 1) % capacity
+        SLOT.pack_into(slots, index * SLOT.size, key, value, move)
+    with open(path, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, VERSION, cols, rows, capacity, len(table)))
+        f.write(slots)
+
+
+class OpeningBook:
+    """Read-only, memory-mapped view of a book written by write_book
+    path: book file
+    """
+    def __init__(self, path: str):
+        self.path = path
+        self.file = open(path, 'rb')
+        self.data = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self.cols, self.rows, self.capacity, self.count = HEADER.unpack_from(self.data, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f'{path} is not an opening book')
+        self.geometry = Bitboard.geometry(self.cols, self.rows)
+
+    def lookup(self, own: int, opp: int):
+        # Returns (value, move) for the position with the side to move owning own, or None if it is not in the book.
+        # move is a (col, row) tuple, or None if the side to move must pass or the game is over.
+        c_own, c_opp, sym = Bitboard.canonical(own, opp, self.geometry)
+        key = (c_own << 16) | c_opp
+        index = slot_index(key, self.capacity)
+        while True:
+            slot_key, value, move = SLOT.unpack_from(self.data, HEADER.size + index * SLOT.size)
+            if slot_key == key:
+                break
+            if slot_key == 0:
+                return None
+            index = (index + 1) % self.capacity
+        if move == NO_MOVE:
+            return value, None
+        # Map the canonical move back to the orientation of the position that was looked up
+        sq = self.geometry.sym_squares[self.geometry.sym_inverse[sym]][move]
+        return value, self.geometry.coords(sq)
+
+    def close(self):
+        self.data.close()
+        self.file.close()
+
+
+def main():
+    path = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_BOOK
+    start = time.perf_counter()
+    table = solve_all()
+    elapsed = time.perf_counter() - start
+    write_book(table, path)
+
+    # The start position is the only canonical position with four discs
+    start_value = next(v for k, (v, _) in table.items() if Bitboard.popcount(k) == 4)
+    print(f'Solved {len(table)} canonical positions in {elapsed:.1f} s')
+    print(f'Perfect play from the start: {start_value:+d} discs for player 1')
+    print(f'Wrote {path} ({os.path.getsize(path)} bytes)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,248 @@
+"""Round-robin tournaments between player configurations
+
+A player is given by a spec string: "alphabeta:<eval type>:<depth>" (alpha-beta with pruning) or "mcts:<playouts>".
+schedule lists the games of a round robin: every pair of players plays every opening twice, once with each color.
+An opening is a few random legal moves from the starting position, drawn from a seeded generator so that each
+opening is the same for every pair and the games are reproducible (and resumable with ExperimentRunner). Games are
+deterministic, so the openings of a schedule must all differ up to board symmetry for its games to be independent
+samples; distinct_openings draws seeds until they do, or until every opening of that length is used. play_game
+plays one scheduled game in a worker process.
+
+The analysis works on a DataFrame of games with columns p1, p2 and state (p1 score - p2 score):
+    standings: games, wins, ties and losses of each player, and its score rate (ties count half) with a Wilson
+        confidence interval
+    pairwise: score rate of each player (rows) against each opponent (columns)
+    elo_ratings: Bradley-Terry (Elo) ratings fitted by maximum likelihood, centered on 0, with bootstrap
+        confidence intervals from resampling the game results
+Every table is computed with whole-column pandas/NumPy operations; the bootstrap fits all its resamples at once.
+
+Usage: python Tournament.py [board size [openings]]
+"""
+
+import random
+import sys
+
+import numpy as np
+import pandas as pd
+
+from ExperimentRunner import run_configurations
+from GameDriver import GameDriver
+from OthelloBoard import OthelloBoard
+
+# Elo points for a 10:1 odds ratio
+ELO_SCALE = 400
+
+
+def parse_player(spec: str, seed: int = 0) -> tuple:
+    # GameDriver (type, eval type, depth, options) of a player spec; seed is used by MCTS players
+    kind, *args = spec.split(':')
+    if kind == 'alphabeta' and len(args) == 2:
+        return 'alphabeta', args[0], int(args[1]), None
+    if kind == 'mcts' and len(args) == 1:
+        return 'mcts', '0', int(args[0]), {'seed': seed}
+    raise ValueError(f'Unknown player {spec!r}, expected "alphabeta:<eval type>:<depth>" or "mcts:<playouts>"')
+
+
+def random_opening(size: int, plies: int, seed: int) -> list:
+    # plies random moves from the starting position, player 1 first. Openings in which a player has to pass or
+    # the game ends are drawn again, so player 1 is always to move after an even number of plies.
+    if plies % 2:
+        raise ValueError("Openings must have an even number of plies")
+    rng = random.Random(seed)
+    while True:
+        board = OthelloBoard(size, size, 'X', 'O')
+        board.initialize()
+        moves = []
+        symbol, other = 'X', 'O'
+        for _ in range(plies):
+            legal = board.legal_moves(symbol)
+            if not legal:
+                break
+            move = rng.choice(legal)
+            board.play_move(*move, symbol)
+            moves.append(move)
+            symbol, other = other, symbol
+        if len(moves) == plies and board.has_legal_moves_remaining(symbol):
+            return moves
+
+
+def opening_key(size: int, moves: list) -> int:
+    # Canonical key (see OthelloBoard.canonical_key) of the position after an opening, player 1 to move
+    board = OthelloBoard(size, size, 'X', 'O')
+    board.initialize()
+    symbol, other = 'X', 'O'
+    for col, row in moves:
+        board.play_move(col, row, symbol)
+        symbol, other = other, symbol
+    return board.canonical_key(symbol)[0]
+
+
+def canonical_openings(size: int, plies: int) -> set:
+    # Canonical keys of every opening random_opening can draw, found by walking the game tree plies deep
+    keys = set()
+    board = OthelloBoard(size, size, 'X', 'O')
+    board.initialize()
+
+    def walk(symbol, other, plies):
+        if plies == 0:
+            if board.has_legal_moves_remaining(symbol):
+                keys.add(board.canonical_key(symbol)[0])
+            return
+        for col, row in board.legal_moves(symbol):
+            undo = board.play_move(col, row, symbol)
+            walk(other, symbol, plies - 1)
+            board.undo_move(undo)
+
+    walk('X', 'O', plies)
+    return keys
+
+
+def distinct_openings(size: int, plies: int, count: int) -> list:
+    # Seeds of the first count random openings that differ up to board symmetry, in the order they are drawn. If
+    # there are fewer distinct openings of this length, the seeds of all of them.
+    remaining = canonical_openings(size, plies)
+    seeds = []
+    seed = 0
+    while remaining and len(seeds) < count:
+        key = opening_key(size, random_opening(size, plies, seed))
+        if key in remaining:
+            remaining.remove(key)
+            seeds.append(seed)
+        seed += 1
+    return seeds
+
+
+def schedule(players: list, openings: int, plies: int, size: int = 4) -> list:
+    # Game configurations of a round robin: each pair of players plays each distinct opening with both colors
+    seeds = distinct_openings(size, plies, openings)
+    configs = []
+    for i, a in enumerate(players):
+        for b in players[i + 1:]:
+            for opening in seeds:
+                configs.append({'size': size, 'p1': a, 'p2': b, 'opening': opening, 'plies': plies})
+                configs.append({'size': size, 'p1': b, 'p2': a, 'opening': opening, 'plies': plies})
+    return configs
+
+
+def play_game(config: dict) -> list:
+    """ Plays one scheduled game in a worker process (see ExperimentRunner.py) and returns its result row """
+    p1type, h1, d1, o1 = parse_player(config['p1'], seed=config['opening'])
+    p2type, h2, d2, o2 = parse_player(config['p2'], seed=config['opening'])
+    size = int(config['size'])
+    game = GameDriver(p1type=p1type, p2type=p2type, num_rows=size, num_cols=size,
+                      p1_eval_type=h1, p1_prune="1", p2_eval_type=h2, p2_prune="1", p1_depth=d1, p2_depth=d2,
+                      p1_options=o1, p2_options=o2, headless=True)
+    symbol, other = 'X', 'O'
+    for col, row in random_opening(size, int(config['plies']), int(config['opening'])):
+        game.board.play_move(col, row, symbol)
+        symbol, other = other, symbol
+    record = game.run()
+    return [{'state': record['state'], 'p1_score': record['p1_score'], 'p2_score': record['p2_score']}]
+
+
+def run_tournament(players: list, csv_path: str, openings: int = 8, plies: int = 4, size: int = 4,
+                   workers: int = None) -> pd.DataFrame:
+    # Plays a round robin in parallel (resuming an interrupted run) and returns its games
+    run_configurations(schedule(players, openings, plies, size), play_game, csv_path,
+                       columns=['p1', 'p2', 'opening', 'state', 'p1_score', 'p2_score'], workers=workers)
+    return pd.read_csv(csv_path)
+
+
+def player_scores(games: pd.DataFrame) -> pd.DataFrame:
+    # Two rows per game, one for each player: player, opponent, color and score (1 win, 0.5 tie, 0 loss)
+    p1_score = np.sign(games['state'].to_numpy()) * 0.5 + 0.5
+    first = pd.DataFrame({'player': games['p1'].to_numpy(), 'opponent': games['p2'].to_numpy(), 'color': 'p1',
+                          'score': p1_score})
+    second = pd.DataFrame({'player': games['p2'].to_numpy(), 'opponent': games['p1'].to_numpy(), 'color': 'p2',
+                           'score': 1 - p1_score})
+    return pd.concat([first, second], ignore_index=True)
+
+
+def wilson_interval(rate: np.ndarray, n: np.ndarray, z: float = 1.96) -> tuple:
+    # Wilson score interval of success rates rate over n trials
+    rate = np.asarray(rate, dtype=float)
+    n = np.asarray(n, dtype=float)
+    center = (rate + z * z / (2 * n)) / (1 + z * z / n)
+    half = z * np.sqrt(rate * (1 - rate) / n + z * z / (4 * n * n)) / (1 + z * z / n)
+    return center - half, center + half
+
+
+def standings(games: pd.DataFrame, z: float = 1.96) -> pd.DataFrame:
+    # Games, wins, ties, losses and score rate of every player, with a confidence interval on the score rate
+    scores = player_scores(games)
+    table = scores.assign(wins=scores['score'] == 1, ties=scores['score'] == 0.5, losses=scores['score'] == 0)
+    table = table.groupby('player').agg(games=('score', 'size'), wins=('wins', 'sum'), ties=('ties', 'sum'),
+                                        losses=('losses', 'sum'), score=('score', 'mean'))
+    table['score_low'], table['score_high'] = wilson_interval(table['score'], table['games'], z)
+    return table
+
+
+def pairwise(games: pd.DataFrame) -> pd.DataFrame:
+    # Score rate of each player (rows) against each opponent (columns)
+    return player_scores(games).pivot_table(index='player', columns='opponent', values='score', aggfunc='mean')
+
+
+def outcome_counts(games: pd.DataFrame, players: list) -> np.ndarray:
+    # (players, players, 3) array: wins, ties and losses of player i moving first against player j
+    index = {p: i for i, p in enumerate(players)}
+    i = games['p1'].map(index).to_numpy()
+    j = games['p2'].map(index).to_numpy()
+    outcome = 1 - np.sign(games['state'].to_numpy()).astype(int)
+    counts = np.zeros((len(players), len(players), 3), dtype=np.int64)
+    np.add.at(counts, (i, j, outcome), 1)
+    return counts
+
+
+def fit_elo(counts: np.ndarray, prior: float = 1.0, iterations: int = 200) -> np.ndarray:
+    # Elo ratings (mean 0) maximizing the Bradley-Terry likelihood of outcome counts shaped (..., players,
+    # players, 3), for every leading index at once. Ties count as half a win for each player, and every pair gets
+    # prior virtual tied games so that players who won or lost everything still have finite ratings.
+    wins, ties, losses = counts[..., 0], counts[..., 1], counts[..., 2]
+    swap = lambda a: np.swapaxes(a, -1, -2)
+    points = wins + 0.5 * ties + swap(losses) + 0.5 * swap(ties)
+    played = wins + ties + losses + swap(wins + ties + losses)
+    n = counts.shape[-2]
+    off_diagonal = 1 - np.eye(n)
+    points = points + 0.5 * prior * off_diagonal
+    played = played + prior * off_diagonal
+
+    # Minorization-maximization updates of the player strengths
+    gamma = np.ones(counts.shape[:-1][:-1])
+    total_points = points.sum(axis=-1)
+    for _ in range(iterations):
+        gamma = total_points / (played / (gamma[..., :, None] + gamma[..., None, :])).sum(axis=-1)
+        gamma /= np.exp(np.log(gamma).mean(axis=-1, keepdims=True))
+    return ELO_SCALE * np.log10(gamma)
+
+
+def elo_ratings(games: pd.DataFrame, bootstrap: int = 1000, seed: int = 0, prior: float = 1.0) -> pd.DataFrame:
+    # Elo rating of every player with a 95% bootstrap interval: the results of each pairing (and color) are
+    # resampled from their observed win/tie/loss rates
+    players = sorted(set(games['p1']) | set(games['p2']))
+    counts = outcome_counts(games, players)
+    n = counts.sum(axis=-1)
+    rates = np.where(n[..., None] > 0, counts / np.maximum(n, 1)[..., None], [0.0, 1.0, 0.0])
+    samples = np.random.default_rng(seed).multinomial(n, rates, size=(bootstrap,) + n.shape)
+    ratings = fit_elo(samples, prior)
+    return pd.DataFrame({'elo': fit_elo(counts, prior),
+                         'elo_low': np.percentile(ratings, 2.5, axis=0),
+                         'elo_high': np.percentile(ratings, 97.5, axis=0)}, index=pd.Index(players, name='player'))
+
+
+def summary(games: pd.DataFrame) -> pd.DataFrame:
+    # Standings and Elo ratings, best rated first
+    return standings(games).join(elo_ratings(games)).sort_values('elo', ascending=False)
+
+
+def main():
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 4
+    openings = int(sys.argv[2]) if len(sys.argv) > 2 else 8
+    players = [f'alphabeta:{h}:4' for h in '012'] + ['mcts:500']
+    games = run_tournament(players, f'tournament_{size}x{size}.csv', openings, size=size)
+    print(summary(games).round(3).to_string())
+    print()
+    print(pairwise(games).round(3).to_string())
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,42 @@
+"""Bounded transposition table used by AlphaBetaPlayer"""
+
+# Bound types of a stored value
+EXACT = 0   # the value is the true minimax value of the position
+LOWER = 1   # the search failed high (v >= beta), so the true value is at least the stored value
+UPPER = 2   # the search failed low (v <= alpha), so the true value is at most the stored value
+
+
+class TranspositionTable:
+    """Fixed-size table of search results indexed by Zobrist key (see OthelloBoard.hash_key)
+    size: number of slots; a key is stored in slot key % size
+    generation: incremented at the start of every search so entries from older searches can be told apart
+
+    Each slot holds a tuple (key, depth, value, bound, best_move, generation), where depth is the remaining
+    search depth below the position. A new result replaces the stored one when the slot is empty, holds the
+    same position, was written by an older search, or was searched less deeply (depth-preferred replacement).
+    """
+    def __init__(self, size: int):
+        self.size = size
+        self.slots = [None] * size
+        self.generation = 0
+
+    def new_search(self):
+        # Called once per get_move so that stale entries lose their depth preference
+        self.generation += 1
+
+    def probe(self, key: int):
+        # Returns the stored tuple for key, or None if the position is not in the table
+        entry = self.slots[key % self.size]
+        if entry is not None and entry[0] == key:
+            return entry
+        return None
+
+    def store(self, key: int, depth: int, value: float, bound: int, best_move: tuple):
+        index = key % self.size
+        entry = self.slots[index]
+        if entry is None or entry[0] == key or entry[5] != self.generation or depth >= entry[1]:
+            self.slots[index] = (key, depth, value, bound, best_move, self.generation)
+
+    def clear(self):
+        self.slots = [None] * self.size
+        self.generation = 0
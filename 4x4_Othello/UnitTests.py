@@ -2,7 +2,25 @@
 
 from Players import *
 from GameDriver import GameDriver
+from Board import Direction
+from ParallelSearch import ParallelRootSearch
 import unittest
+import random
+import io
+import contextlib
+import os
+import json
+import pickle
+import tempfile
+import Solver
+import Bitboard
+import Perft
+import Benchmark
+import BatchEval
+import Tournament
+import ExperimentRunner
+import pandas as pd
+import numpy as np
 import pdb
 
 
@@ -32,6 +50,666 @@ class testPlayers(unittest.TestCase):
         print("eval1 mobility difference", eval1)
         self.assertEqual(eval1, 0)
         #pdb.set_trace()
+
+    def test_transposition_table(self):
+        # The table must not change the value of the root position, with or without pruning
+        rng = random.Random(2)
+        for prune in ("0", "1"):
+            game = GameDriver(p1type="alphabeta", p2type="alphabeta", num_rows=4, num_cols=4)
+            board = game.board
+            for _ in range(3):
+                board.play_move(*rng.choice(board.legal_moves("X")), "X")
+                board.play_move(*rng.choice(board.legal_moves("O")), "O")
+            plain = AlphaBetaPlayer("X", 0, prune, 8)
+            cached = AlphaBetaPlayer("X", 0, prune, 8, tt_size=4096)
+            v1, _ = plain.max_value(board, -float('inf'), float('inf'), 1)
+            v2, _ = cached.max_value(board, -float('inf'), float('inf'), 1)
+            self.assertEqual(v1, v2)
+            self.assertGreater(cached.tt_hits, 0)
+            self.assertLess(cached.total_nodes_seen, plain.total_nodes_seen)
+
+    def test_iterative_deepening(self):
+        # A zero budget still returns the one ply move; a generous budget reaches max_depth
+        game = GameDriver(p1type="alphabeta", p2type="alphabeta", num_rows=4, num_cols=4)
+        rushed = AlphaBetaPlayer("X", 0, 1, 10, time_limit=0)
+        col, row = rushed.get_move(game.board)
+        self.assertTrue(game.board.is_legal_move(col, row, "X"))
+        self.assertEqual(rushed.depth_reached, 2)
+        patient = AlphaBetaPlayer("X", 0, 1, 6, time_limit=60)
+        col, row = patient.get_move(game.board)
+        self.assertTrue(game.board.is_legal_move(col, row, "X"))
+        self.assertEqual(patient.depth_reached, 6)
+        self.assertEqual(patient.search_depth, 6)
+
+    def test_eval_without_successors(self):
+        # H1/H2 computed from move masks must match their definitions over the successor boards
+        rng = random.Random(5)
+        for _ in range(20):
+            game = GameDriver(p1type="alphabeta", p2type="alphabeta", num_rows=4, num_cols=4)
+            board = game.board
+            player = game.p1
+            symbol = "X"
+            for _ in range(rng.randrange(1, 8)):
+                if board.has_legal_moves_remaining(symbol):
+                    board.play_move(*rng.choice(board.legal_moves(symbol)), symbol)
+                symbol = player.flip_symbol(symbol)
+            if player.terminal_state(board):
+                continue
+            successors = player.get_successors(board, "X")
+            opp_successors = player.get_successors(board, "O")
+            player.eval_type = "1"
+            self.assertEqual(player.eval_board(board), len(successors) - len(opp_successors))
+            player.eval_type = "2"
+            expected = sum(abs(board.count_score("X") - s.count_score("O")) for s in successors) - \
+                       sum(abs(board.count_score("X") - s.count_score("O")) for s in opp_successors)
+            self.assertEqual(player.eval_board(board), expected)
+
+    def test_eval_regression(self):
+        # H1/H2 values and full games against the values of the original grid implementation, with the legal move
+        # masks generated by eval_board or passed in by the search
+        game = GameDriver(p1type="alphabeta", p2type="alphabeta", num_rows=4, num_cols=4)
+        board = game.board
+        symbol = "X"
+        for col, row in [(3, 1), (3, 2), (0, 3), (2, 0)]:
+            board.play_move(col, row, symbol)
+            symbol = game.p1.flip_symbol(symbol)
+        expected = {("1", "X"): -1, ("1", "O"): 1, ("2", "X"): -5, ("2", "O"): -2}
+        for (eval_type, symbol), value in expected.items():
+            player = game.p1 if symbol == "X" else game.p2
+            player.eval_type = eval_type
+            self.assertEqual(player.eval_board(board), value)
+            self.assertEqual(player.eval_board(board, board.legal_moves_mask(symbol)), value)
+            self.assertEqual(player.eval_board(board, board.legal_moves_mask(symbol), 
+                                               board.legal_moves_mask(player.flip_symbol(symbol))), value)
+        
+        # Node counts and final state of depth 4 games with pruning
+        for (h1, h2), nodes in {("1", "2"): (106, 91, -11), ("2", "1"): (85, 37, 8), ("1", "1"): (84, 37, 8)}.items():
+            game = GameDriver(p1type="alphabeta", p2type="alphabeta", num_rows=4, num_cols=4, p1_eval_type=h1, 
+                              p1_prune=1, p2_eval_type=h2, p2_prune=1, p1_depth=4, p2_depth=4, headless=True)
+            record = game.run()
+            self.assertEqual((game.p1.total_nodes_seen, game.p2.total_nodes_seen, record['state']), nodes)
+
+    def test_make_unmake_search(self):
+        # Searching in place must give the same result as cloning, leave the board unchanged and clone only the root
+        for eval_type in ("0", "1", "2"):
+            game = GameDriver(p1type="alphabeta", p2type="alphabeta", num_rows=4, num_cols=4)
+            board = game.board
+            board.play_move(0, 2, "X")
+            before = (board.p1_bits, board.p2_bits, hash(board), board.last_move)
+            cloning = AlphaBetaPlayer("O", eval_type, 1, 8)
+            in_place = AlphaBetaPlayer("O", eval_type, 1, 8, make_unmake=True)
+            expected = cloning.get_move(board)
+            clones = []
+            original_clone = OthelloBoard.cloneOBoard
+            OthelloBoard.cloneOBoard = lambda b: clones.append(b) or original_clone(b)
+            try:
+                move = in_place.get_move(board)
+            finally:
+                OthelloBoard.cloneOBoard = original_clone
+            self.assertEqual(move, expected)
+            self.assertEqual(in_place.total_nodes_seen, cloning.total_nodes_seen)
+            self.assertEqual(len(clones), 1)
+            self.assertEqual((board.p1_bits, board.p2_bits, hash(board), board.last_move), before)
+
+    def test_parallel_root_search(self):
+        # The parallel root split must find the same root value and move as the serial search, including when
+        # root moves tie and younger brothers fail low against each other's values
+        game = GameDriver(p1type="alphabeta", p2type="alphabeta", num_rows=4, num_cols=4)
+        board = game.board
+        board.play_move(0, 2, "X")
+        board.play_move(0, 3, "O")
+        for eval_type in ("0", "1", "2"):
+            for prune in ("0", "1"):
+                serial = AlphaBetaPlayer("X", eval_type, prune, 8)
+                parallel = AlphaBetaPlayer("X", eval_type, prune, 8, workers=2)
+                try:
+                    expected, expected_move = serial.max_value(board, -float('inf'), float('inf'), 1)
+                    parallel.parallel = ParallelRootSearch(2)
+                    value, move = parallel.parallel.search(parallel, board, board.legal_moves("X"))
+                    self.assertEqual((value, move), (expected, expected_move))
+                    if prune == "0":
+                        self.assertEqual(parallel.total_nodes_seen, serial.total_nodes_seen)
+                finally:
+                    parallel.close()
+
+    def test_symmetry_search(self):
+        # Canonical table keys and deduplicated root moves must not change the root value, and search fewer nodes
+        for prune in ("0", "1"):
+            rng = random.Random(4)
+            game = GameDriver(p1type="alphabeta", p2type="alphabeta", num_rows=4, num_cols=4)
+            board = game.board
+            plain = AlphaBetaPlayer("X", 2, prune, 8, tt_size=4096)
+            symmetric = AlphaBetaPlayer("X", 2, prune, 8, tt_size=4096, symmetry=True)
+            v1, _ = plain.max_value(board, -float('inf'), float('inf'), 1)
+            v2, move = symmetric.max_value(board, -float('inf'), float('inf'), 1)
+            self.assertEqual(v1, v2)
+            self.assertTrue(board.is_legal_move(*move, "X"))
+            self.assertLess(symmetric.total_nodes_seen, plain.total_nodes_seen)
+            self.assertEqual(len(symmetric.unique_moves(board, "X", board.legal_moves("X"))), 1)
+            for _ in range(2):
+                board.play_move(*rng.choice(board.legal_moves("X")), "X")
+                board.play_move(*rng.choice(board.legal_moves("O")), "O")
+            v1, _ = plain.max_value(board, -float('inf'), float('inf'), 1)
+            v2, move = symmetric.max_value(board, -float('inf'), float('inf'), 1)
+            self.assertEqual(v1, v2)
+            self.assertTrue(board.is_legal_move(*move, "X"))
+
+    def test_batch_eval(self):
+        # Batched evaluation must match eval_board on every board size, and batched leaves must not change the search
+        rng = random.Random(15)
+        for size in (4, 6, 8):
+            boards = []
+            for _ in range(30):
+                board = Perft.start_board(size)
+                symbol, other = "X", "O"
+                for _ in range(rng.randrange(0, size * size)):
+                    if board.has_legal_moves_remaining(symbol):
+                        board.play_move(*rng.choice(board.legal_moves(symbol)), symbol)
+                    symbol, other = other, symbol
+                boards.append(board)
+            bg = BatchEval.batch_geometry(size, size)
+            cells = np.array([[{"X": 1, "O": 2}.get(board.get_cell(c, r), 0) for r in range(size) for c in range(size)]
+                              for board in boards], dtype=np.uint8)
+            for eval_type in ("0", "1", "2"):
+                player = AlphaBetaPlayer("X", eval_type, 0, 1)
+                expected = [player.eval_board(board) for board in boards]
+                self.assertEqual(BatchEval.evaluate(*BatchEval.encode(boards, "X"), eval_type, bg).tolist(), expected)
+                self.assertEqual(BatchEval.evaluate(*BatchEval.from_cells(cells), eval_type, bg).tolist(), expected)
+        
+        board, symbol = Benchmark.load_position("mid-6x6")
+        for eval_type in ("0", "1", "2"):
+            for prune in ("0", "1"):
+                for batch_eval in (1, None):
+                    scalar = AlphaBetaPlayer(symbol, eval_type, prune, 3, batch_eval=0)
+                    batched = AlphaBetaPlayer(symbol, eval_type, prune, 3, batch_eval=batch_eval)
+                    self.assertEqual(batched.get_move(board), scalar.get_move(board))
+                    self.assertEqual(batched.last_value, scalar.last_value)
+                    self.assertEqual(batched.total_nodes_seen, scalar.total_nodes_seen)
+                
+                # By default only searches without pruning batch, from the measured number of moves
+                default = AlphaBetaPlayer(symbol, eval_type, prune, 3)
+                self.assertEqual(default.batch_eval, BatchEval.AUTO_MIN_MOVES if prune == "0" else 0)
+
+    def test_search_stats(self):
+        # Statistics must not change the search, must add up to the node counts, and must be removable at runtime
+        board, symbol = Benchmark.load_position("mid-6x6")
+        plain = AlphaBetaPlayer(symbol, 2, 1, 4, tt_size=4096)
+        player = AlphaBetaPlayer(symbol, 2, 1, 4, tt_size=4096, stats=True)
+        board_methods = dict(vars(CompactOthelloBoard)), dict(vars(OthelloBoard))
+        self.assertEqual(player.get_move(board), plain.get_move(board))
+        self.assertEqual(player.total_nodes_seen, plain.total_nodes_seen)
+        record = player.stats.records[0]
+        self.assertEqual(record['nodes_by_ply'][0], 1)
+        self.assertEqual(sum(record['nodes_by_ply'][1:]), record['nodes'])
+        self.assertGreater(sum(record['cutoffs_by_ply']), 0)
+        self.assertAlmostEqual(record['ebf'] ** (len(record['nodes_by_ply']) - 1), record['nodes'])
+        self.assertAlmostEqual(sum(record[f'time_{c}'] for c in ('movegen', 'eval', 'clone', 'other')),
+                               record['time'])
+        self.assertGreater(record['move_cache_hits'] + record['move_cache_misses'], 0)
+        
+        # Searches on compact boards count their move generation too
+        compact = AlphaBetaPlayer(symbol, 2, 1, 4, tt_size=4096, stats=True, compact_boards=True)
+        self.assertEqual(compact.get_move(board), plain.get_move(board))
+        compact_record = compact.stats.records[0]
+        self.assertGreater(compact_record['time_movegen'], 0)
+        self.assertGreater(compact_record['move_cache_hits'] + compact_record['move_cache_misses'], 0)
+        self.assertEqual(compact_record['move_cache_misses'], record['move_cache_misses'])
+        
+        # Only the players are instrumented, never the board classes, and a failed move leaves nothing behind
+        self.assertEqual((dict(vars(CompactOthelloBoard)), dict(vars(OthelloBoard))), board_methods)
+        compact.search_root = lambda b: 1 / 0
+        with self.assertRaises(ZeroDivisionError):
+            compact.get_move(board)
+        del compact.search_root
+        self.assertEqual((dict(vars(CompactOthelloBoard)), dict(vars(OthelloBoard))), board_methods)
+        compact.get_move(board)
+        self.assertEqual(len(compact.stats.records), 2)
+        retry = compact.stats.records[1]
+        self.assertAlmostEqual(sum(retry[f'time_{c}'] for c in ('movegen', 'eval', 'clone', 'other')), retry['time'])
+        
+        # Disabled statistics leave no wrappers behind
+        stats = player.disable_stats()
+        wrapped = ('max_value', 'eval_board', 'legal_moves_mask', 'get_move')
+        self.assertFalse(any(name in player.__dict__ for name in wrapped))
+        player.get_move(board)
+        self.assertEqual(len(stats.records), 1)
+        
+        # Export for Plot.py
+        with tempfile.TemporaryDirectory() as directory:
+            stats.to_csv(os.path.join(directory, "stats.csv"))
+            stats.to_json(os.path.join(directory, "stats.json"))
+            df = pd.read_csv(os.path.join(directory, "stats.csv"))
+            columns = [f'nodes_{ply}' for ply in range(len(record['nodes_by_ply']))]
+            self.assertEqual(list(df[columns].iloc[0]), record['nodes_by_ply'])
+            with open(os.path.join(directory, "stats.json")) as f:
+                self.assertEqual(json.load(f)['moves'][0]['nodes'], record['nodes'])
+
+    def test_pvs_search(self):
+        # The PVS must find the alpha-beta root value, and search the same tree without pruning
+        for name, depth in (("start-4x4", 6), ("mid-6x6", 4), ("mid-8x8", 3)):
+            board, symbol = Benchmark.load_position(name)
+            for eval_type in ("0", "1", "2"):
+                for prune in ("0", "1"):
+                    alphabeta = AlphaBetaPlayer(symbol, eval_type, prune, depth)
+                    pvs = AlphaBetaPlayer(symbol, eval_type, prune, depth, search="pvs", tt_size=4096)
+                    move = alphabeta.get_move(board)
+                    self.assertEqual(pvs.get_move(board), move)
+                    self.assertEqual(pvs.last_value, alphabeta.last_value)
+                    if prune == "0":
+                        plain = AlphaBetaPlayer(symbol, eval_type, prune, depth, search="pvs")
+                        self.assertEqual(plain.get_move(board), move)
+                        self.assertEqual(plain.total_nodes_seen, alphabeta.total_nodes_seen)
+                    
+                    # Aspiration windows only change how the iterations are searched, not their result
+                    deepening = AlphaBetaPlayer(symbol, eval_type, prune, depth, search="pvs", aspiration=1, 
+                                                time_limit=float('inf'))
+                    self.assertEqual(deepening.get_move(board), move)
+                    self.assertEqual(deepening.last_value, alphabeta.last_value)
+                    
+                    # Neither does the move ordering, even when root moves tie
+                    ordered = AlphaBetaPlayer(symbol, eval_type, prune, depth, search="pvs", 
+                                              ordering="killer,history,static")
+                    self.assertEqual(ordered.get_move(board), move)
+                    self.assertEqual(ordered.last_value, alphabeta.last_value)
+
+    def test_move_ordering(self):
+        # Each strategy ranks moves as specified
+        player = AlphaBetaPlayer("X", 0, 1, 4, ordering="killer,history,static")
+        killer, history, static = player.orderings
+        board = Perft.start_board(6)
+        for o in player.orderings:
+            o.new_search(board)
+        killer.cutoff((1, 2), 3)
+        killer.cutoff((2, 1), 3)
+        killer.cutoff((2, 1), 3)
+        self.assertEqual([killer.rank(m, 0, 3) for m in [(2, 1), (1, 2), (4, 3)]], [0, 1, 2])
+        self.assertEqual(killer.rank((2, 1), 0, 2), 2)
+        history.cutoff((1, 2), 1)
+        history.cutoff((1, 2), 3)
+        history.cutoff((4, 3), 2)
+        self.assertEqual([history.rank(m, 0, 1) for m in [(1, 2), (4, 3), (2, 1)]], [-10, 0, 0])
+        self.assertEqual(history.rank((4, 3), 0, 4), -4)
+        history.new_search(board)
+        self.assertEqual([history.rank(m, 0, 1) for m in [(1, 2), (4, 3)]], [-5, 0])
+        self.assertEqual(history.rank((4, 3), 0, 2), -2)
+        squares = [(2, 2), (1, 1), (0, 1), (5, 5), (3, 0), (4, 4)]
+        self.assertEqual([static.rank(m, 0, 1) for m in squares], [1, 3, 2, 0, 1, 3])
+        self.assertEqual(sorted(squares, key=lambda m: static.rank(m, 0, 1)), 
+                         [(5, 5), (2, 2), (3, 0), (0, 1), (1, 1), (4, 4)])
+        
+        # Ordering only changes the number of nodes searched, not the root value or move, even when root moves tie
+        for name, depth in (("start-4x4", 6), ("mid-6x6", 4), ("mid-8x8", 3)):
+            board, symbol = Benchmark.load_position(name)
+            for eval_type in ("0", "1", "2"):
+                for prune in ("0", "1"):
+                    plain = AlphaBetaPlayer(symbol, eval_type, prune, depth, ordering="none")
+                    move = plain.get_move(board)
+                    for ordering in ("killer", "history", "static", "killer,history,static"):
+                        ordered = AlphaBetaPlayer(symbol, eval_type, prune, depth, ordering=ordering)
+                        self.assertEqual(ordered.get_move(board), move)
+                        self.assertEqual(ordered.last_value, plain.last_value)
+                        if prune == "0":
+                            self.assertEqual(ordered.total_nodes_seen, plain.total_nodes_seen)
+
+
+class testSolver(unittest.TestCase):
+    """This class tests the Solver.py file"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.directory = tempfile.TemporaryDirectory()
+        cls.path = os.path.join(cls.directory.name, "book.bin")
+        cls.table = Solver.solve_all()
+        Solver.write_book(cls.table, cls.path)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.directory.cleanup()
+
+    def test_start_value(self):
+        # 4x4 Othello is a win for player 2 by 8 discs (3-11) under perfect play
+        book = Solver.OpeningBook(self.path)
+        try:
+            game = GameDriver(p1type="alphabeta", p2type="alphabeta", num_rows=4, num_cols=4)
+            value, move = book.lookup(*game.board.get_bits("X"))
+            self.assertEqual(value, -8)
+            self.assertTrue(game.board.is_legal_move(*move, "X"))
+            self.assertEqual(book.count, len(self.table))
+        finally:
+            book.close()
+
+    def test_book_player_is_perfect(self):
+        # Player 2 following the book wins by at least 8 discs against any player 1
+        for eval_type in ("0", "1", "2"):
+            game = GameDriver(p1type="alphabeta", p2type="alphabeta", num_rows=4, num_cols=4, p1_eval_type=eval_type, 
+                              p1_prune=1, p1_depth=3, p2_options={'book': self.path}, headless=True)
+            record = game.run()
+            self.assertLessEqual(record['state'], -8)
+            self.assertEqual(game.p2.book_misses, 0)
+            self.assertTrue(all(m['depth'] == 0 for m in record['moves'] if m['player'] == "O"))
+
+
+class testBenchmark(unittest.TestCase):
+    """This class tests the Benchmark.py file"""
+
+    def test_compare(self):
+        # The fixed positions replay legally, and changed counts and slower times are reported as regressions
+        for name, (size, moves) in Benchmark.POSITIONS.items():
+            board, symbol = Benchmark.load_position(name)
+            self.assertEqual(board.count_score("X") + board.count_score("O"), 4 + len(moves))
+            self.assertTrue(board.has_legal_moves_remaining(symbol))
+        baseline = {'results': [{'benchmark': 'perft', 'position': 'start-8x8', 'depth': 5, 'nodes': 1396, 'time': 1.0}, 
+                                {'benchmark': 'micro', 'function': 'eval_board[0]', 'calls': 10, 'time': 1.0}]}
+        same = {'results': [dict(r, time=1.1) for r in baseline['results']]}
+        self.assertEqual(Benchmark.compare(same, baseline), [])
+        changed = {'results': [dict(baseline['results'][0], nodes=1395), dict(baseline['results'][1], time=2.0)]}
+        self.assertEqual(len(Benchmark.compare(changed, baseline)), 2)
+        
+        # Memory records have no time, and their bytes per node only regress when they grow beyond the tolerance
+        memory = {'results': [{'benchmark': 'memory', 'position': 'mid-4x4', 'board': 'OthelloBoard', 'depth': 6, 
+                               'nodes': 100, 'bytes_per_node': 500.0}]}
+        noisy = {'results': [dict(memory['results'][0], bytes_per_node=520.0)]}
+        self.assertEqual(Benchmark.compare(noisy, memory), [])
+        self.assertEqual(Benchmark.compare(memory, noisy), [])
+        grown = {'results': [dict(memory['results'][0], bytes_per_node=600.0)]}
+        self.assertEqual(len(Benchmark.compare(grown, memory)), 1)
+
+
+class testTournament(unittest.TestCase):
+    """This class tests the Tournament.py file"""
+
+    def test_schedule_and_openings(self):
+        # Every pair plays every opening with both colors, and openings are legal and reproducible
+        configs = Tournament.schedule(["alphabeta:0:2", "alphabeta:1:2", "mcts:20"], openings=3, plies=2)
+        self.assertEqual(len(configs), 3 * 3 * 2)
+        self.assertEqual(Tournament.random_opening(4, 4, 7), Tournament.random_opening(4, 4, 7))
+        
+        # Openings differ up to symmetry; 4x4 has 3 distinct 2-move openings and 30 distinct 4-move ones
+        for plies, count, expected in ((2, 8, 3), (4, 8, 8), (4, 40, 30)):
+            seeds = Tournament.distinct_openings(4, plies, count)
+            self.assertEqual(len(seeds), expected)
+            keys = {Tournament.opening_key(4, Tournament.random_opening(4, plies, seed)) for seed in seeds}
+            self.assertEqual(len(keys), expected)
+        row = Tournament.play_game(configs[0])[0]
+        self.assertEqual(row['state'], row['p1_score'] - row['p2_score'])
+        with self.assertRaises(ValueError):
+            Tournament.parse_player("minimax:3")
+
+    def test_ratings(self):
+        # A beats B, B beats C and A beats C in most games: standings and ratings must rank them in that order
+        games = pd.DataFrame([("A", "B", 4)] * 6 + [("B", "A", -2)] * 6 + [("B", "C", 2)] * 5 + [("C", "B", 2)] + 
+                             [("A", "C", 6)] * 6 + [("C", "A", 0)] * 2, columns=['p1', 'p2', 'state'])
+        table = Tournament.summary(games)
+        self.assertEqual(list(table.index), ["A", "B", "C"])
+        self.assertEqual(table.loc["A", "wins"], 18)
+        self.assertEqual(table.loc["C", "ties"], 2)
+        self.assertAlmostEqual(table['elo'].sum(), 0, places=6)
+        self.assertTrue((table['score_low'] <= table['score']).all() and (table['score'] <= table['score_high']).all())
+        self.assertTrue((table['elo_low'] <= table['elo']).all() and (table['elo'] <= table['elo_high']).all())
+        self.assertEqual(Tournament.pairwise(games).loc["A", "B"], 1.0)
+
+
+def run_square(config):
+    # Experiment run by testExperimentRunner, with one row per player like Report.run_game
+    return [{'player': p, 'value': config['n'] ** 2} for p in (1, 2)]
+
+
+class testExperimentRunner(unittest.TestCase):
+    """This class tests the ExperimentRunner.py file"""
+
+    def test_resume(self):
+        # A resumed run only runs the configurations missing from the partial file, and reruns the one whose rows 
+        # were cut short
+        configs = [{'n': n} for n in range(4)]
+        columns = ['n', 'player', 'value']
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'results.csv')
+            with open(path + '.partial', 'w', newline='') as f:
+                f.write('n,player,value\r\n0,1,seeded\r\n0,2,seeded\r\n1,1,seeded\r\n1,2,seeded\r\n2,1,4\r\n2,')
+            with contextlib.redirect_stdout(io.StringIO()) as out:
+                ExperimentRunner.run_configurations(configs, run_square, path, columns, workers=1)
+            self.assertIn('2 of 4 configurations', out.getvalue())
+            results = pd.read_csv(path, dtype=str)
+            self.assertEqual(list(results.columns), columns)
+            self.assertEqual(list(results['n']), ['0', '0', '1', '1', '2', '2', '3', '3'])
+            self.assertEqual(list(results['value']), ['seeded'] * 4 + ['4', '4', '9', '9'])
+            self.assertFalse(os.path.exists(path + '.partial'))
+            
+            # A cut key is dropped with the rows whose key it could be the start of
+            with open(path + '.partial', 'w', newline='') as f:
+                f.write('n,player,value\r\n10,1,seeded\r\n10,2,seeded\r\n1')
+            done = ExperimentRunner.load_partial(path + '.partial', ['n'])
+            self.assertEqual(done, {})
+            with open(path + '.partial', newline='') as f:
+                self.assertEqual(f.read(), 'n,player,value\r\n')
+            
+            # No configurations give an empty results file
+            ExperimentRunner.run_configurations([], run_square, path, columns, workers=1)
+            self.assertEqual(list(pd.read_csv(path).columns), columns)
+
+
+class testGameDriver(unittest.TestCase):
+    """This class tests the GameDriver.py file"""
+
+    def test_headless_record(self):
+        # A headless game prints nothing and its per-move telemetry adds up to the game totals
+        game = GameDriver(p1type="alphabeta", p2type="alphabeta", num_rows=4, num_cols=4, p1_eval_type=0, p1_prune=1, 
+                          p2_eval_type=1, p2_prune=1, p1_depth=4, p2_depth=4, headless=True)
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            record = game.run()
+        self.assertEqual(output.getvalue(), "")
+        self.assertEqual(record['state'], game.state)
+        self.assertEqual(record['turns'], len(record['moves']))
+        self.assertEqual(sum(m['nodes'] for m in record['moves'] if m['player'] == "X"), game.p1.total_nodes_seen)
+        self.assertEqual(sum(m['nodes'] for m in record['moves'] if m['player'] == "O"), game.p2.total_nodes_seen)
+        self.assertTrue(all(m['depth'] == 4 and m['time_ns'] > 0 for m in record['moves']))
+
+
+    def test_board_sizes(self):
+        # Larger boards run through the same driver and end with every piece accounted for
+        for size in (6, 8):
+            game = GameDriver(p1type="alphabeta", p2type="alphabeta", num_rows=size, num_cols=size, p1_eval_type=1, 
+                              p1_prune=1, p2_eval_type=2, p2_prune=1, p1_depth=2, p2_depth=2, headless=True)
+            record = game.run()
+            self.assertEqual((game.board.cols, game.board.rows), (size, size))
+            self.assertEqual(record['p1_score'] + record['p2_score'], 4 + record['turns'])
+            self.assertLessEqual(record['p1_score'] + record['p2_score'], size * size)
+
+    def test_mcts_player(self):
+        # MCTS players are selected by type, play legal moves to the end, and replay the same game with the same seed
+        records = []
+        for _ in range(2):
+            game = GameDriver(p1type="mcts", p2type="alphabeta", num_rows=4, num_cols=4, p2_eval_type=2, p2_prune=1, 
+                              p1_depth=50, p2_depth=2, p1_options={'seed': 3}, headless=True)
+            self.assertIsInstance(game.p1, MCTSPlayer)
+            records.append(game.run())
+        self.assertEqual([m['move'] for m in records[0]['moves']], [m['move'] for m in records[1]['moves']])
+        for m in records[0]['moves']:
+            if m['player'] == "X":
+                self.assertLessEqual(m['nodes'], 50)
+                self.assertTrue(0 <= m['eval'] <= 1)
+        
+        # A playout from a finished game returns its disc difference for the side to move
+        geom = Bitboard.geometry(4, 4)
+        self.assertEqual(random_playout(0xFFFE, 0x1, geom, random.Random(1)), 14)
+        self.assertEqual(random_playout(0x1, 0xFFFE, geom, random.Random(1)), -14)
+
+
+class testOthelloBoard(unittest.TestCase):
+    """This class tests the OthelloBoard.py file"""
+
+    def set_coords_in_direction(self, col, row, D):#D=direction
+        # Step of the original grid-based move generation, kept as the reference for the bitboards
+        if(D.name == 'N'):
+            row += 1
+        elif(D.name == 'NE'):
+            col+=1
+            row+=1
+        elif(D.name == 'E'):
+            col+=1
+        elif(D.name == 'SE'):
+            col+=1
+            row-=1
+        elif(D.name == 'S'):
+            row-=1
+        elif(D.name == 'SW'):
+            col-=1
+            row-=1
+        elif(D.name == 'W'):
+            col-=1
+        elif(D.name == 'NW'):
+            col-=1
+            row+=1
+        return (col, row)
+
+    def check_endpoint(self, board, col, row, symbol, d, match_symbol):#match is bool type
+        # Recursively travel in a direction until a piece of symbol ends a run of the opponent's pieces
+        if not board.is_in_bounds(col, row) or board.is_cell_empty(col,row):
+            return False
+        if board.get_cell(col, row) == symbol:
+            return match_symbol
+        (next_col, next_row) = self.set_coords_in_direction(col, row, d)
+        return self.check_endpoint(board, next_col, next_row, symbol, d, True)
+
+    def reference_is_legal_move(self, board, col, row, symbol):
+        # Original grid-based legality check using the recursive check_endpoint walk
+        if not board.is_in_bounds(col, row) or not board.is_cell_empty(col, row):
+            return False
+        for d in Direction:
+            (next_col, next_row) = self.set_coords_in_direction(col, row, d)
+            if self.check_endpoint(board, next_col, next_row, symbol, d, False):
+                return True
+        return False
+
+    def test_bitboard_matches_grid(self):
+        # Play random games and compare bitboard move generation to the recursive grid walk
+        rng = random.Random(331)
+        for _ in range(50):
+            game = GameDriver(p1type="alphabeta", p2type="alphabeta", num_rows=4, num_cols=4)
+            board = game.board
+            symbol, other = "X", "O"
+            while board.has_legal_moves_remaining(symbol) or board.has_legal_moves_remaining(other):
+                expected = [(c, r) for r in range(4) for c in range(4)
+                            if self.reference_is_legal_move(board, c, r, symbol)]
+                self.assertEqual(board.legal_moves(symbol), expected)
+                if expected:
+                    col, row = rng.choice(expected)
+                    before = board.count_score(other)
+                    board.play_move(col, row, symbol)
+                    self.assertEqual(board.get_cell(col, row), symbol)
+                    self.assertLess(board.count_score(other), before)
+                    self.assertEqual(board.count_score(symbol) + board.count_score(other),
+                                     sum(cell != '.' for column in board.grid for cell in column))
+                symbol, other = other, symbol
+
+    def test_undo_move(self):
+        # Undoing a sequence of moves in reverse order must restore every intermediate position
+        rng = random.Random(11)
+        game = GameDriver(p1type="alphabeta", p2type="alphabeta", num_rows=4, num_cols=4)
+        board = game.board
+        history = []
+        symbol = "X"
+        while board.has_legal_moves_remaining("X") or board.has_legal_moves_remaining("O"):
+            if board.has_legal_moves_remaining(symbol):
+                state = (board.p1_bits, board.p2_bits, board.zobrist, board.last_move)
+                move = rng.choice(board.legal_moves(symbol))
+                history.append((state, board.play_move(*move, symbol)))
+                board.last_move = move
+            symbol = "O" if symbol == "X" else "X"
+        for state, undo in reversed(history):
+            board.undo_move(undo)
+            self.assertEqual((board.p1_bits, board.p2_bits, board.zobrist, board.last_move), state)
+            
+            # Incrementally updated piece counts and restored move caches must match a recount
+            self.assertEqual(board.count_score("X"), Bitboard.popcount(board.p1_bits))
+            self.assertEqual(board.count_score("O"), Bitboard.popcount(board.p2_bits))
+            self.assertEqual(board.legal_moves_mask("X"), Bitboard.legal_moves(board.p1_bits, board.p2_bits, board.geometry))
+            self.assertEqual(board.legal_moves_mask("O"), Bitboard.legal_moves(board.p2_bits, board.p1_bits, board.geometry))
+
+    def test_zobrist_incremental(self):
+        # The incrementally updated hash must match the hash of the same position loaded from scratch
+        rng = random.Random(7)
+        game = GameDriver(p1type="alphabeta", p2type="alphabeta", num_rows=4, num_cols=4)
+        board = game.board
+        symbol, other = "X", "O"
+        while board.has_legal_moves_remaining(symbol) or board.has_legal_moves_remaining(other):
+            if board.has_legal_moves_remaining(symbol):
+                board.play_move(*rng.choice(board.legal_moves(symbol)), symbol)
+            fresh = OthelloBoard(4, 4, "X", "O")
+            fresh.grid = board.grid
+            self.assertEqual(hash(fresh), hash(board))
+            self.assertNotEqual(board.hash_key("X"), board.hash_key("O"))
+            symbol, other = other, symbol
+
+    def test_perft(self):
+        # Node counts from the standard 8x8 starting position, and a 6x6 tree checked against the clone-based search
+        board = Perft.start_board(8)
+        self.assertEqual([Perft.perft(board, "X", d) for d in range(1, 7)], [4, 12, 56, 244, 1396, 8200])
+        player = AlphaBetaPlayer("X", 0, 0, 1)
+        
+        def count(board, symbol, depth):
+            if depth == 0 or player.terminal_state(board):
+                return 1
+            return sum(count(s, player.flip_symbol(symbol), depth - 1) for s in player.get_successors(board, symbol))
+        
+        board = Perft.start_board(6)
+        self.assertEqual(Perft.perft(board, "X", 5), count(board, "X", 5))
+
+    def test_compact_board(self):
+        # The slotted board plays like OthelloBoard, has no instance dict, and survives pickling
+        board, symbol = Benchmark.load_position("mid-6x6")
+        compact = board.cloneOBoard(CompactOthelloBoard)
+        self.assertIs(type(compact), CompactOthelloBoard)
+        self.assertFalse(hasattr(compact, '__dict__'))
+        self.assertIs(type(compact.cloneOBoard()), CompactOthelloBoard)
+        self.assertEqual(compact.grid, board.grid)
+        self.assertEqual(Perft.perft(compact, symbol, 4), Perft.perft(board, symbol, 4))
+        copy = pickle.loads(pickle.dumps(compact))
+        self.assertEqual((copy.p1_bits, copy.p2_bits, copy.zobrist, copy.count_score("X")), 
+                         (compact.p1_bits, compact.p2_bits, compact.zobrist, compact.count_score("X")))
+        self.assertIs(copy.geometry, compact.geometry)
+        
+        # The constructor takes (cols, rows) like Board, and clones keep the shape of non-square boards
+        wide = OthelloBoard(6, 4, "X", "O")
+        wide.initialize()
+        for clone in (wide.cloneOBoard(), wide.cloneOBoard(CompactOthelloBoard)):
+            self.assertEqual((clone.get_num_cols(), clone.get_num_rows()), (6, 4))
+            self.assertEqual(clone.grid, wide.grid)
+        
+        # Searching on compact boards gives the same move and node count
+        plain = AlphaBetaPlayer(symbol, 2, 1, 3)
+        player = AlphaBetaPlayer(symbol, 2, 1, 3, compact_boards=True)
+        self.assertEqual(player.get_move(board), plain.get_move(board))
+        self.assertEqual(player.total_nodes_seen, plain.total_nodes_seen)
+        
+        # Its boards take less memory than OthelloBoards
+        memory = {(r['position'], r['board']): r['bytes_per_node'] for r in Benchmark.bench_memory()}
+        for position in Benchmark.MEMORY_DEPTHS:
+            self.assertLess(memory[position, 'CompactOthelloBoard'], memory[position, 'OthelloBoard'])
+
+    def test_canonical_key(self):
+        # Every symmetric copy of a position must have the same canonical key, and moves must map between them
+        rng = random.Random(13)
+        game = GameDriver(p1type="alphabeta", p2type="alphabeta", num_rows=4, num_cols=4)
+        board = game.board
+        geom = board.geometry
+        symbol, other = "X", "O"
+        while board.has_legal_moves_remaining(symbol) or board.has_legal_moves_remaining(other):
+            if board.has_legal_moves_remaining(symbol):
+                board.play_move(*rng.choice(board.legal_moves(symbol)), symbol)
+            key, sym = board.canonical_key(other)
+            own, opp, _ = board.canonical(other)
+            self.assertEqual((Bitboard.transform(board.get_bits(other)[0], sym, geom), 
+                              Bitboard.transform(board.get_bits(other)[1], sym, geom)), (own, opp))
+            for t in range(len(geom.sym_squares)):
+                copy = OthelloBoard(4, 4, "X", "O")
+                copy.set_bits("X", Bitboard.transform(board.p1_bits, t, geom), Bitboard.transform(board.p2_bits, t, geom))
+                self.assertEqual(copy.canonical_key(other)[0], key)
+                self.assertEqual(sorted(board.transform_move(m, t) for m in board.legal_moves(other)), 
+                                 sorted(copy.legal_moves(other)))
+            self.assertNotEqual(key, board.canonical_key(symbol)[0])
+            symbol, other = other, symbol
     
 
 if __name__ == "__main__":
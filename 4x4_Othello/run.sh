@@ -1,12 +1,13 @@
 #!/bin/bash
-# argv[1] = p1type
-# argv[2] = p2type
+# argv[1] = p1type (human, alphabeta or mcts)
+# argv[2] = p2type (human, alphabeta or mcts)
 # argv[3] = p1_eval_type
 # argv[4] = p1_prune
 # argv[5] = p2_eval_type
 # argv[6] = p2_prune
-# argv[7] = p1_depth
-# argv[8] = p2_depth
+# argv[7] = p1_depth (number of playouts per move for an mcts player)
+# argv[8] = p2_depth (number of playouts per move for an mcts player)
+# argv[9] = board_size (optional, defaults to 4)
 
 p1type="alphabeta"
 p2type="alphabeta"
@@ -16,5 +17,6 @@ p2_eval_type=0
 p2_prune=0
 p1_depth=2
 p2_depth=2
+board_size=4
 
-python GameDriver.py $p1type $p2type $p1_eval_type $p1_prune $p2_eval_type $p2_prune $p1_depth $p2_depth
\ No newline at end of file
+python GameDriver.py $p1type $p2type $p1_eval_type $p1_prune $p2_eval_type $p2_prune $p1_depth $p2_depth $board_size
\ No newline at end of file
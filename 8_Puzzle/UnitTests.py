@@ -0,0 +1,164 @@
+# Unit tests of the sliding puzzle search, run with: python -m pytest UnitTests.py
+
+from agent import BF, MT, CB, NA, Node, OpenList, a_star_search
+from board import Board, goal_state, neighbor_table, move_state
+from pattern_db import PatternDatabase, database_path
+import unittest
+import random
+import os
+import tempfile
+
+
+class testOpenList(unittest.TestCase):
+    """This class tests the OpenList class of agent.py"""
+
+    def node(self, state, g, h):
+        node = Node(state=state)
+        node.g = g
+        node.h = h
+        node.f = g + h
+        return node
+
+    def test_push_pop(self):
+        open_list = OpenList()
+        for state, g, h in [(b'a', 1, 5), (b'b', 2, 1), (b'c', 3, 1), (b'd', 1, 7)]:
+            self.assertTrue(open_list.push(self.node(state, g, h)))
+        self.assertEqual(len(open_list), 4)
+        self.assertIn(b'a', open_list)
+        # Lowest f-score first, ties broken on the higher g-score
+        self.assertEqual([open_list.pop().state for _ in range(4)], [b'b', b'c', b'a', b'd'])
+        self.assertEqual(len(open_list), 0)
+        self.assertNotIn(b'a', open_list)
+        self.assertIsNone(open_list.pop())
+
+    def test_decrease_key(self):
+        open_list = OpenList()
+        open_list.push(self.node(b'a', 5, 1))
+        open_list.push(self.node(b'b', 3, 2))
+        # Equal or higher g-scores do not replace the open node
+        self.assertFalse(open_list.push(self.node(b'a', 5, 0)))
+        self.assertFalse(open_list.push(self.node(b'a', 6, 0)))
+        # A lower g-score replaces it, leaving a stale entry in the heap that len does not count
+        self.assertTrue(open_list.push(self.node(b'a', 2, 1)))
+        self.assertEqual(len(open_list), 2)
+        self.assertEqual(len(open_list.heap), 3)
+
+        node = open_list.pop()
+        self.assertEqual((node.state, node.g), (b'a', 2))
+        self.assertEqual(len(open_list), 1)
+        self.assertNotIn(b'a', open_list)
+        # The stale entry of a is skipped
+        self.assertEqual(open_list.pop().state, b'b')
+        self.assertEqual(len(open_list), 0)
+        self.assertIsNone(open_list.pop())
+        self.assertEqual(open_list.heap, [])
+
+    def test_reopen(self):
+        # A popped state can be pushed again, even with a higher g-score, and its old entry is not returned twice
+        open_list = OpenList()
+        open_list.push(self.node(b'a', 2, 0))
+        open_list.push(self.node(b'a', 1, 0))
+        self.assertEqual(open_list.pop().g, 1)
+        self.assertTrue(open_list.push(self.node(b'a', 4, 0)))
+        self.assertEqual(len(open_list), 1)
+        self.assertEqual(open_list.pop().g, 4)
+        self.assertIsNone(open_list.pop())
+
+
+class testHeuristics(unittest.TestCase):
+    """This class tests the incremental updates of the heuristics of agent.py"""
+
+    def test_delta(self):
+        # Along random walks, parent h + delta (called as in a_star_search) equals the heuristic of the child
+        for size in (3, 4):
+            neighbors = neighbor_table(size)
+            for seed in range(20):
+                rng = random.Random(seed)
+                state, open_space = Board(rng.randint(0, 40), seed, size).encode()
+                for _ in range(50):
+                    tile, _ = rng.choice(neighbors[open_space])
+                    child = move_state(state, open_space, tile)
+                    for heuristic in (BF, MT, CB, NA):
+                        self.assertEqual(heuristic(state) + heuristic.delta(child[open_space], tile, open_space, size),
+                                         heuristic(child), (heuristic.__name__, size, seed))
+                    state, open_space = child, tile
+
+
+class testPatternDatabase(unittest.TestCase):
+    """This class tests the PatternDatabase heuristic of pattern_db.py"""
+
+    # Optimal solution lengths of the boards of test.py, by (m, seed)
+    optimal_lengths = {(10, 21): 10, (20, 77): 18, (30, 39): 18, (40, 8): 28, (50, 402): 20}
+
+    @classmethod
+    def setUpClass(cls):
+        cls.directory = tempfile.TemporaryDirectory()
+        cls.PD = PatternDatabase(size=3, directory=cls.directory.name)
+
+    @classmethod
+    def tearDownClass(cls):
+        del cls.PD
+        cls.directory.cleanup()
+
+    def test_build(self):
+        for pattern in self.PD.patterns:
+            self.assertTrue(os.path.exists(database_path(pattern, 3, self.directory.name)))
+        self.assertEqual(self.PD(goal_state(3)), 0)
+
+    def test_admissible(self):
+        for (m, seed), length in self.optimal_lengths.items():
+            board = Board(m, seed)
+            state, _ = board.encode()
+            self.assertLessEqual(self.PD(state), length, (m, seed))
+            # The heuristic is also consistent, so A* still finds optimal solutions
+            solution = a_star_search(board, self.PD)
+            self.assertTrue(board.check_solution(solution))
+            self.assertEqual(len(solution), length)
+
+    def test_dominates_manhattan_and_consistent(self):
+        neighbors = neighbor_table(3)
+        for seed in range(20):
+            rng = random.Random(seed)
+            state, open_space = Board(rng.randint(0, 60), seed).encode()
+            for _ in range(50):
+                h = self.PD(state)
+                self.assertGreaterEqual(h, CB(state))
+                tile, _ = rng.choice(neighbors[open_space])
+                state, open_space = move_state(state, open_space, tile), tile
+                self.assertLessEqual(abs(self.PD(state) - h), 1)
+
+
+class testBoard(unittest.TestCase):
+    """This class tests the N x N packed states of board.py"""
+
+    def test_encode(self):
+        for m, seed in [(10, 21), (20, 77), (30, 39)]:
+            board = Board(m, seed, 4)
+            state, open_space = board.encode()
+            self.assertEqual(list(state), board.state.flatten().tolist())
+            self.assertEqual(state[open_space], 0)
+            self.assertEqual(divmod(open_space, 4), board.open_space)
+            # A solution found on the packed state solves the board
+            solution = a_star_search(board, CB)
+            self.assertTrue(board.check_solution(solution), (m, seed))
+        self.assertEqual(Board(0, 0, 4).encode(), (goal_state(4), 15))
+
+    def test_neighbor_table(self):
+        board = Board(0, 0, 4)
+        table = neighbor_table(4)
+        for open_index in range(16):
+            board.open_space = divmod(open_index, 4)
+            self.assertEqual([(divmod(tile, 4), direction) for tile, direction in table[open_index]],
+                             [(tuple(move), direction) for move, direction in board._possible_moves()])
+
+    def test_move_state(self):
+        board = Board(15, 3, 4)
+        state, open_space = board.encode()
+        for tile, direction in neighbor_table(4)[open_space]:
+            child = [b for b, d in board.next_action_states() if d == direction][0]
+            self.assertEqual(move_state(state, open_space, tile), child.encode()[0])
+            self.assertEqual(child.encode()[1], tile)
+
+
+if __name__ == '__main__':
+    unittest.main()
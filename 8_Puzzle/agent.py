@@ -1,66 +1,83 @@
 from __future__ import annotations
-from board import Board
+from board import Board, goal_state, neighbor_table, move_state
 from collections.abc import Callable
-import numpy as np
+from functools import lru_cache
+from math import isqrt
 import copy
-from queue import PriorityQueue
+import heapq
 import time
 
 '''
-Heuristics
+Heuristic lookup tables of a size x size puzzle, indexed by [tile][position]: the Manhattan distance from position to the 
+tile's goal position, and 1 if the tile is misplaced at position. The open space (tile 0) is not a tile, so its rows are 
+all 0.
+'''
+@lru_cache(maxsize=None)
+def distance_tables(size: int) -> tuple:
+    cells = size * size
+    goal_positions = [goal_state(size).index(tile) for tile in range(cells)]
+    manhattan = [[0] * cells for _ in range(cells)]
+    misplaced = [[0] * cells for _ in range(cells)]
+    for tile in range(1, cells):
+        goal_row, goal_col = divmod(goal_positions[tile], size)
+        for i in range(cells):
+            row, col = divmod(i, size)
+            manhattan[tile][i] = abs(row - goal_row) + abs(col - goal_col)
+            misplaced[tile][i] = int(i != goal_positions[tile])
+    return manhattan, misplaced
+
+'''
+Heuristics, computed on packed states of any size (see board.py)
+
+A heuristic can also have a delta(tile, from_index, to_index, size) function giving the change in its value when tile 
+moves from from_index to to_index, which a_star_search uses to get a child's h from its parent's h in O(1)
 '''
 # Breadth First Search Heuristic
-def BF(board: Board) -> int:
+def BF(state: bytes) -> int:
     return 0
 
+BF.delta = lambda tile, from_index, to_index, size: 0
+
 # Number of Misplaced Tiles Heuristic
-def MT(board: Board) -> int:
-    # Get states
-    sol = board.solution
-    state = board.state
-
-    misplaced = 0
-    # Loop through each tile to check if it is in the correct position
-    for i in range(1, 9):
-        # Get position of tile in current and goal state
-        goal_pos = np.argwhere(sol == i)[0]
-        current_pos = np.argwhere(state == i)[0]
-        
-        # If not in goal position, increment misplaced
-        if not np.array_equal(goal_pos, current_pos):
-            misplaced += 1
+def MT(state: bytes) -> int:
+    misplaced_table = distance_tables(isqrt(len(state)))[1]
+    return sum(misplaced_table[tile][i] for i, tile in enumerate(state))
 
-    # Return result
-    return misplaced
+def _MT_delta(tile: int, from_index: int, to_index: int, size: int) -> int:
+    misplaced_table = distance_tables(size)[1]
+    return misplaced_table[tile][to_index] - misplaced_table[tile][from_index]
+
+MT.delta = _MT_delta
 
 # Manhattan Distance Heuristic
-def CB(board: Board) -> int:
-    # Get states
-    sol = board.solution
-    state = board.state
+def CB(state: bytes) -> int:
+    manhattan_table = distance_tables(isqrt(len(state)))[0]
+    return sum(manhattan_table[tile][i] for i, tile in enumerate(state))
 
-    # Get distances between each tile and its goal position
-    distances = []
-    for i in range(1, 9):
-        distances.append(np.subtract(np.argwhere(sol == i), np.argwhere(state == i)))
+def _CB_delta(tile: int, from_index: int, to_index: int, size: int) -> int:
+    manhattan_table = distance_tables(size)[0]
+    return manhattan_table[tile][to_index] - manhattan_table[tile][from_index]
 
-    # Return sum of distances
-    return np.sum(np.abs(np.array(distances)))
+CB.delta = _CB_delta
 
 # Non-admissible Heuristic
-def NA(board: Board) -> int:
+def NA(state: bytes) -> int:
     # Non-admissible heuristic becuase in the case where the board is in the goal state, 
     # the heuristic will return 1
-    return MT(board) + CB(board) + 1
+    return MT(state) + CB(state) + 1
+
+NA.delta = lambda tile, from_index, to_index, size: (_MT_delta(tile, from_index, to_index, size) + 
+                                                     _CB_delta(tile, from_index, to_index, size))
 
 """ Node Class to keep track of path in A* Search """
 class Node:
     n_search_nodes = 0
 
     # Initialize Values
-    def __init__(self, parent=None, board=None, action=None) -> None:
+    def __init__(self, parent=None, state=None, open_space=None, action=None) -> None:
         self.parent = parent
-        self.board = board
+        self.state = state # Packed state (see board.py)
+        self.open_space = open_space # Index of the open space in state
 
         self.g = 0 # Cost to get to this node
         self.h = 0 # Heuristic value
@@ -83,7 +100,7 @@ class Node:
     # Check if node is equal in state to another
     def __eq__(self, other: object) -> bool:
         if isinstance(other, Node):
-            return np.array_equal(self.board.state, other.board.state)
+            return self.state == other.state
         return False
 
     # Check if f-score is less than another, with tie-breaking on g-score
@@ -98,58 +115,99 @@ class Node:
 
     # Hash function for sets and dictionaries
     def __hash__(self) -> int:
-        return hash(tuple(self.board.state.flatten()))
+        return hash(self.state)
 
     # Reset number of search nodes between searches
     def _reset():
         Node.n_search_nodes = 0
 
 
+""" Open list of A* Search: a binary heap with lazy deletion """
+class OpenList:
+    # Initialize Values
+    def __init__(self) -> None:
+        self.heap = [] # Heap of nodes, including stale entries for states that were improved or already popped
+        self.g_scores = {} # g-score of the live entry of each state in the open list
+
+    # Add node unless its state is already open with an equal or lower g-score. The entry it replaces stays in the
+    # heap and is skipped when popped.
+    def push(self, node: Node) -> bool:
+        if node.g >= self.g_scores.get(node.state, float('inf')):
+            return False
+        self.g_scores[node.state] = node.g
+        heapq.heappush(self.heap, node)
+        return True
+
+    # Remove and return the live node with the lowest f-score, or None if the open list is empty
+    def pop(self) -> Node:
+        while self.heap:
+            node = heapq.heappop(self.heap)
+            if self.g_scores.get(node.state) == node.g:
+                del self.g_scores[node.state]
+                return node
+        return None
+
+    # Check if a state is in the open list
+    def __contains__(self, state: bytes) -> bool:
+        return state in self.g_scores
+
+    # Number of states in the open list
+    def __len__(self) -> int:
+        return len(self.g_scores)
+
+
 '''
-A* Search 
+A* Search on packed states; the board is only read to get its packed state
 '''
-def a_star_search(board: Board, heuristic: Callable[[Board], int]):
+def a_star_search(board: Board, heuristic: Callable[[bytes], int]):
     Node._reset() # Reset number of search nodes for this search
     
     # Create start node
-    start_node = Node(parent=None, board=board)
+    state, open_space = board.encode()
+    start_node = Node(parent=None, state=state, open_space=open_space)
+    start_node.h = heuristic(state)
+    start_node.f = start_node.h
+
+    # Incremental heuristic update, if the heuristic has one
+    delta = getattr(heuristic, 'delta', None)
 
-    # Create the open and closed lists
-    open_list = PriorityQueue()
-    open_set = {}
+    # Goal and moves of the board's puzzle size
+    goal = goal_state(board.size)
+    neighbors = neighbor_table(board.size)
+
+    # Create the open list and the closed list of expanded states
+    open_list = OpenList()
     closed_list = set()
 
     # Add first node to the open list
-    open_list.put(start_node)
-    open_set.update({hash(start_node): start_node})
+    open_list.push(start_node)
     
     start_time = time.time()
 
     TIME_LIMIT_SECS = 60
 
-    while not open_list.empty():
+    while open_list:
 
         # Check if elapsed time exceeds 300 seconds
         if time.time() - start_time > TIME_LIMIT_SECS:
             return []
 
         # Get the current node
-        current_node = open_list.get()
-        if current_node in open_set:
-            open_set.pop(hash(current_node))
+        current_node = open_list.pop()
         
         # Found the goal
-        if current_node.board.goal_test():
+        if current_node.state == goal:
             return current_node.path
 
         # Add current to closed list
-        closed_list.add(current_node)
+        closed_list.add(current_node.state)
 
         # Generate children
         children = []
-        for new_state, action in current_node.board.next_action_states():
-            new_node = Node(current_node, new_state, action)
-            if new_node not in closed_list:
+        for tile, action in neighbors[current_node.open_space]:
+            new_state = move_state(current_node.state, current_node.open_space, tile)
+            new_node = Node(current_node, new_state, tile, action)
+            if new_state not in closed_list:
                 children.append(new_node)
 
         # Loop through children
@@ -157,24 +215,16 @@ def a_star_search(board: Board, heuristic: Callable[[Board], int]):
 
             # Create the f, g, and h values
             child.g = current_node.g + 1
-            child.h = heuristic(child.board)
+            if delta is not None:
+                # The tile that moved into the parent's open space is the only one whose position changed
+                child.h = current_node.h + delta(child.state[current_node.open_space], child.open_space, 
+                                                 current_node.open_space, board.size)
+            else:
+                child.h = heuristic(child.state)
             child.f = child.g + child.h
 
-            # Child is already in the open list
-            if child in open_set:
-                # get node 'open_node' from open_set that has the same hash as child without using next()
-                open_node = open_set[hash(child)]
-                
-                # If the child's f is less than open_node's f, replace open_node with child
-                if child.f <= open_node.f:
-                    open_list.queue.remove(open_node)
-                    open_list.put(child)
-                    open_set[hash(child)] = child
-            
-            # If child is not in open list, add it to the open list
-            else:
-                open_list.put(child)
-                open_set.update({hash(child): child})
+            # Add child to the open list, replacing the open node of the same state if child has a lower g-score
+            open_list.push(child)
 
     # goal not reachable
     return None
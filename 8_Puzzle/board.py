@@ -3,14 +3,45 @@ from typing import List, Tuple
 import numpy as np
 import random
 import copy
+from functools import lru_cache
 
 # Dict of possible movement directions
 moveset = {"right": (0, -1), "left": (0, 1), "up": (1, 0), "down": (-1, 0)}
 
+'''
+Packed states used by the search: a bytes object of size * size bytes holding the tiles in row-major order (0 for the
+open space), carried together with the index (row * size + col) of the open space
+'''
+# Packed goal state of a size x size puzzle
+@lru_cache(maxsize=None)
+def goal_state(size: int = 3) -> bytes:
+    return bytes(list(range(1, size * size)) + [0])
+
+# For each open space index, the (index of the tile moved into it, direction) pairs in the same order as
+# Board._possible_moves
+@lru_cache(maxsize=None)
+def neighbor_table(size: int = 3) -> List[List[Tuple[int, str]]]:
+    table = []
+    for open_index in range(size * size):
+        row, col = divmod(open_index, size)
+        table.append([((row + d_row) * size + col + d_col, direction) for direction, (d_row, d_col) in moveset.items()
+                      if 0 <= row + d_row < size and 0 <= col + d_col < size])
+    return table
+
+'''
+This function returns the packed state after moving the tile at index tile into the open space at index open_index
+'''
+def move_state(state: bytes, open_index: int, tile: int) -> bytes:
+    new_state = bytearray(state)
+    new_state[open_index] = new_state[tile]
+    new_state[tile] = 0
+    return bytes(new_state)
+
 class Board:
-    def __init__(self, m: int, seed = None):
-        self.open_space = (2, 2)
-        self.solution = np.append(np.arange(1, 9, 1), 0).reshape((3, 3))
+    def __init__(self, m: int, seed = None, size: int = 3):
+        self.size = size # Side length of the puzzle: 3 for the 8-puzzle, 4 for the 15-puzzle, ...
+        self.open_space = (size - 1, size - 1)
+        self.solution = np.append(np.arange(1, size * size, 1), 0).reshape((size, size))
         self.state = np.copy(self.solution)
         if seed != None:
             random.seed(seed)
@@ -23,6 +54,12 @@ class Board:
     def next_action_states(self) -> List[Tuple(Board,str)]:
         return [tuple([copy.deepcopy(self)._move(move), direction]) for move, direction in self._possible_moves()]
     '''
+    This function returns the current state packed as (state bytes, open space index) for the search
+    '''
+    def encode(self) -> Tuple[bytes, int]:
+        return bytes(self.state.flatten().tolist()), self.open_space[0] * self.size + self.open_space[1]
+
+    '''
     This function resets the board to its intial state
     '''
     def reset_board(self) -> None:
@@ -74,7 +111,7 @@ class Board:
     def _possible_moves(self) -> List[List[Tuple[int, int], str]]:
         return list(
             filter(
-                lambda x: not any(i >= 3 or i < 0 for i in x[0]),
+                lambda x: not any(i >= self.size or i < 0 for i in x[0]),
                 [[tuple(sum(y) for y in zip(self.open_space, x)),z] for z, x in moveset.items()],
             )
         )
@@ -1,12 +1,17 @@
 import pandas as pd
+import sys
 import time
 from tqdm import tqdm
 from agent import BF, MT, CB, NA, a_star_search, Node
 from board import Board
+from pattern_db import PatternDatabase
 
 if __name__ == "__main__":
-    # List of all heuristics to evaluate
-    heuristics = [BF, MT, CB, NA]
+    # Puzzle size: python main.py [size] (3 for the 8-puzzle, 4 for the 15-puzzle, 5 for the 24-puzzle)
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+
+    # List of all heuristics to evaluate (PD: additive pattern databases, built on first use)
+    heuristics = [BF, MT, CB, NA, PatternDatabase(size=size)]
 
     # Create a dataframe to store the results
     df = pd.DataFrame(columns=['m', 'n', 'heuristic', 'cpu_time', 'correct', 
@@ -20,7 +25,7 @@ if __name__ == "__main__":
             print(f'Testing Heuristic {heuristic.__name__}')
             for seed in tqdm(range(0,10)):
                 # Initialize the board
-                board = Board(m, seed)
+                board = Board(m, seed, size)
                 
                 # Run A* Search and time execution
                 start =  time.process_time()
@@ -41,4 +46,4 @@ if __name__ == "__main__":
                 df = pd.concat([df, result], ignore_index=True)
     
     # Save Results
-    df.to_csv('results.csv', index=False)
+    df.to_csv('results.csv' if size == 3 else f'results_{size}x{size}.csv', index=False)
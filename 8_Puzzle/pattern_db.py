@@ -0,0 +1,129 @@
+from __future__ import annotations
+from collections import deque
+from typing import List, Tuple
+from board import goal_state, neighbor_table
+import numpy as np
+import os
+import sys
+
+'''
+Additive pattern databases for sliding puzzles
+
+A pattern is a subset of the tiles. Its database stores, for every placement of the pattern's tiles and the open space,
+the fewest moves of those tiles needed to bring them to their goal positions, with the other tiles treated as
+indistinguishable. Counting only the moves of the pattern's own tiles makes the databases of disjoint patterns additive:
+the sum of their values is still a lower bound on the solution length, and is much closer to it than the Manhattan
+distance. Keeping the open space position in the database (rather than the best value over all of its positions) also
+keeps the heuristic consistent, so A* with a closed list still finds optimal solutions.
+
+The databases are built offline by a breadth-first search backwards from the goal, and stored as .npy files of one uint8
+per state (indexed [position of the first tile]...[position of the last tile][position of the open space]) that are
+loaded with numpy.memmap, so only the pages the search touches are read.
+'''
+
+# Default patterns of each puzzle size: the tiles split into disjoint groups of consecutive tiles, small enough for the
+# database of each group to build in seconds
+DEFAULT_PATTERNS = {
+    3: [(1, 2, 3, 4), (5, 6, 7, 8)],
+    4: [(1, 2, 3, 4), (5, 6, 7, 8), (9, 10, 11, 12), (13, 14, 15)],
+    5: [(1, 2, 3, 4), (5, 6, 7, 8), (9, 10, 11, 12), (13, 14, 15, 16), (17, 18, 19, 20), (21, 22, 23, 24)],
+}
+
+# Value of states that cannot occur (two tiles on one position)
+UNREACHED = 255
+
+'''
+This function builds the database of a pattern by 0-1 breadth-first search backwards from the goal: moving the open
+space onto a pattern tile moves that tile and costs 1, moving it onto any other position costs 0. States are packed as
+(((p_1 * cells + p_2) * cells + ...) * cells + open space), which is also their index in the database.
+'''
+def build(pattern: Tuple[int, ...], size: int = 3) -> np.ndarray:
+    cells = size * size
+    adjacent = [[target for target, _ in moves] for moves in neighbor_table(size)]
+    k = len(pattern)
+    weights = [cells ** (k - j) for j in range(k)] # Weight of each tile's position in a packed state
+
+    # Start from the goal state
+    goal = goal_state(size)
+    start = sum(goal.index(tile) * w for tile, w in zip(pattern, weights)) + goal.index(0)
+    cost = bytearray([UNREACHED]) * cells ** (k + 1)
+    cost[start] = 0
+    queue = deque([start])
+    while queue:
+        state = queue.popleft()
+        c = cost[state]
+        positions = [state // w % cells for w in weights]
+        open_space = state % cells
+        for target in adjacent[open_space]:
+            if target in positions:
+                # Slide pattern tile j into the open space
+                j = positions.index(target)
+                next_state = state + (open_space - target) * weights[j] + target - open_space
+                if c + 1 < cost[next_state]:
+                    cost[next_state] = c + 1
+                    queue.append(next_state)
+            else:
+                next_state = state + target - open_space
+                if c < cost[next_state]:
+                    cost[next_state] = c
+                    queue.appendleft(next_state)
+
+    return np.frombuffer(bytes(cost), dtype=np.uint8).reshape((cells,) * (k + 1))
+
+'''
+This function returns the file name of a pattern's database
+'''
+def database_path(pattern: Tuple[int, ...], size: int = 3, directory: str = '.') -> str:
+    return os.path.join(directory, f'pdb_{size}x{size}_{"-".join(str(t) for t in pattern)}.npy')
+
+'''
+This function writes a database through a memory map of its .npy file
+'''
+def save(table: np.ndarray, path: str) -> None:
+    out = np.lib.format.open_memmap(path, mode='w+', dtype=np.uint8, shape=table.shape)
+    out[...] = table
+    out.flush()
+    del out
+
+'''
+This function memory-maps a database file read-only
+'''
+def load(path: str) -> np.memmap:
+    return np.load(path, mmap_mode='r')
+
+""" Additive pattern database heuristic for a_star_search """
+class PatternDatabase:
+    # Load the database of every pattern, building and saving the ones that are missing
+    def __init__(self, patterns: List[Tuple[int, ...]] = None, size: int = 3, directory: str = '.',
+                 name: str = 'PD') -> None:
+        self.patterns = [tuple(p) for p in (patterns or DEFAULT_PATTERNS[size])]
+        tiles = [t for p in self.patterns for t in p]
+        if len(tiles) != len(set(tiles)) or not all(0 < t < size * size for t in tiles):
+            raise ValueError("Patterns must be disjoint sets of tiles of the puzzle")
+        self.size = size
+        self.cells = size * size
+        self.__name__ = name # Heuristic name used in results
+        self.tables = []
+        for pattern in self.patterns:
+            path = database_path(pattern, size, directory)
+            if not os.path.exists(path):
+                save(build(pattern, size), path)
+            self.tables.append(load(path).reshape(-1))
+
+    # Sum of the pattern databases' values for a packed state
+    def __call__(self, state: bytes) -> int:
+        where = [0] * self.cells
+        for i, tile in enumerate(state):
+            where[tile] = i
+        total = 0
+        for pattern, table in zip(self.patterns, self.tables):
+            index = 0
+            for tile in pattern:
+                index = index * self.cells + where[tile]
+            total += int(table[index * self.cells + where[0]])
+        return total
+
+
+if __name__ == "__main__":
+    # Build the default databases: python pattern_db.py [size [directory]]
+    PatternDatabase(size=int(sys.argv[1]) if len(sys.argv) > 1 else 3, directory=sys.argv[2] if len(sys.argv) > 2 else '.')